@@ -0,0 +1,107 @@
+'''
+Check of the identities of the parameter objects without weak references.
+
+Plain lists are the parameters of a one-parameter spec fed to AlgorithmD
+and its FsmIndexTree directly, with a finite state machine that does
+nothing, the way the monitors get them: the ids come from the identity
+registry and the references from Monitor._weak_spec_params. A creation
+event is sent for the lists kept by the program, interleaved with
+temporary lists it drops right away, then a second event is sent for
+every kept list. Each dropped list holds an object the script keeps a
+weak reference to.
+
+The check fails unless every kept list keeps its id and its second event
+finds the monitor state its creation event made, and unless every dropped
+list was freed with the object it held: the registry and the monitors
+must not extend the lifetime of the parameters. The entries the registry
+keeps are reported, and the cost of get_id on a list is timed.
+
+Usage: python benchmarks/builtin_params.py [-k KEPT] [-d DROPPED] [-s SIZE] [-r REPEAT]
+'''
+import argparse
+import gc
+import timeit
+import weakref
+
+from pythonmop.monitor.algorithm_d import AlgorithmD
+from pythonmop.monitor.fsm_index_tree import FsmIndexTree
+from pythonmop.monitor.monitor_base import Monitor
+from pythonmop.spec.data import SpecParameter, SpecCombination
+from pythonmop.spec.identity_registry import identity_registry
+
+
+class NullFsm:
+    def transition(self, event):
+        return []
+
+
+class Content:
+    pass
+
+
+class CheckMonitor(Monitor):
+    def __init__(self):
+        super().__init__()
+        self.params_monitors = FsmIndexTree('d', {}, False)
+        self.algorithm = AlgorithmD('BuiltinParams', NullFsm(), ['create'], {'use': [frozenset({list})]})
+
+    def send(self, event_name, instance):
+        spec_params = (SpecParameter(id=identity_registry.get_id(instance), param_type=list),)
+        spec_params = self._weak_spec_params(spec_params, [instance])
+        self.algorithm.algorithm_d(spec_params, event_name, self.params_monitors)
+        return spec_params[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', '--kept', type=int, default=5000, help='Lists kept by the program.')
+    parser.add_argument('-d', '--dropped', type=int, default=20000, help='Lists dropped right after their event.')
+    parser.add_argument('-s', '--size', type=int, default=100, help='Elements per list.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Timed runs, the best one is reported.')
+    args = parser.parse_args()
+
+    monitor = CheckMonitor()
+    entries = len(identity_registry)
+
+    kept = []
+    contents = []
+    for i in range(max(args.kept, args.dropped)):
+        if i < args.kept:
+            instance = list(range(args.size))
+            kept.append((instance, monitor.send('create', instance)))
+        if i < args.dropped:
+            content = Content()
+            contents.append(weakref.ref(content))
+            monitor.send('create', [content] + list(range(args.size - 1)))
+            del content
+    gc.collect()
+    alive = sum(content() is not None for content in contents)
+
+    lost_ids = lost_states = 0
+    for instance, spec_param in kept:
+        again = monitor.send('use', instance)
+        lost_ids += again.id != spec_param.id
+        lost_states += monitor.params_monitors.get_FSM(SpecCombination.of((again,))) is None
+    entries = len(identity_registry) - entries
+
+    instance = kept[0][0] if kept else []
+    get_id = identity_registry.get_id
+    best = min(timeit.repeat(lambda: get_id(instance), number=100000, repeat=args.repeat)) / 100000
+
+    print(f'kept lists        {len(kept)} of {args.size} elements')
+    print(f'dropped lists     {args.dropped}, {alive} still alive')
+    print(f'registry entries  {entries}')
+    print(f'get_id list       {best * 1e9:.0f} ns/call')
+    print(f'kept lists with a new id {lost_ids}, without their monitor state {lost_states}')
+
+    failures = []
+    if lost_ids or lost_states:
+        failures.append('kept lists lost their identity')
+    if alive:
+        failures.append(f'{alive} dropped lists are still alive')
+    if failures:
+        raise SystemExit(', '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+'''
+Microbenchmark of the per-call overhead of the AST call lowerings and of the monitoring strategy.
+
+A module calling a plain function in a loop is imported in a new
+interpreter started with the PyMOP startup helper, once per
+PYMOP_CALL_LOWERING of the ast strategy and once with the monitoring
+strategy (Python 3.12+), with the selective instrumentation off, so every
+call site is rewritten. The baseline imports the module without the
+startup helper. Each interpreter checks that the call sites were lowered
+the way it was asked to.
+
+By default the spec folder is empty and no hook is attached: the numbers
+show the cost of the lowering itself. With --hooked, it holds a spec with
+no-op hooks on PymopFuncCallTracker.before_call and after_call, which the
+monitoring strategy refuses.
+
+Usage: python benchmarks/call_lowering.py [-n CALLS] [-r REPEAT] [--hooked]
+'''
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_HELPER = os.path.join(REPO, 'pythonmop', 'pymop-startup-helper')
+
+TARGET = '''
+def callee(a, b=0):
+    return a
+
+
+def run(n):
+    for i in range(n):
+        callee(i)
+        callee(i, b=i)
+        len(())
+'''
+
+HOOKS_SPEC = '''
+from pythonmop import Spec, call
+
+
+class LoweringHooks(Spec):
+    def __init__(self):
+        super().__init__()
+
+        @self.event_before(call(PymopFuncCallTracker, 'before_call'))
+        def before_call(**kw):
+            pass
+
+        @self.event_after(call(PymopFuncCallTracker, 'after_call'))
+        def after_call(**kw):
+            pass
+
+    def match(self, call_file_name, call_line_num):
+        pass
+'''
+
+# Three calls per iteration of run.
+CHILD = '''
+import sys
+import timeit
+import lowering_target
+
+calls, repeat = int(sys.argv[1]), int(sys.argv[2])
+best = min(timeit.repeat(lambda: lowering_target.run(calls // 3), number=1, repeat=repeat))
+print('pymop-benchmark', best / (calls // 3 * 3) * 1e9, ' '.join(lowering_target.run.__code__.co_names))
+'''
+
+# Mode -> (PYMOP_INSTRUMENTATION_STRATEGY, PYMOP_CALL_LOWERING, a name the lowered call sites use).
+MODES = {
+    'none': (None, None, None),
+    'proxy': ('ast', 'proxy', 'before_call_proxy'),
+    'fused': ('ast', 'fused', 'before_call_fused'),
+    'monitoring': ('monitoring', None, None),
+}
+
+REFUSED = 'ERROR: The monitoring instrumentation strategy does not support'
+
+
+def measure(mode, directory, calls, repeat):
+    strategy, lowering, _ = MODES[mode]
+    env = dict(os.environ)
+    path = [REPO] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else [])
+    if strategy:
+        path.insert(0, STARTUP_HELPER)
+        env.update(PYMOP_SPEC_FOLDER=os.path.join(directory, 'specs'), PYMOP_SELECTIVE_INSTRUMENTATION='false',
+                   PYMOP_INSTRUMENTATION_STRATEGY=strategy)
+        if lowering:
+            env['PYMOP_CALL_LOWERING'] = lowering
+    env['PYTHONPATH'] = os.pathsep.join(path)
+
+    result = subprocess.run([sys.executable, '-c', CHILD, str(calls), str(repeat)], cwd=directory, env=env,
+                            capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('pymop-benchmark '):
+            _, per_call, *names = line.split()
+            return float(per_call), names
+    if REFUSED in result.stdout:
+        return None, []
+    raise SystemExit(f'The {mode} run failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--calls', type=int, default=300000, help='Calls per measurement.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Measurements per mode, the best one is reported.')
+    parser.add_argument('--hooked', action='store_true', help='Attach no-op hooks to before_call and after_call.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, 'specs'))
+        if args.hooked:
+            with open(os.path.join(directory, 'specs', 'LoweringHooks.py'), 'w') as spec:
+                spec.write(HOOKS_SPEC)
+        with open(os.path.join(directory, 'lowering_target.py'), 'w') as target:
+            target.write(TARGET)
+
+        for mode, (strategy, _, lowered_name) in MODES.items():
+            if strategy == 'monitoring' and sys.version_info < (3, 12):
+                print(f'{mode:12} requires Python 3.12+')
+                continue
+            per_call, names = measure(mode, directory, args.calls, args.repeat)
+            if per_call is None:
+                print(f'{mode:12} refused')
+                continue
+            print(f'{mode:12} {per_call:8.0f} ns/call')
+            lowered = [name for _, _, name in MODES.values() if name and name in names]
+            if lowered != ([lowered_name] if lowered_name else []):
+                raise SystemExit(f'The {mode} run was not lowered as expected: {" ".join(names)}')
+
+
+if __name__ == '__main__':
+    main()
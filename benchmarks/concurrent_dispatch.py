@@ -0,0 +1,105 @@
+'''
+Stress benchmark of the event dispatch with many threads calling instrumented functions.
+
+Every thread acquires and releases its own lock, hooked by a spec modeled
+after Pydocs_MustReleaseLock. The hooks count the events they receive, so the
+benchmark reports the throughput and checks that no event was dropped while
+the threads were handling events at the same time.
+
+Usage: python benchmarks/concurrent_dispatch.py [-t THREADS] [-n ITERATIONS] [-a ALGO]
+'''
+import argparse
+import itertools
+import threading
+import time
+
+from pythonmop import Spec, call, TRUE_EVENT
+
+
+class BenchmarkLock:
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        return self._lock.acquire()
+
+    def release(self):
+        return self._lock.release()
+
+
+class MustReleaseLock(Spec):
+    def __init__(self):
+        super().__init__()
+        self.received_events = itertools.count()
+
+        @self.event_before(call(BenchmarkLock, 'acquire'))
+        def acquire(**kw):
+            next(self.received_events)
+            return TRUE_EVENT
+
+        @self.event_before(call(BenchmarkLock, 'release'))
+        def release(**kw):
+            next(self.received_events)
+            return TRUE_EVENT
+
+    fsm = '''
+    s0 [
+        acquire -> s1
+    ]
+    s1 [
+        acquire -> s1
+        release -> s2
+    ]
+    s2 [
+        acquire -> s1
+    ]
+    alias match = s0
+    '''
+    creation_events = ['acquire']
+
+    def match(self, call_file_name, call_line_num):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-t', '--threads', type=int, default=8, help='Threads calling the instrumented functions.')
+    parser.add_argument('-n', '--iterations', type=int, default=5000, help='Acquire and release pairs per thread.')
+    parser.add_argument('-a', '--algo', default='D', help='Parametric algorithm of the monitor, "none" for no monitor.')
+    args = parser.parse_args()
+
+    spec = MustReleaseLock()
+    if args.algo.lower() != 'none':
+        spec.create_monitor(args.algo)
+
+    start_barrier = threading.Barrier(args.threads + 1)
+
+    def worker():
+        lock = BenchmarkLock()
+        start_barrier.wait()
+        for _ in range(args.iterations):
+            lock.acquire()
+            lock.release()
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    expected = args.threads * args.iterations * 2
+    # The counter was advanced once per event, reading it advances it once more.
+    observed = next(spec.received_events)
+    print(f'threads     {args.threads}')
+    print(f'elapsed     {elapsed:.3f} s')
+    print(f'throughput  {expected / elapsed:,.0f} events/s')
+    print(f'events      {observed} received, {expected} expected')
+    if observed != expected:
+        raise SystemExit(f'{expected - observed} events were dropped')
+
+
+if __name__ == '__main__':
+    main()
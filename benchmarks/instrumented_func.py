@@ -0,0 +1,109 @@
+'''
+Microbenchmark of the per-call overhead of the functions instrumented by specs.
+
+Every scenario hooks a plain method with an empty spec (no formal
+expression) whose hooks return FALSE_EVENT, or whose predicates filter the
+call out, so the numbers show the cost of the instrumentation wrapper itself
+rather than the cost of a monitor.
+
+Usage: python benchmarks/instrumented_func.py [-n CALLS] [-r REPEAT]
+'''
+import argparse
+import timeit
+
+from pythonmop import Spec, call, arg_type, FALSE_EVENT
+
+
+class Resource:
+    def use(self, a, b=None):
+        return a
+
+    def use_after(self, a, b=None):
+        return a
+
+    def use_both(self, a, b=None):
+        return a
+
+    def use_context(self, a, b=None):
+        return a
+
+    def use_predicate(self, a, b=None):
+        return a
+
+    def before_call(self, func, args, kwargs, filename, lineno, offset):
+        return func
+
+    def before_callee(self, func, args, kwargs, filename, lineno, offset):
+        return func
+
+Resource.before_call.__pymop_last_args_contain_ast_hints__ = True
+Resource.before_callee.__pymop_last_args_contain_ast_hints__ = True
+Resource.before_callee.__pymop_callee_arg__ = 1
+
+
+class BenchmarkSpec(Spec):
+    def __init__(self):
+        super().__init__()
+
+        @self.event_before(call(Resource, 'use'))
+        def before_use(**kw):
+            return FALSE_EVENT
+
+        @self.event_after(call(Resource, 'use_after'))
+        def after_use(**kw):
+            return FALSE_EVENT
+
+        @self.event_before(call(Resource, 'use_both'))
+        def before_use_both(**kw):
+            return FALSE_EVENT
+
+        @self.event_after(call(Resource, 'use_both'))
+        def after_use_both(**kw):
+            return FALSE_EVENT
+
+        @self.event_before(call(Resource, 'use_context'))
+        def before_use_context(ctx):
+            return FALSE_EVENT
+
+        @self.event_before(call(Resource, 'use_predicate'), arg_type(1, list))
+        def before_use_predicate(ctx):
+            pass
+
+        @self.event_before(call(Resource, 'before_call'))
+        def before_tracker(**kw):
+            return FALSE_EVENT
+
+        @self.event_before(call(Resource, 'before_callee'), callee_names=['append'])
+        def before_append(ctx):
+            return FALSE_EVENT
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--calls', type=int, default=100000, help='Calls per measurement.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Measurements per scenario, the best one is reported.')
+    args = parser.parse_args()
+
+    resource = Resource()
+    items = []
+    original_use = Resource.use
+    BenchmarkSpec()
+
+    scenarios = [
+        ('original method', lambda: original_use(resource, 1, b=2)),
+        ('before hook', lambda: resource.use(1, b=2)),
+        ('before hook, EventContext', lambda: resource.use_context(1, b=2)),
+        ('before hook, predicate', lambda: resource.use_predicate(1, b=2)),
+        ('after hook', lambda: resource.use_after(1, b=2)),
+        ('before and after hooks', lambda: resource.use_both(1, b=2)),
+        ('before hook, AST hints', lambda: resource.before_call(len, (1,), {}, __file__, 1, 0)),
+        ('callee hook, other callee', lambda: resource.before_callee(len, (1,), {}, __file__, 1, 0)),
+        ('callee hook, its callee', lambda: resource.before_callee(items.append, (1,), {}, __file__, 1, 0)),
+    ]
+    for name, scenario in scenarios:
+        best = min(timeit.repeat(scenario, number=args.calls, repeat=args.repeat))
+        print(f'{name:<28}{best / args.calls * 1e9:8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
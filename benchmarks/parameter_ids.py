@@ -0,0 +1,136 @@
+'''
+Benchmark of the identities given to the parameter objects of the events.
+
+A one-parameter spec with a monitor D hooks a method of a plain class, and
+the method is called once on each of N new objects, then again a few
+times on all of them. The first event of an object gives it its id, the
+later ones look it up. tracemalloc measures the memory kept per object
+after its first event, in a separate run since it slows the calls down.
+The spec only uses the public API, so the script also runs on the trees
+identifying the objects otherwise.
+
+With -t THREADS, the threads then get the ids of the same new objects from
+the identity registry at the same time, and the check fails if an object
+was given two ids.
+
+Usage: python benchmarks/parameter_ids.py [-n OBJECTS] [-e EVENTS] [-r REPEAT] [-t THREADS]
+'''
+import argparse
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+
+from pythonmop import Spec, call, TRUE_EVENT
+
+
+class Item:
+    pass
+
+
+def make_scenario(index):
+    # A new class and spec per run, so that the specs of the previous runs do not get its events.
+    resource_class = type(f'Resource{index}', (), {'use': lambda self: None})
+
+    def __init__(self):
+        Spec.__init__(self)
+
+        @self.event_before(call(resource_class, 'use'))
+        def use(**kw):
+            return TRUE_EVENT
+
+    spec_class = type(f'UseResource{index}', (Spec,), {
+        '__init__': __init__,
+        'fsm': '''
+        s0 [
+            use -> s0
+        ]
+        alias match = s1
+        ''',
+        'creation_events': ['use'],
+        'match': lambda self, call_file_name, call_line_num: None,
+    })
+    spec = spec_class()
+    spec.create_monitor('D')
+    return resource_class, spec
+
+
+def run(index, objects, events, trace_memory=False):
+    resource_class, spec = make_scenario(index)
+    instances = [resource_class() for _ in range(objects)]
+    gc.collect()
+
+    if trace_memory:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    start = time.perf_counter()
+    for instance in instances:
+        instance.use()
+    first = time.perf_counter() - start
+    kept = tracemalloc.get_traced_memory()[0] - before if trace_memory else 0
+    if trace_memory:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(events):
+        for instance in instances:
+            instance.use()
+    later = (time.perf_counter() - start) / max(events, 1)
+    return first / objects, later / objects, kept / objects
+
+
+def run_threads(objects, threads):
+    from pythonmop.spec.identity_registry import identity_registry
+
+    # Weak references and address entries.
+    instances = [Item() if index % 2 else [] for index in range(objects)]
+    ids = [None] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        ids[index] = [identity_registry.get_id(instance) for instance in instances]
+
+    # The threads switch as often as possible, so that they register the same objects at the same time.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    # The objects given another id by one of the threads.
+    return sum(len(set(object_ids)) > 1 for object_ids in zip(*ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-n', '--objects', type=int, default=5000, help='New objects per run.')
+    parser.add_argument('-e', '--events', type=int, default=3, help='Later events per object.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Timed runs, the best one is reported.')
+    parser.add_argument('-t', '--threads', type=int, default=0, help='Threads sending the events of the same objects.')
+    args = parser.parse_args()
+
+    runs = [run(index, args.objects, args.events) for index in range(args.repeat)]
+    first = min(result[0] for result in runs)
+    later = min(result[1] for result in runs)
+    _, _, kept = run(args.repeat, args.objects, 0, trace_memory=True)
+
+    print(f'objects       {args.objects}')
+    print(f'first event   {first * 1e6:8.1f} us/object')
+    print(f'later events  {later * 1e6:8.1f} us/event')
+    print(f'memory        {kept:8.0f} B/object after its first event')
+
+    if args.threads:
+        duplicates = run_threads(args.objects, args.threads)
+        print(f'threads       {args.threads}, {duplicates} of {args.objects} objects given two ids')
+        if duplicates:
+            raise SystemExit(f'{duplicates} objects were given two ids')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+'''
+Microbenchmark of the dispatch of a call hooked by a growing number of specs.
+
+Every spec hooks the same method with a before and an after event, both
+having the call instance and one argument as parameters, like the specs
+hooking list.append. The monitors are replaced by a monitor counting the
+events it receives, so the numbers show the cost of the hooks and of the
+parameter resolution rather than the cost of a parametric algorithm. The
+identity lookups of the parameter instances are counted as well, since
+their number does not depend on the noise of the timings.
+
+Usage: python benchmarks/shared_params.py [-s SPECS [SPECS ...]] [-n CALLS] [-r REPEAT]
+'''
+import argparse
+import timeit
+
+from pythonmop import Spec, call, TRUE_EVENT
+from pythonmop.spec.identity_registry import identity_registry
+
+
+class Resource:
+    def add(self, item):
+        return item
+
+
+class Item:
+    pass
+
+
+class CountingMonitor:
+    def __init__(self):
+        self.events = 0
+
+    def update_params_handler(self, event, spec_params, param_instances, file_name, line_num, custom_message,
+                              args, kwargs):
+        self.events += 1
+
+
+def make_spec(index):
+    def __init__(self):
+        Spec.__init__(self)
+        @self.event_before(call(Resource, 'add'), target=[1])
+        def before_add(**kw):
+            return TRUE_EVENT
+
+        @self.event_after(call(Resource, 'add'), target=[1])
+        def after_add(**kw):
+            return TRUE_EVENT
+
+    return type(f'AddSpec{index}', (Spec,), {'__init__': __init__})
+
+
+def count_lookups(func):
+    lookups = 0
+    get_id = identity_registry.get_id
+
+    def counting_get_id(obj):
+        nonlocal lookups
+        lookups += 1
+        return get_id(obj)
+
+    identity_registry.get_id = counting_get_id
+    try:
+        func()
+    finally:
+        del identity_registry.get_id
+    return lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-s', '--specs', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help='Numbers of specs hooking the method.')
+    parser.add_argument('-n', '--calls', type=int, default=20000, help='Calls per measurement.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Measurements per scenario, the best one is reported.')
+    args = parser.parse_args()
+
+    resource = Resource()
+    item = Item()
+    monitors = []
+    for count in sorted(args.specs):
+        # The specs are added to the ones of the previous scenario.
+        while len(monitors) < count:
+            spec = make_spec(len(monitors))()
+            spec.monitor = CountingMonitor()
+            monitors.append(spec.monitor)
+
+        best = min(timeit.repeat(lambda: resource.add(item), number=args.calls, repeat=args.repeat))
+        lookups = count_lookups(lambda: resource.add(item))
+        print(f'{count:>3} specs {best / args.calls * 1e9:10.0f} ns/call {best / args.calls / count * 1e9:8.0f} ns/spec'
+              f' {lookups:4} lookups/call')
+
+    # The monitors of the specs added last only see the calls of the last scenario.
+    expected = 2 * (args.calls * args.repeat + 1)
+    if any(monitor.events < expected for monitor in monitors):
+        raise SystemExit('Some events did not reach the monitors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+'''
+Microbenchmark of the parameter combinations created by Algorithm D.
+
+The traces of a 2-parameter spec like UnsafeListIterator (list, iterator)
+and of a 3-parameter spec like UnsafeMapIterator (map, collection,
+iterator) are fed to AlgorithmD and its FsmIndexTree directly, with a
+finite state machine that does nothing, so the numbers show the cost of
+the parameter combinations rather than the cost of the formalism. Every
+group of events uses new parameter objects, like the objects of a test
+suite. The SpecCombination objects constructed and the sub-combination
+computations are counted, and tracemalloc measures the memory
+allocated while an event is handled and the memory kept by the index tree.
+
+Usage: python benchmarks/spec_combinations.py [-g GROUPS] [-r REPEAT]
+'''
+import argparse
+import time
+import tracemalloc
+
+from pythonmop.monitor.algorithm_d import AlgorithmD
+from pythonmop.monitor.fsm_index_tree import FsmIndexTree
+from pythonmop.spec.data import SpecParameter, SpecCombination
+
+
+class List:
+    pass
+
+
+class Map:
+    pass
+
+
+class Collection:
+    pass
+
+
+class Iterator:
+    pass
+
+
+class NullFsm:
+    def transition(self, event):
+        return []
+
+
+def unsafe_list_iterator():
+    enable_map = {
+        'updateList': [frozenset({List}), frozenset({List, Iterator})],
+        'createIter': [frozenset({List})],
+        'next': [frozenset({List, Iterator})],
+    }
+
+    def trace(new_param):
+        lst, it = new_param(List), new_param(Iterator)
+        return [('createList', (lst,)), ('updateList', (lst,)), ('createIter', (lst, it)), ('next', (it,)),
+                ('next', (it,)), ('updateList', (lst,)), ('next', (it,))]
+
+    return 'UnsafeListIterator (2 parameters)', enable_map, ['createList'], trace
+
+
+def unsafe_map_iterator():
+    enable_map = {
+        'createIter': [frozenset({Map, Collection})],
+        'useIter': [frozenset({Map, Collection, Iterator})],
+        'updateMap': [frozenset({Map, Collection}), frozenset({Map, Collection, Iterator})],
+    }
+
+    def trace(new_param):
+        mp, coll, it = new_param(Map), new_param(Collection), new_param(Iterator)
+        return [('createColl', (mp, coll)), ('createIter', (coll, it)), ('useIter', (it,)), ('useIter', (it,)),
+                ('updateMap', (mp,)), ('useIter', (it,))]
+
+    return 'UnsafeMapIterator (3 parameters)', enable_map, ['createColl'], trace
+
+
+def count_calls(owner, name, counter, key):
+    original = getattr(owner, name)
+
+    def counting(*args, **kwargs):
+        counter[key] += 1
+        return original(*args, **kwargs)
+
+    setattr(owner, name, counting)
+    return lambda: setattr(owner, name, original)
+
+
+def run(scenario, groups, trace_memory=False):
+    name, enable_map, creation_events, trace = scenario
+    algorithm = AlgorithmD(name, NullFsm(), creation_events, enable_map)
+    next_id = 0
+
+    def new_param(param_type):
+        nonlocal next_id
+        next_id += 1
+        return SpecParameter(id=next_id, param_type=param_type)
+
+    events = [event for _ in range(groups) for event in trace(new_param)]
+
+    if not trace_memory:
+        states = FsmIndexTree('d', {}, False)
+        start = time.perf_counter()
+        for event_name, spec_params in events:
+            algorithm.algorithm_d(spec_params, event_name, states)
+        return len(events), time.perf_counter() - start
+
+    # The memory allocated while each event is handled, and the memory kept once all of them are.
+    tracemalloc.start()
+    kept = tracemalloc.get_traced_memory()[0]
+    states = FsmIndexTree('d', {}, False)
+    transient = 0
+    for event_name, spec_params in events:
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        algorithm.algorithm_d(spec_params, event_name, states)
+        transient += tracemalloc.get_traced_memory()[1] - current
+    kept = tracemalloc.get_traced_memory()[0] - kept
+    tracemalloc.stop()
+    return len(events), transient, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-g', '--groups', type=int, default=2000, help='Groups of parameter objects per scenario.')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='Timed runs per scenario, the best one is reported.')
+    args = parser.parse_args()
+
+    for scenario in (unsafe_list_iterator(), unsafe_map_iterator()):
+        event_count, best = min((run(scenario, args.groups) for _ in range(args.repeat)), key=lambda result: result[1])
+
+        counter = {'combinations': 0, 'sub_params': 0}
+        restores = [count_calls(SpecCombination, '__init__', counter, 'combinations'),
+                    count_calls(SpecCombination, 'find_possible_sub_params', counter, 'sub_params')]
+        try:
+            run(scenario, args.groups)
+        finally:
+            for restore in restores:
+                restore()
+
+        _, transient, kept = run(scenario, args.groups, trace_memory=True)
+
+        print(f'{scenario[0]}: {event_count} events')
+        print(f'    {best / event_count * 1e6:8.2f} us/event')
+        print(f'    {counter["combinations"] / event_count:8.2f} SpecCombination constructed/event')
+        print(f'    {counter["sub_params"] / event_count:8.2f} sub-combination computations/event')
+        print(f'    {transient / event_count:8.0f} B peak allocated while handling an event')
+        print(f'    {kept / event_count:8.0f} B kept by the index tree/event')
+
+
+if __name__ == '__main__':
+    main()
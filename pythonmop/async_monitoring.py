@@ -0,0 +1,219 @@
+"""Background monitoring of the events sent to the parametric monitors.
+
+In the asynchronous mode the event hooks still run inline in the wrapped
+call, since they need the live arguments, but the parametric algorithm and
+FSM steps do not: handle_events puts a compact record of the event (spec,
+event name, parameter ids and instances, call site) into a bounded ring
+buffer, and a dedicated monitor thread drains it and sends the events of
+each spec to update_params_batch of its monitor. The events of a spec are handled in the order they
+were sent, so the verdicts are the same as inline, only reported later.
+
+When the buffer is full, the overflow policy decides what the application
+thread does:
+
+- block: wait until the monitor thread makes room. No event is lost.
+- drop: drop the event and count it.
+- sample: keep one of every N overflowing events (waiting for room like
+  block) and drop the others.
+
+Dropping events makes the verdicts of the affected specs unreliable, so the
+dropped events are counted per spec and reported with the statistics.
+"""
+import threading
+from collections import deque
+
+OVERFLOW_POLICIES = ('block', 'drop', 'sample')
+
+# Records handled by the monitor thread per lock acquisition.
+_DRAIN_BATCH_SIZE = 256
+
+_lock = threading.Lock()
+_not_empty = threading.Condition(_lock)
+_not_full = threading.Condition(_lock)
+_all_handled = threading.Condition(_lock)
+
+_buffer = deque()
+_capacity = 0
+_overflow_policy = 'block'
+_sample_interval = 1
+_overflow_count = 0
+_unhandled = 0
+_worker = None
+_running = False
+
+# Counters reported with the statistics.
+_handled_events = 0
+_dropped_events = {}
+_max_depth = 0
+
+
+def parse_overflow_policy(value):
+    """Parse the overflow policy option, either 'block', 'drop', 'sample' or 'sample:N'.
+
+        Args:
+            value: The value of the option.
+        Returns:
+            The policy name and the sample interval (1 unless the policy is 'sample').
+        Raises:
+            ValueError: If the policy is not supported.
+    """
+    policy, _, interval = value.partition(':')
+    if policy not in OVERFLOW_POLICIES or (interval and policy != 'sample'):
+        raise ValueError(f"Invalid overflow policy: {value}")
+    if policy != 'sample':
+        return policy, 1
+    interval = int(interval) if interval else 10
+    if interval < 1:
+        raise ValueError(f"Invalid sample interval: {interval}")
+    return policy, interval
+
+
+def _handle(spec, events):
+    try:
+        # Holding the event lock of the spec, which detach and the inline updates take as well.
+        spec.update_monitor(spec.monitor.update_params_batch, events)
+    except Exception as e:
+        print(f"Errors happened while the monitor thread handled {len(events)} events of spec "
+              f"{spec.__class__.__name__}, from the {events[0][0]} event at {events[0][3]}:{events[0][4]}", e)
+
+
+def _handle_records(records):
+    # The events of each spec are sent to its monitor as one batch, in their order.
+    events_per_spec = {}
+    for spec, *event in records:
+        events_per_spec.setdefault(spec, []).append(event)
+    for spec, events in events_per_spec.items():
+        _handle(spec, events)
+
+
+def _drain():
+    global _unhandled, _handled_events
+
+    while True:
+        with _lock:
+            while not _buffer and _running:
+                _not_empty.wait()
+            if not _buffer:
+                return
+            records = [_buffer.popleft() for _ in range(min(len(_buffer), _DRAIN_BATCH_SIZE))]
+            _not_full.notify_all()
+
+        _handle_records(records)
+
+        with _lock:
+            _unhandled -= len(records)
+            _handled_events += len(records)
+            if not _unhandled:
+                _all_handled.notify_all()
+
+
+def submit_event(spec, event_name, spec_params, param_instances, call_file_name, call_line_num, custom_message,
+                 args, kwargs):
+    """Send an event to the monitor thread, following the overflow policy when the buffer is full.
+
+        Args:
+            spec: The spec whose monitor handles the event.
+            event_name: The name of the event.
+            spec_params: The parameter combination of the event.
+            param_instances: The parameter instances of the event.
+            call_file_name: The file name of the call site.
+            call_line_num: The line number of the call site.
+            custom_message: The custom violation message returned by the hook.
+            args: The positional arguments of the call.
+            kwargs: The keyword arguments of the call.
+    """
+    global _overflow_count, _unhandled, _max_depth
+
+    record = (spec, event_name, spec_params, param_instances, call_file_name, call_line_num, custom_message,
+              args, kwargs)
+
+    # The monitor thread cannot wait for itself, e.g. when a violation handler calls an instrumented function.
+    if threading.current_thread() is _worker:
+        _handle_records([record])
+        return
+
+    with _lock:
+        if len(_buffer) >= _capacity and _running:
+            _overflow_count += 1
+            if _overflow_policy == 'drop' or (_overflow_policy == 'sample' and _overflow_count % _sample_interval):
+                spec_name = spec.__class__.__name__
+                _dropped_events[spec_name] = _dropped_events.get(spec_name, 0) + 1
+                return
+            while len(_buffer) >= _capacity and _running:
+                _not_full.wait()
+
+        if _running:
+            _buffer.append(record)
+            _unhandled += 1
+            if len(_buffer) > _max_depth:
+                _max_depth = len(_buffer)
+            _not_empty.notify()
+            return
+
+    # The monitor thread was stopped in the meantime.
+    _handle_records([record])
+
+
+def flush_async_monitoring():
+    """Wait until the monitor thread has handled all the events sent so far."""
+    if _worker is None or threading.current_thread() is _worker:
+        return
+    with _lock:
+        while _unhandled and _worker.is_alive():
+            _all_handled.wait()
+
+
+def start_async_monitoring(capacity, overflow_policy='block', sample_interval=1):
+    """Start the monitor thread.
+
+        Args:
+            capacity: The maximum number of events waiting in the ring buffer.
+            overflow_policy: What to do with the events sent while the buffer is full, see OVERFLOW_POLICIES.
+            sample_interval: One of every sample_interval overflowing events is kept by the 'sample' policy.
+    """
+    global _capacity, _overflow_policy, _sample_interval, _worker, _running
+
+    if capacity < 1:
+        raise ValueError(f"Invalid buffer size: {capacity}")
+    if overflow_policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+    if _worker is not None:
+        return
+
+    _capacity = capacity
+    _overflow_policy = overflow_policy
+    _sample_interval = sample_interval
+    _running = True
+    # A daemon thread, so that a program exiting without the teardown is not kept alive.
+    _worker = threading.Thread(target=_drain, name='pymop-monitor', daemon=True)
+    _worker.start()
+
+
+def stop_async_monitoring():
+    """Handle the remaining events and stop the monitor thread. The events sent afterwards are handled inline."""
+    global _worker, _running
+
+    if _worker is None:
+        return
+    flush_async_monitoring()
+    with _lock:
+        _running = False
+        _not_empty.notify_all()
+        _not_full.notify_all()
+    _worker.join()
+    _worker = None
+
+
+def get_async_monitoring_statistics():
+    """Return the counters of the asynchronous mode.
+
+        Returns:
+            A dict with the buffer size, the overflow policy, the number of handled events, the number of
+            dropped events per spec and the largest number of events that waited in the buffer.
+    """
+    with _lock:
+        return {'buffer_size': _capacity,
+                'overflow_policy': _overflow_policy if _overflow_policy != 'sample' else f'sample:{_sample_interval}',
+                'handled_events': _handled_events,
+                'dropped_events': dict(_dropped_events),
+                'max_depth': _max_depth}
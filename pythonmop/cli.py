@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+# The helper scripts that sitecustomize.py and the commands below live in.
+STARTUP_HELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pymop-startup-helper')
+
+COMMANDS = {
+    'warm': 'Pre-build the instrumentation cache for a project tree.',
+}
+
+def _print_usage():
+    print("Usage: pymop <command> [args...]\n")
+    print("Commands:")
+    for command, description in COMMANDS.items():
+        print(f"  {command:<8}{description}")
+
+def main(argv=None):
+    """Entry point of the `pymop` command.
+
+        Args:
+            argv: The command line arguments without the program name.
+        Returns:
+            The exit code of the command.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        _print_usage()
+        return 1
+
+    # Run the command with the startup helper on the PYTHONPATH so that it sees the same
+    # configuration and instrumentation as the test run, without starting the monitoring.
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path for path in [STARTUP_HELPER_PATH, env.get('PYTHONPATH')] if path)
+    env['PYMOP_WARM_UP_ONLY'] = '1'
+    script = os.path.join(STARTUP_HELPER_PATH, argv[0] + '.py')
+    return subprocess.call([sys.executable, script, *argv[1:]], env=env)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""Latency histograms of the event hooks and the monitors, per spec and event.
+
+When enabled, handle_events measures each hook call and each
+update_params_handler call with perf_counter_ns, and the monitors measure
+each transit_state call. The durations go into fixed log2 buckets: bucket i
+counts the durations d with 2**(i-1) <= d < 2**i nanoseconds (bucket 0 is
+d == 0), in an array allocated once per (spec, event, kind), so recording a
+duration costs a dict lookup and a few integer updates.
+
+Only one of every sample_interval measurement sites is timed, the counts and
+totals reported are the sampled ones and their estimate for all the calls.
+The percentiles are the upper bounds of the buckets they fall in, so they are
+exact within a factor of two.
+"""
+import itertools
+import threading
+from array import array
+from time import perf_counter_ns
+
+# Durations from 0 to 2**63 ns.
+NUM_BUCKETS = 64
+
+# The kinds of the measured calls.
+HOOK = 'hook'
+MONITOR = 'monitor'
+TRANSIT = 'transit_state'
+
+
+class _Histogram:
+    __slots__ = ('count', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = array('Q', bytes(8 * NUM_BUCKETS))
+
+    def add(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[elapsed_ns.bit_length()] += 1
+
+    def percentile(self, fraction):
+        # The upper bound of the bucket holding the requested rank.
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+
+class HookProfiler:
+    """Records the durations of the hooks, monitor updates and state transitions.
+
+    The hooks of a spec run in several threads at once. Each thread records
+    into its own histograms, so that recording takes no lock, and the
+    histograms of all the threads are merged when they are read. The profiler
+    lock is only taken the first time a thread records a duration.
+    """
+
+    def __init__(self, sample_interval: int = 1):
+        if sample_interval < 1:
+            raise ValueError(f"Invalid sample interval: {sample_interval}")
+        self.sample_interval = sample_interval
+        self._counter = itertools.count()
+        # The histograms of the current thread, (spec name, event name, kind) -> _Histogram
+        self._local = threading.local()
+        # The histograms of all the threads, kept after the threads exit.
+        self._thread_histograms = []
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Returns whether the next measurement site is timed.
+
+            Returns:
+                True for one of every sample_interval calls.
+        """
+        return self.sample_interval == 1 or not next(self._counter) % self.sample_interval
+
+    def record(self, spec_name: str, event_name: str, kind: str, elapsed_ns: int) -> None:
+        """Adds a duration to the histogram of a spec, event and kind.
+
+            Args:
+                spec_name: The name of the spec.
+                event_name: The name of the event.
+                kind: HOOK, MONITOR or TRANSIT.
+                elapsed_ns: The duration in nanoseconds.
+        """
+        try:
+            histograms = self._local.histograms
+        except AttributeError:
+            histograms = self._local.histograms = {}
+            with self._lock:
+                self._thread_histograms.append(histograms)
+        key = (spec_name, event_name, kind)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram()
+        histogram.add(elapsed_ns)
+
+    def _merged_histograms(self) -> dict:
+        # The histograms of the threads may be updated meanwhile, so the merged counts are a snapshot that can
+        # be off by the durations recorded while it is taken.
+        with self._lock:
+            thread_histograms = list(self._thread_histograms)
+
+        merged = {}
+        for histograms in thread_histograms:
+            for key, histogram in list(histograms.items()):
+                total = merged.get(key)
+                if total is None:
+                    total = merged[key] = _Histogram()
+                total.count += histogram.count
+                total.total_ns += histogram.total_ns
+                total.max_ns = max(total.max_ns, histogram.max_ns)
+                for bucket, count in enumerate(histogram.buckets):
+                    if count:
+                        total.buckets[bucket] += count
+        return merged
+
+    def timed_transit_state(self, spec_name: str, transit_state):
+        """Wraps the transit_state method of a monitor to record its durations.
+
+            Args:
+                spec_name: The name of the spec of the monitor.
+                transit_state: The bound transit_state method, called with the event name first.
+            Returns:
+                The wrapper, to be set as the transit_state attribute of the monitor.
+        """
+        def timed(event, *args, **kwargs):
+            if not self.should_sample():
+                return transit_state(event, *args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return transit_state(event, *args, **kwargs)
+            finally:
+                self.record(spec_name, event, TRANSIT, perf_counter_ns() - start)
+        return timed
+
+    def get_spec_totals(self) -> dict:
+        """Returns the estimated time spent in the hooks and the monitors of each spec.
+
+            Returns:
+                spec name -> nanoseconds. The state transitions are counted for the events
+                whose monitor updates are not timed (asynchronous monitoring), since they
+                are part of the monitor updates otherwise.
+        """
+        histograms = self._merged_histograms().items()
+
+        totals = {}
+        monitored_events = {(spec_name, event_name) for (spec_name, event_name, kind), _ in histograms if kind == MONITOR}
+        for (spec_name, event_name, kind), histogram in histograms:
+            if kind == TRANSIT and (spec_name, event_name) in monitored_events:
+                continue
+            totals[spec_name] = totals.get(spec_name, 0) + histogram.total_ns * self.sample_interval
+        return totals
+
+    def get_profile(self) -> dict:
+        """Returns the summary of the histograms.
+
+            Returns:
+                spec name -> event name -> kind -> the sampled calls, the estimated calls, the total, mean,
+                p50, p99 and max durations in nanoseconds, the estimated total and the non-empty buckets.
+        """
+        histograms = self._merged_histograms().items()
+
+        profile = {}
+        for (spec_name, event_name, kind), histogram in sorted(histograms):
+            if not histogram.count:
+                continue
+            profile.setdefault(spec_name, {}).setdefault(event_name, {})[kind] = {
+                'sampled_calls': histogram.count,
+                'estimated_calls': histogram.count * self.sample_interval,
+                'total_ns': histogram.total_ns,
+                'estimated_total_ns': histogram.total_ns * self.sample_interval,
+                'mean_ns': histogram.total_ns // histogram.count,
+                'p50_ns': histogram.percentile(0.5),
+                'p99_ns': histogram.percentile(0.99),
+                'max_ns': histogram.max_ns,
+                # Upper bound of the bucket in ns -> count
+                'buckets': {1 << bucket: count for bucket, count in enumerate(histogram.buckets) if count},
+            }
+        return profile
@@ -111,7 +111,7 @@ class AlgorithmB:
         """
 
         # Create the new parameter combination for further usages.
-        processing_spec_comb = SpecCombination(spec_params=processing_params)
+        processing_spec_comb = SpecCombination.of(processing_params)
 
         # If the combination already exists, then do nothing.
         if current_states.get_FSM(processing_spec_comb) is not None:
@@ -131,7 +131,7 @@ class AlgorithmB:
             most_informative_params = max(valid_current_params, key=len, default=())
 
             # Copy the fsm of the most informative combination and assign it to the new comb.
-            most_informative_spec_comb = SpecCombination(spec_params=most_informative_params)
+            most_informative_spec_comb = SpecCombination.of(most_informative_params)
             fsm_copy = deepcopy(current_states.get_FSM(most_informative_spec_comb))
             current_states.add_FSM(processing_params, fsm_copy)
             StatisticsSingleton().add_monitor_creation(self.spec_name)  # Add the statistics
@@ -142,7 +142,7 @@ class AlgorithmB:
         # If the combination or the subset not exist.
         else:
             # Create a new combination with the fsm equals to the fsm of '' combination.
-            fsm_copy = deepcopy(current_states.get_FSM(SpecCombination(spec_params=())))
+            fsm_copy = deepcopy(current_states.get_FSM(SpecCombination.of(())))
             current_states.add_FSM(processing_params, fsm_copy)
             StatisticsSingleton().add_monitor_creation(self.spec_name)  # Add the statistics
 
@@ -116,7 +116,7 @@ class AlgorithmC:
 
         # Sort the parameter combination and create a spec combination.
         spec_params = tuple(sorted(spec_params))
-        spec_comb = SpecCombination(spec_params=spec_params)
+        spec_comb = SpecCombination.of(spec_params)
 
         # Check if the parameter instance is already defined (Line 1)
         if current_states.get_FSM(spec_comb) is None:
@@ -129,7 +129,7 @@ class AlgorithmC:
 
             # Search through all the possible parameter combination (Line 2).
             for possible_sub_param in possible_sub_params:
-                possible_sub_comb = SpecCombination(spec_params=possible_sub_param)
+                possible_sub_comb = SpecCombination.of(possible_sub_param)
                 # Check if the parameter combination is defined or not (Line 3).
                 if current_states.get_FSM(possible_sub_comb) is not None:
                     param_max = possible_sub_comb
@@ -150,7 +150,7 @@ class AlgorithmC:
                     # Only process the combinations that is compatible to the processing one (Line 9 (2)).
                     if self.is_compatible(spec_comb, param):
                         new_params = tuple(set(param.spec_params) | set(spec_comb.spec_params))
-                        new_comb = SpecCombination(spec_params=tuple(sorted(new_params)))
+                        new_comb = SpecCombination.of(tuple(sorted(new_params)))
                         # Check if the new combination is defined or not (Line 10).
                         if current_states.get_FSM(new_comb) is None:
                             # Call the defineTo function (Line 11).
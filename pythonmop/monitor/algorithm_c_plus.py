@@ -154,20 +154,20 @@ class AlgorithmCPlus:
             
         # Sort the parameter combination and create a spec combination.
         spec_params = tuple(sorted(spec_params))
-        spec_comb = SpecCombination(spec_params=spec_params)
+        spec_comb = SpecCombination.of(spec_params)
 
         # Check if the parameter instance is already defined (Line 1)
         if current_states.get_FSM(spec_comb) is None:
 
             # Meaningless declaration, param_max is guarantee to exist in the for loop.
-            param_max = SpecCombination(spec_params=())
+            param_max = SpecCombination.of(())
 
             # Find all the parameter combinations that are less informative than the processing one.
             possible_sub_params = list(spec_comb.get_possible_sub_params())
 
             # Search through all the possible parameter combination (Line 2).
             for possible_sub_param in possible_sub_params:
-                possible_sub_comb = SpecCombination(spec_params=possible_sub_param)
+                possible_sub_comb = SpecCombination.of(possible_sub_param)
                 # Check if the parameter combination is defined or not (Line 3).
                 if current_states.get_FSM(possible_sub_comb) is not None:
                     param_max = possible_sub_comb
@@ -195,7 +195,7 @@ class AlgorithmCPlus:
                     # Only process the combinations that is compatible to the processing one (Line 9 (2)).
                     if self.is_compatible(spec_comb, param):
                         new_comb = tuple(set(param.spec_params) | set(spec_comb.spec_params))
-                        new_comb = SpecCombination(spec_params=tuple(sorted(new_comb)))
+                        new_comb = SpecCombination.of(tuple(sorted(new_comb)))
                         # Check if the new combination is defined or not (Line 10).
                         if current_states.get_FSM(new_comb) is None:
                             # Call the defineTo function (Line 11).
@@ -69,14 +69,13 @@ class AlgorithmD:
             if not processing_param_types.issubset(param_types_set):
 
                 # Find all the possible less informative params for processing params (Line 3 (1)).
-                possible_sub_params = list(processing_spec_comb.get_possible_sub_params())
+                possible_sub_spec_combs = processing_spec_comb.get_possible_sub_combs()
                 param_m = None  # May not be necessary
 
                 # Check through all the possible sub parameter combinations (Line 3 (2)).
-                for possible_sub_param in possible_sub_params:
+                for possible_sub_spec_comb in possible_sub_spec_combs:
 
                     # Find the domain of the possible sub parameters (parameter types).
-                    possible_sub_spec_comb = SpecCombination(spec_params=possible_sub_param)
                     possible_sub_param_types = possible_sub_spec_comb.get_spec_param_type()
 
                     # Continue find the param_m (Line 3 (3)).
@@ -96,7 +95,7 @@ class AlgorithmD:
                         merged_param = tuple(sorted(set(informative_comb.spec_params) | set(processing_spec_comb.spec_params)))
 
                         # Create a new spec combination for the merged parameter.
-                        merged_comb = SpecCombination(spec_params=merged_param)
+                        merged_comb = SpecCombination.of(merged_param)
 
                         # Check if the informative_param is defined and the merged dict is not defined (Line 5).
                         if states.get_FSM(informative_comb) is not None and states.get_FSM(merged_comb) is None:
@@ -122,16 +121,10 @@ class AlgorithmD:
                       f'processing_spec_comb: {processing_spec_comb}')
 
         # Find all the parameter combinations that are less informative than the processing one.
-        possible_processing_sub_params = list(processing_spec_comb.get_possible_sub_params())
-
-        possible_processing_sub_spec_combs = []
+        possible_processing_sub_spec_combs = processing_spec_comb.get_possible_sub_combs()
 
         # Check through all the possible combinations that are less informative (Line 1).
-        for possible_sub_param in possible_processing_sub_params:
-
-            # Create a new spec combination for the less informative parameter.
-            possible_sub_spec_comb = SpecCombination(spec_params=possible_sub_param)
-            possible_processing_sub_spec_combs.append(possible_sub_spec_comb)
+        for possible_sub_spec_comb in possible_processing_sub_spec_combs:
 
             # If the less informative parameter combination is defined, return directly (Line 2).
             if current_states.get_FSM(possible_sub_spec_comb) is not None:
@@ -174,15 +167,14 @@ class AlgorithmD:
         possible_processing_sub_params = [processing_spec_comb.spec_params] + list(processing_spec_comb.get_possible_sub_params())
 
         # Find all the possible parameter combinations that are less or equally informative to the current one.
-        possible_current_sub_params = [current_spec_comb.spec_params] + list(current_spec_comb.get_possible_sub_params())
+        possible_current_sub_params_set = {current_spec_comb.spec_params, *current_spec_comb.get_possible_sub_params()}
 
         # Check through all the possible combinations that is less or equally informative.
         # To the processing one not in the current one (Line 1).
         for possible_sub_param in possible_processing_sub_params:
-            possible_current_sub_params_set = set(possible_current_sub_params)
             if possible_sub_param not in possible_current_sub_params_set:
 
-                possible_sub_spec_comb = SpecCombination(spec_params=possible_sub_param)
+                possible_sub_spec_comb = SpecCombination.of(possible_sub_param)
 
                 # Check the difference of timestamp (Line 2).
                 if ((current_states.disable_timestamp.get(possible_sub_spec_comb) is not None) and 
@@ -204,8 +196,7 @@ class AlgorithmD:
         for possible_sub_param in possible_processing_sub_params[1:]:
 
             # Add the processing combination into the mapping set (Line 7 (2)).
-            possible_sub_spec_comb = SpecCombination(spec_params=possible_sub_param)
-            current_states.add_params_mapping(possible_sub_spec_comb.spec_params, processing_spec_comb)
+            current_states.add_params_mapping(possible_sub_param, processing_spec_comb)
 
         # End of the for loop.
 
@@ -228,7 +219,7 @@ class AlgorithmD:
 
         # Sort the parameter combination and create a spec combination.
         spec_params = tuple(sorted(spec_params))
-        spec_comb = SpecCombination(spec_params=spec_params)
+        spec_comb = SpecCombination.of(spec_params)
 
         # Check if the parameter instance is already defined (Line 1 main)
         if current_states.get_FSM(spec_comb) is None:
@@ -6,10 +6,6 @@ from typing import Tuple, Set
 from _weakref import ReferenceType
 
 
-# Define a lock for thread-safe operations on shared data structures.
-lock = threading.Lock()
-
-
 class FsmIndexTree:
     """
     Manages a indexing tree structure for storing FSMs based on their parameter combinations.
@@ -26,6 +22,10 @@ class FsmIndexTree:
         # Declare a variable for to store the garbage collection value.
         self.garbage_collection_flag = garbage_collection
 
+        # Declare a lock for thread-safe operations on the dicts of this tree only, so that
+        # the trees of different specs are updated concurrently.
+        self._lock = threading.Lock()
+
         # Declare an indexing tree for the map between the parameter combinations and fsm
         self.fsm_index_tree = {}
 
@@ -63,13 +63,13 @@ class FsmIndexTree:
         sorted_params = tuple(sorted(params))
 
         # Create a spec combination from the sorted parameters.
-        spec_combination = SpecCombination(spec_params=sorted_params)
+        spec_combination = SpecCombination.of(sorted_params)
 
         # Check if the FSM already exists in the index tree.
         if self.fsm_index_tree.get(spec_combination) is not None:
             raise Exception("Please check the indexing tree! Something is wrong.")
         else:
-            with lock:
+            with self._lock:
                 # Add the fsm into the index tree dict.
                 self.fsm_index_tree[spec_combination] = fsm
 
@@ -127,7 +127,7 @@ class FsmIndexTree:
             more_informative_spec_comb (SpecCombination): The more informative parameter combination.
         """
         if self.algorithm != "b":
-            with lock:
+            with self._lock:
                 if self.params_mapping.get(spec_comb) is None:
                     self.params_mapping[spec_comb] = set()
                 self.params_mapping[spec_comb].add(more_informative_spec_comb)
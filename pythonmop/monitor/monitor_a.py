@@ -137,19 +137,39 @@ class MonitorA(Monitor):
             kwargs: Keyword arguments.
         """
         with open(f'trace_monitor_{self.spec_name}.txt', 'a') as trace_file:
-            # Construct a line to write to the trace file
-            line = f'{event}:'
-            for spec_param in spec_params:
-                param_type = spec_param.param_type
-                param_id = spec_param.id
-                line += f' {param_type}-{param_id},'
+            trace_file.write(self._trace_line(event, spec_params))  # Write the line generated to the trace file
 
-            line = line[:-1] + ';\n'  # Remove the trailing comma and add a semicolon for the final instance.
-            trace_file.write(line)  # Write the line generated to the trace file
+    def update_params_batch(self, events) -> None:
+        """Write the trace of a list of events in order, opening the trace file once.
+
+        Args:
+            events: The events, each one a tuple of the arguments of update_params_handler.
+        """
+        with open(f'trace_monitor_{self.spec_name}.txt', 'a') as trace_file:
+            trace_file.writelines(self._trace_line(event, spec_params) for event, spec_params, *_ in events)
+
+    def _trace_line(self, event: str, spec_params: Tuple[SpecParameter]) -> str:
+        """Construct the line of the trace file for an event.
+
+        Args:
+            event: The name of the event.
+            spec_params: The spec parameter combination.
+        Returns:
+            The line with the types and ids of the parameter instances.
+        """
+        line = f'{event}:'
+        for spec_param in spec_params:
+            param_type = spec_param.param_type
+            param_id = spec_param.id
+            line += f' {param_type}-{param_id},'
+
+        line = line[:-1] + ';\n'  # Remove the trailing comma and add a semicolon for the final instance.
 
         # Print out the debug message for testing purposes.
         if debug:
-            debug_message(lambda: f'WROTE: event: {event}; parameter type: {param_type}; parameter id: {param_id}')
+            debug_message(lambda: f'WROTE: {line}')
+
+        return line
 
     def end_trace(self) -> None:
         """Delete the trace file."""
@@ -1,6 +1,107 @@
+from pythonmop.spec.data import SpecParameter
+from pythonmop.spec.identity_registry import identity_registry
+from pythonmop.debug_utils import debug_message, debug
+from pythonmop.statistics import StatisticsSingleton
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
 class Monitor:
     """A base class for the monitor
     """
 
     def __init__(self):
         pass # Nothing to do!
+
+    def _weak_spec_params(self, spec_params: Tuple[SpecParameter], param_instances: List[Any],
+                          resolved_params: Optional[Dict[Tuple[Any, type], SpecParameter]] = None) -> Tuple[SpecParameter]:
+        """Create the spec parameters holding the weak references to the parameter instances.
+
+        Args:
+            spec_params: The spec parameter combination of the event.
+            param_instances: The parameter instances got called in the testing program.
+            resolved_params: The spec parameters already created in the current batch of events, updated in place.
+        Returns:
+            The spec parameter combination with the weak references.
+        """
+        new_spec_params = []
+
+        # Iterate through each parameter instance
+        for i, param_instance in enumerate(spec_params):
+            param_type = param_instance.param_type
+            param_id = param_instance.id
+
+            # The parameters seen earlier in the batch already have their weak reference.
+            if resolved_params is not None:
+                new_spec_param = resolved_params.get((param_id, param_type))
+                if new_spec_param is not None:
+                    new_spec_params.append(new_spec_param)
+                    continue
+
+            # The entry of the instance in the registry, a weak reference or an address entry. It is not copied
+            # into the index tree, which would keep one more dict entry per instance and monitor.
+            ref = identity_registry.get_ref(param_instances[i], param_id)
+
+            # Create a new SpecParameter instance and add it to the list
+            new_spec_param = SpecParameter(
+                id=param_id,
+                param_type=param_type,
+                param_weak_ref=ref
+            )
+            new_spec_params.append(new_spec_param)
+            if resolved_params is not None:
+                resolved_params[(param_id, param_type)] = new_spec_param
+
+        return tuple(new_spec_params)
+
+    def update_params_batch(self, events: Iterable[Tuple[str, Tuple[SpecParameter], List[Any], str, int, str, Any, Any]]) -> None:
+        """Process a list of events in order, like calling update_params_handler for each of them.
+
+        For the monitors implementing _update_fsms, the spec parameters of the parameter instances are
+        created once per batch and the event statistics are updated once per event name. The other
+        monitors get update_params_handler called for each event.
+
+        Args:
+            events: The events, each one a tuple of the event name, the spec parameter combination, the
+                parameter instances, the file name, the line number, the custom message, the positional
+                and the keyword arguments of the call.
+        """
+        if type(self)._update_fsms is Monitor._update_fsms:
+            for event, spec_params, param_instances, file_name, line_num, custom_message, args, kwargs in events:
+                self.update_params_handler(event, spec_params, param_instances, file_name, line_num, custom_message,
+                                           args, kwargs)
+            return
+
+        resolved_params = {}
+        event_counts = {}
+        try:
+            for event, spec_params, param_instances, file_name, line_num, custom_message, args, kwargs in events:
+                # Print out the debug message for testing purposes.
+                if debug:
+                    debug_message(lambda: f'- Called update_params_batch with event: {event}, spec_params: {spec_params}, '
+                                          f'file_name: {file_name}, line_num: {line_num}')
+
+                new_spec_params = self._weak_spec_params(spec_params, param_instances, resolved_params)
+                # The handlers get the arguments the way update_params_handler(..., custom_message, args, kwargs) receives them.
+                self._update_fsms(event, new_spec_params, file_name, line_num, custom_message, (args, kwargs), {}, event_counts)
+        finally:
+            # The events processed before an error are counted as well.
+            statistics = StatisticsSingleton()
+            for event, count in event_counts.items():
+                statistics.add_events(self.spec_name, event, count)
+
+    def _update_fsms(self, event: str, spec_params: Tuple[SpecParameter], file_name: str, line_num: int,
+                     custom_message: str, args: Any, kwargs: Any, event_counts: Optional[Dict[str, int]] = None) -> None:
+        """Run the parametric algorithm for an event and transit the states of the finite state machines found.
+
+        Args:
+            event: The name of the event.
+            spec_params: The spec parameter combination with the weak references.
+            file_name: The name of the testing file.
+            line_num: The line number of the function got called in the testing file.
+            custom_message: The custom message returned by the event hook.
+            args: Positional arguments.
+            kwargs: Keyword arguments.
+            event_counts: Counts the transitions per event instead of updating the statistics, if provided.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not implement _update_fsms.')
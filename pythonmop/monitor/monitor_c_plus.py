@@ -13,26 +13,6 @@ from pythonmop.statistics import StatisticsSingleton
 
 from typing import Dict, List, Any, Tuple, Type
 import os.path
-import weakref
-
-
-class BuiltinWrapper:
-    """A wrapper class for built-in objects to enable weak references."""
-    def __init__(self, obj):
-        self.obj = obj
-        # Store a hashable representation of the object
-        if isinstance(obj, (list, dict, set)):
-            self._hashable = tuple(sorted(str(x) for x in obj))
-        else:
-            self._hashable = obj
-
-    def __eq__(self, other):
-        if isinstance(other, BuiltinWrapper):
-            return self.obj == other.obj
-        return False
-
-    def __hash__(self):
-        return hash(self._hashable)
 
 
 class MonitorCPlus(Monitor):
@@ -164,44 +144,24 @@ class MonitorCPlus(Monitor):
                 debug_message(lambda: "---------------")
 
         # Assign the global weak reference to the parameter instance
-        # Initialize a list to store the new parameter instances
-        new_spec_params = []
-
-        # Iterate through each parameter instance
-        for i, param_instance in enumerate(spec_params):
-            param_type = param_instance.param_type
-            param_id = param_instance.id
-
-            # Check if the instance is a built-in type
-            if isinstance(param_instances[i], (list, dict, set, tuple, str, int, float, bool)):
-                # For built-in types, use a wrapper to enable weak references
-                if self.params_monitors.get_weakref(param_id) is None:
-                    wrapper = BuiltinWrapper(param_instances[i])
-                    weak_ref = weakref.ref(wrapper)
-                    self.params_monitors.add_weakref(param_id, weak_ref)
-                    ref = weak_ref
-                else:
-                    ref = self.params_monitors.get_weakref(param_id)
-            else:
-                # For custom objects, use weak references
-                if self.params_monitors.get_weakref(param_id) is None:
-                    weak_ref = weakref.ref(param_instances[i])
-                    self.params_monitors.add_weakref(param_id, weak_ref)
-                else:
-                    weak_ref = self.params_monitors.get_weakref(param_id)
-                ref = weak_ref
-
-            # Create a new SpecParameter instance and add it to the list
-            new_spec_params.append(
-                SpecParameter(
-                    id=param_id,
-                    param_type=param_type,
-                    param_weak_ref=ref
-                )
-            )
-
-        # Update parameter_instances with the new list of SpecParameter instances
-        new_spec_params = tuple(new_spec_params)
+        new_spec_params = self._weak_spec_params(spec_params, param_instances)
+
+        self._update_fsms(event, new_spec_params, file_name, line_num, custom_message, args, kwargs)
+
+    def _update_fsms(self, event: str, new_spec_params: Tuple[SpecParameter], file_name: str, line_num: int,
+                     custom_message: str, args: Any, kwargs: Any, event_counts: Dict[str, int] = None) -> None:
+        """Run the parametric algorithm for an event and transit the states of the finite state machines found.
+
+        Args:
+            event: The name of the event.
+            new_spec_params: The spec parameter combination with the weak references.
+            file_name: The name of the testing file.
+            line_num: The line number of the function got called in the testing file.
+            custom_message: The custom message returned by the event hook.
+            args: Positional arguments.
+            kwargs: Keyword arguments.
+            event_counts: Counts the transitions per event instead of updating the statistics, if provided.
+        """
 
         # Find the parameter combinations where their fsm needed to be updated for the event.
         target_spec_combs = self.algoCPlus.algorithm_c_plus(new_spec_params, event, self.params_monitors)
@@ -213,10 +173,10 @@ class MonitorCPlus(Monitor):
             if self.params_monitors.get_FSM(target_spec_comb) is not None:
                 if debug:
                     debug_message(lambda: f'UPDATED: param: {target_spec_comb.spec_params}, event: {event}')  # Debug message.
-                self.transit_state(event, target_spec_comb, file_name, line_num, custom_message, args, kwargs)
+                self.transit_state(event, target_spec_comb, file_name, line_num, custom_message, args, kwargs, event_counts)
 
     def transit_state(self, event: str, spec_comb: SpecCombination, file_name: str, line_num: int, custom_message: str,
-                      args: Any, kwargs: Any) -> None:
+                      args: Any, kwargs: Any, event_counts: Dict[str, int] = None) -> None:
         """Transit the state of the fsm based on the event performed and execute the handler for violations.
 
         Args:
@@ -226,6 +186,7 @@ class MonitorCPlus(Monitor):
             line_num: The line number of the method in the file where the event is performed.
             args: The arguments passed into the method where the event is performed.
             kwargs: The keyword arguments passed into the method where the event is performed.
+            event_counts: Counts the event instead of updating the statistics, if provided.
         """
 
         # Print out the debug message for testing purposes.
@@ -237,7 +198,10 @@ class MonitorCPlus(Monitor):
                 pass
 
         # statistics
-        StatisticsSingleton().add_events(self.spec_name, event)
+        if event_counts is None:
+            StatisticsSingleton().add_events(self.spec_name, event)
+        else:
+            event_counts[event] = event_counts.get(event, 0) + 1
 
         # Transit the state of the fsm for the target parameter combination and store the matched categories.
         matched_categories = self.params_monitors.get_FSM(spec_comb).transition(event)
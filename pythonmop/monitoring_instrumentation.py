@@ -0,0 +1,196 @@
+"""Function call instrumentation based on sys.monitoring (PEP 669, Python 3.12+).
+
+The 'monitoring' instrumentation strategy feeds the before_call / after_call
+hooks of the function call tracker from sys.monitoring callbacks instead of
+rewriting the source of every module:
+
+- CALL fires before_call at each call site of the monitored files. Call sites
+  outside of them, or in a run where no spec hooks the tracker, return
+  DISABLE and run at native speed afterwards.
+- PY_RETURN of the called Python function fires after_call with the
+  returned value. PY_UNWIND drops the pending call when it raised instead.
+
+sys.monitoring only reports the callable and its first argument, so the hooks
+receive at most one positional argument and no keyword arguments. The first
+argument of a method call is its instance, which is bound back to the method
+so that func.__self__ works like with the AST strategy. The return value of
+C functions, classes and generator functions is not reported, so after_call
+only fires for Python functions.
+
+The hooks of the specs read the arguments and the results, so the startup
+helper refuses this strategy when a loaded spec hooks before_call or
+after_call, instead of letting it miss or misread its events. The strategy
+thus runs the specs that do not hook the function call tracker, and every
+call site returns DISABLE and runs at native speed.
+"""
+import sys
+import threading
+
+# Generators, coroutines and async generators return before their code runs.
+_CO_DEFERRED_FLAGS = 0x20 | 0x80 | 0x100 | 0x200
+
+_tool_id = None
+_call_tracker = None
+_should_monitor_file = None
+_state = threading.local()
+
+# Decisions and co_positions() of the code objects seen so far.
+_monitored_files = {}
+_positions = {}
+_return_events_codes = set()
+
+
+def _get_pending_calls():
+    pending_calls = getattr(_state, 'pending_calls', None)
+    if pending_calls is None:
+        pending_calls = _state.pending_calls = []
+    return pending_calls
+
+
+def _is_monitored(code):
+    filename = code.co_filename
+    monitored = _monitored_files.get(filename)
+    if monitored is None:
+        monitored = _monitored_files[filename] = bool(_should_monitor_file(filename))
+    return monitored
+
+
+def _location(code, offset):
+    positions = _positions.get(code)
+    if positions is None:
+        positions = _positions[code] = list(code.co_positions())
+    lineno, _, col_offset, _ = positions[offset // 2]
+    return code.co_filename, lineno, col_offset
+
+
+def _bind_method(func, arg0):
+    """Rebuild the bound method of a method call, reported as (function, instance).
+
+        Args:
+            func: The callable reported by the CALL event.
+            arg0: The first argument reported by the CALL event.
+        Returns:
+            The callable and the positional arguments to pass to the hooks.
+    """
+    if arg0 is sys.monitoring.MISSING:
+        return func, ()
+
+    name = getattr(func, '__name__', None)
+    if name is not None and hasattr(func, '__get__') and not isinstance(func, type):
+        try:
+            if getattr(type(arg0), name, None) is func:
+                return func.__get__(arg0, type(arg0)), ()
+        except Exception:
+            pass
+    return func, (arg0,)
+
+
+def _python_code(func):
+    """Return the code object that runs when func is called, if it is a plain Python function."""
+    func = getattr(func, '__func__', func)
+    code = getattr(func, '__code__', None)
+    if code is None or code.co_flags & _CO_DEFERRED_FLAGS:
+        return None
+    return code
+
+
+def _on_call(code, offset, func, arg0):
+    if not _is_monitored(code):
+        return sys.monitoring.DISABLE
+
+    before_hooked = _call_tracker.before_call.is_instrumented
+    after_hooked = _call_tracker.after_call.is_instrumented
+    if not before_hooked and not after_hooked:
+        return sys.monitoring.DISABLE
+
+    # Do not monitor the calls made by the specs themselves.
+    if getattr(_state, 'active', False):
+        return
+
+    func, args = _bind_method(func, arg0)
+    filename, lineno, col_offset = _location(code, offset)
+
+    if before_hooked:
+        _state.active = True
+        try:
+            _call_tracker.before_call(func, args, {}, filename, lineno, col_offset)
+        finally:
+            _state.active = False
+
+    if after_hooked:
+        callee_code = _python_code(func)
+        if callee_code is not None:
+            if callee_code not in _return_events_codes:
+                _return_events_codes.add(callee_code)
+                sys.monitoring.set_local_events(_tool_id, callee_code, sys.monitoring.events.PY_RETURN)
+            _get_pending_calls().append((callee_code, func, args, filename, lineno, col_offset))
+
+
+def _on_return(code, offset, retval):
+    pending_calls = _get_pending_calls()
+    # The function may also be called from places that are not monitored.
+    if not pending_calls or pending_calls[-1][0] is not code:
+        return
+
+    _, func, args, filename, lineno, col_offset = pending_calls.pop()
+    if getattr(_state, 'active', False):
+        return
+    _state.active = True
+    try:
+        _call_tracker.after_call(retval, func, args, {}, filename, lineno, col_offset)
+    finally:
+        _state.active = False
+
+
+def _on_unwind(code, offset, exception):
+    pending_calls = _get_pending_calls()
+    if pending_calls and pending_calls[-1][0] is code:
+        pending_calls.pop()
+
+
+def apply_monitoring_instrumentation(call_tracker, should_monitor_file):
+    """Start delivering the function calls to the tracker through sys.monitoring.
+
+        Args:
+            call_tracker: The function call tracker instance whose hooks are called.
+            should_monitor_file: Returns whether the calls made in a file are monitored.
+        Returns:
+            True if the instrumentation was applied, False if no sys.monitoring tool id is free.
+    """
+    global _tool_id, _call_tracker, _should_monitor_file
+
+    monitoring = sys.monitoring
+    for tool_id in (monitoring.PROFILER_ID, 3, 4):
+        if monitoring.get_tool(tool_id) is None:
+            break
+    else:
+        return False
+
+    monitoring.use_tool_id(tool_id, 'pymop')
+    _tool_id = tool_id
+    _call_tracker = call_tracker
+    _should_monitor_file = should_monitor_file
+
+    monitoring.register_callback(tool_id, monitoring.events.CALL, _on_call)
+    monitoring.register_callback(tool_id, monitoring.events.PY_RETURN, _on_return)
+    monitoring.register_callback(tool_id, monitoring.events.PY_UNWIND, _on_unwind)
+    # PY_UNWIND cannot be enabled per code object, it only fires when an exception leaves a function.
+    monitoring.set_events(tool_id, monitoring.events.CALL | monitoring.events.PY_UNWIND)
+    return True
+
+
+def remove_monitoring_instrumentation():
+    """Stop the sys.monitoring instrumentation and release the tool id."""
+    global _tool_id
+
+    if _tool_id is None:
+        return
+
+    monitoring = sys.monitoring
+    monitoring.set_events(_tool_id, monitoring.events.NO_EVENTS)
+    for code in _return_events_codes:
+        monitoring.set_local_events(_tool_id, code, monitoring.events.NO_EVENTS)
+    for event in (monitoring.events.CALL, monitoring.events.PY_RETURN, monitoring.events.PY_UNWIND):
+        monitoring.register_callback(_tool_id, event, None)
+    monitoring.free_tool_id(_tool_id)
+    _tool_id = None
@@ -0,0 +1,124 @@
+"""Sampling of the parameter objects monitored by a spec.
+
+A spec sampled at rate r only monitors about r of its parameter objects.
+The decision is a hash of the integer id the identity registry gives to
+the object, so it is taken once per object: all the events of a sampled
+object reach the monitor and none of the events of an unsampled one do,
+and the traces of the sampled objects are complete. An event with several
+parameters is monitored when all of them are sampled, which keeps the
+traces of the combinations of sampled objects complete as well.
+
+The hooks still run for every event, since they can choose the parameter
+instance of the event; the sampling only skips the parametric monitoring.
+The samplers count the events they let through, so that the statistics can
+report the effective rate and extrapolate the counts of the monitors.
+"""
+import threading
+from typing import Optional
+
+_MASK_64 = (1 << 64) - 1
+
+
+def _mix64(value):
+    # The splitmix64 finalizer. The ids are consecutive integers, and the objects of an event often got consecutive
+    # ids, so a hash correlating them (like a plain multiplication) would bias the sampling of the combinations.
+    value = (value + 0x9E3779B97F4A7C15) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def parse_sample_rates(value):
+    """Parse the sample rate option, a comma-separated list of 'Spec:rate', or a rate for all the specs.
+
+        Args:
+            value: The value of the option, for example 'Spec_A:0.01,Spec_B:0.1' or '0.05'.
+        Returns:
+            The dictionary of the rates by spec name, None being the key of the rate of all the other specs.
+        Raises:
+            ValueError: If a rate is not a number in (0, 1] or a spec is given twice.
+    """
+    rates = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        spec_name, _, rate = item.rpartition(':')
+        spec_name = spec_name.strip() or None
+        rate = float(rate)
+        if not 0 < rate <= 1:
+            raise ValueError(f"Invalid sample rate: {item.strip()}")
+        if spec_name in rates:
+            raise ValueError(f"Duplicate sample rate: {item.strip()}")
+        rates[spec_name] = rate
+    return rates
+
+
+class ObjectSampler:
+    """Decides which parameter objects of a spec are monitored.
+
+    The hooks of a spec run in several threads at once, so the counters are updated holding a lock,
+    shared with the previous sampler whose counts are continued.
+    """
+
+    def __init__(self, rate: float, first_sampled_id: int = 0, previous: Optional['ObjectSampler'] = None):
+        if not 0 < rate <= 1:
+            raise ValueError(f"Invalid sample rate: {rate}")
+        self.rate = rate
+        self._threshold = int(rate * (1 << 64))
+        # The objects with smaller ids keep the decision of the previous sampler, or are all monitored without
+        # one, so that a spec sampled while it runs keeps monitoring the objects it already saw (the ids are
+        # handed out in increasing order).
+        self.first_sampled_id = first_sampled_id
+        self.previous = previous
+        # Event name -> [events seen, events monitored], continuing the counts of the previous sampler.
+        self.events = previous.events if previous is not None else {}
+        self._lock = previous._lock if previous is not None else threading.Lock()
+
+    def is_sampled(self, param_id: int) -> bool:
+        """Returns whether the object with the given id is monitored.
+
+            Args:
+                param_id: The id of the object given by the identity registry.
+            Returns:
+                True for about rate of the ids, always the same for the same id.
+        """
+        if param_id < self.first_sampled_id:
+            return self.previous is None or self.previous.is_sampled(param_id)
+        return _mix64(param_id) < self._threshold
+
+    def sample_event(self, event_name: str, spec_params) -> bool:
+        """Counts an event and returns whether it is monitored.
+
+            Args:
+                event_name: The name of the event.
+                spec_params: The spec parameter combination of the event.
+            Returns:
+                True if all the parameter objects of the event are sampled.
+        """
+        sampled = all(self.is_sampled(spec_param.id) for spec_param in spec_params)
+        with self._lock:
+            counts = self.events.get(event_name)
+            if counts is None:
+                counts = self.events[event_name] = [0, 0]
+            counts[0] += 1
+            if sampled:
+                counts[1] += 1
+        return sampled
+
+    def get_statistics(self) -> dict:
+        """Returns the counters of the sampler.
+
+            Returns:
+                The configured rate, the events seen and monitored (in total and per event name)
+                and the effective rate, the fraction of the events monitored.
+        """
+        seen = sum(counts[0] for counts in self.events.values())
+        monitored = sum(counts[1] for counts in self.events.values())
+        return {
+            'rate': self.rate,
+            'seen_events': seen,
+            'monitored_events': monitored,
+            'effective_rate': monitored / seen if seen else self.rate,
+            'events': {event_name: {'seen': counts[0], 'monitored': counts[1]}
+                       for event_name, counts in self.events.items()},
+        }
@@ -0,0 +1,167 @@
+"""Keeps the time spent monitoring each spec within a budget.
+
+The governor thread wakes up every check interval and reads the time spent
+in the hooks and the monitors of each spec from the hook profiler (see
+pythonmop.hook_profiler). A spec whose time goes over the budget, either a
+fraction of the wall time since monitoring started or a number of seconds,
+is throttled following the policy:
+
+- 'detach': its event types are removed from the instrumented functions, so
+  its hooks and its monitor get no more events. The violations found so far
+  are kept.
+- 'sample' or 'sample:R': it only monitors R (default 0.1) of the parameter
+  objects created from then on, see pythonmop.object_sampling. The objects it
+  already saw stay monitored, so that their traces are complete. Sampling
+  only skips the monitor updates, so the specs without a monitor are
+  detached instead. A sampled spec stays watched: it gets the budget again
+  from the time it was sampled, and is detached if it goes over it, since
+  its hooks still run for every event.
+
+The actions are printed when they are taken and reported with the statistics.
+"""
+import threading
+from time import perf_counter
+
+from pythonmop.object_sampling import ObjectSampler
+from pythonmop.spec.identity_registry import identity_registry
+
+OVERHEAD_POLICIES = ('detach', 'sample')
+
+# The default rate of the 'sample' policy.
+DEFAULT_SAMPLE_RATE = 0.1
+
+
+def parse_overhead_budget(value):
+    """Parse the overhead budget option, either a percentage of the wall time ('5%') or seconds ('30' or '30s').
+
+        Args:
+            value: The value of the option.
+        Returns:
+            The budget and whether it is a fraction of the wall time (True) or seconds (False).
+        Raises:
+            ValueError: If the budget is not a positive number, or a percentage above 100.
+    """
+    value = value.strip()
+    if value.endswith('%'):
+        budget = float(value[:-1]) / 100
+        if not 0 < budget <= 1:
+            raise ValueError(f"Invalid overhead budget: {value}")
+        return budget, True
+    budget = float(value[:-1] if value.endswith('s') else value)
+    if not budget > 0:
+        raise ValueError(f"Invalid overhead budget: {value}")
+    return budget, False
+
+
+def parse_overhead_policy(value):
+    """Parse the overhead policy option, either 'detach', 'sample' or 'sample:R'.
+
+        Args:
+            value: The value of the option.
+        Returns:
+            The policy name and the sample rate (None unless the policy is 'sample').
+        Raises:
+            ValueError: If the policy is not supported.
+    """
+    policy, _, rate = value.partition(':')
+    if policy not in OVERHEAD_POLICIES or (rate and policy != 'sample'):
+        raise ValueError(f"Invalid overhead policy: {value}")
+    if policy != 'sample':
+        return policy, None
+    rate = float(rate) if rate else DEFAULT_SAMPLE_RATE
+    if not 0 < rate <= 1:
+        raise ValueError(f"Invalid sample rate: {rate}")
+    return policy, rate
+
+
+class OverheadGovernor:
+    """Throttles the specs going over the overhead budget.
+    """
+
+    def __init__(self, hook_profiler, spec_instances, budget: float, relative: bool, policy: str = 'detach',
+                 sample_rate: float = None, check_interval: float = 1.0):
+        self.hook_profiler = hook_profiler
+        # Spec name -> spec instance, the specs are removed once detached.
+        self.specs = {spec_instance.__class__.__name__: spec_instance for spec_instance in spec_instances}
+        # Spec name -> (elapsed time, monitoring time in ns) when the spec was sampled.
+        self._sampled = {}
+        self.budget = budget
+        self.relative = relative
+        self.policy = policy
+        self.sample_rate = sample_rate
+        self.check_interval = check_interval
+        # The actions taken, in order.
+        self.actions = []
+        self._start_time = perf_counter()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Starts the governor thread, which checks the specs every check interval.
+        """
+        self._start_time = perf_counter()
+        self._thread = threading.Thread(target=self._run, name='pymop-overhead-governor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the governor thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.check_interval):
+            self.check()
+
+    def check(self) -> None:
+        """Throttles the specs whose monitoring time is over the budget.
+        """
+        elapsed = perf_counter() - self._start_time
+        for spec_name, total_ns in self.hook_profiler.get_spec_totals().items():
+            spec_instance = self.specs.get(spec_name)
+            if spec_instance is None:
+                continue
+            # A sampled spec is measured from the time it was sampled.
+            start_time, start_ns = self._sampled.get(spec_name, (0.0, 0))
+            budget_seconds = self.budget * (elapsed - start_time) if self.relative else self.budget
+            monitoring_time = (total_ns - start_ns) / 1e9
+            if monitoring_time <= budget_seconds:
+                continue
+
+            if self.policy == 'sample' and spec_name not in self._sampled and spec_instance.monitor is not None:
+                action = 'sample'
+                # The objects registered from now on are sampled.
+                spec_instance.object_sampler = ObjectSampler(self.sample_rate, identity_registry.last_id + 1,
+                                                             spec_instance.object_sampler)
+                self._sampled[spec_name] = (elapsed, total_ns)
+                outcome = f'sampled at rate {self.sample_rate}'
+            else:
+                action = 'detach'
+                del self.specs[spec_name]
+                spec_instance.detach()
+                if spec_name in self._sampled:
+                    outcome = 'detached, it went over the budget again since it was sampled'
+                elif self.policy == 'sample':
+                    outcome = 'detached, it has no monitor to sample'
+                else:
+                    outcome = 'detached'
+
+            self.actions.append({'spec': spec_name, 'action': action,
+                                 'sample_rate': self.sample_rate if action == 'sample' else None,
+                                 'elapsed_time': elapsed, 'monitoring_time': monitoring_time,
+                                 'budget_time': budget_seconds})
+            print(f"PyMOP: Spec {spec_name} went over the overhead budget ({monitoring_time:.3f} of "
+                  f"{budget_seconds:.3f} seconds after {elapsed:.3f} seconds), {outcome}.")
+
+    def get_statistics(self) -> dict:
+        """Returns the configuration of the governor and the actions it took.
+
+            Returns:
+                The budget, whether it is a fraction of the wall time, the policy and the list of the actions,
+                each one with the spec, the action, the sample rate, the elapsed time, the monitoring time of the
+                spec and its budget in seconds at the time of the action (both since it was sampled, if it was).
+        """
+        return {'budget': self.budget, 'relative': self.relative, 'policy': self.policy,
+                'sample_rate': self.sample_rate, 'actions': list(self.actions)}
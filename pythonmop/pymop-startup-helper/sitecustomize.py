@@ -19,7 +19,11 @@ from threading import get_ident, Lock, local
 import timeit
 import atexit
 import copy
-import uuid
+from array import array
+import hashlib
+import marshal
+import re
+import json
 
 from dotenv import load_dotenv, dotenv_values  # type: ignore
 
@@ -56,7 +60,23 @@ PYMOP_INSTRUMENT_PYTEST: Instrument the pytest plugin. It can be slow.
 PYMOP_INSTRUMENT_PYMOP: Instrument the PyMOP library. It can be slow.
 PYMOP_NO_GARBAGE_COLLECTION: Perform garbage collection for the index tree.
 PYMOP_PRINT_VIOLATIONS_TO_CONSOLE: Print the violations to the console at runtime.
-PYMOP_INSTRUMENTATION_STRATEGY: Choose the instrumentation strategy to be used. The options are 'builtin' or 'ast'.
+PYMOP_INSTRUMENTATION_STRATEGY: Choose the instrumentation strategy to be used. The options are 'builtin', 'ast' or 'monitoring' (Python 3.12+).
+PYMOP_CALL_LOWERING: How function calls are instrumented under the AST strategy. The options are 'proxy' (default) or 'fused'.
+PYMOP_SELECTIVE_INSTRUMENTATION: Only emit the AST rewrites that the active specs hook. Set it to false to rewrite everything.
+PYMOP_INSTRUMENTATION_CACHE_DIR: Directory of the on-disk cache for AST-instrumented bytecode. The cache is disabled when not provided.
+PYMOP_RELOAD_STRATEGY: Which already-imported modules are reloaded to apply the AST instrumentation. The options are 'all' (default) or 'relevant'.
+PYMOP_PROFILE_RECORD: Record the call-site profile of the run (the relevant events per spec and line) into this file.
+PYMOP_PROFILE: Read the call-site profile from this file and leave the cold sites of the recorded modules un-instrumented.
+PYMOP_PROFILE_INSTRUMENT_ALL: Ignore PYMOP_PROFILE and instrument every site again.
+PYMOP_ASYNC_MONITORING: Run the parametric monitors in a background thread fed by a bounded event buffer, so that violations are reported later.
+PYMOP_ASYNC_BUFFER_SIZE: The maximum number of events waiting for the background monitor thread.
+PYMOP_ASYNC_OVERFLOW_POLICY: What to do with the events sent while the buffer is full. The options are 'block' (default), 'drop' or 'sample[:N]'.
+PYMOP_PROFILE_HOOKS: Measure the latencies of the hooks, monitor updates and state transitions per spec and event, reported after the statistics.
+PYMOP_PROFILE_HOOKS_SAMPLE_RATE: The fraction of the events whose latencies are measured, between 0 (excluded) and 1 (default).
+PYMOP_SAMPLE_RATE: Only monitor a sample of the parameter objects of the specs, as 'Spec:rate' pairs separated by commas, or a rate for all the specs.
+PYMOP_OVERHEAD_BUDGET: The monitoring time allowed to each spec, a percentage of the wall time ('5%') or seconds ('30s'). The specs going over it are throttled.
+PYMOP_OVERHEAD_POLICY: How the specs going over the overhead budget are throttled. The options are 'detach' (default) or 'sample[:R]'.
+PYMOP_OVERHEAD_CHECK_INTERVAL: The number of seconds between two checks of the overhead budget (default 1).
 '''
 # Check if the .pymop_env file exists and read the values from it
 _pymop_env_path = os.path.join(os.getcwd(), ".pymop_env")
@@ -117,6 +137,27 @@ instrument_python_source_code = _parse_bool(_pymop_env_get("PYMOP_INSTRUMENT_PYT
 no_garbage_collection = _parse_bool(_pymop_env_get("PYMOP_NO_GARBAGE_COLLECTION")) or False
 print_violations_to_console = _parse_bool(_pymop_env_get("PYMOP_PRINT_VIOLATIONS_TO_CONSOLE")) or False
 instrument_strategy = _pymop_env_get("PYMOP_INSTRUMENTATION_STRATEGY") or "ast"
+call_lowering = _pymop_env_get("PYMOP_CALL_LOWERING") or "proxy"
+selective_instrumentation = _parse_bool(_pymop_env_get("PYMOP_SELECTIVE_INSTRUMENTATION"))
+selective_instrumentation = True if selective_instrumentation is None else selective_instrumentation
+instrumentation_cache_dir = _pymop_env_get("PYMOP_INSTRUMENTATION_CACHE_DIR") or None
+reload_strategy = _pymop_env_get("PYMOP_RELOAD_STRATEGY") or "all"
+call_site_profile_record_path = _pymop_env_get("PYMOP_PROFILE_RECORD") or None
+call_site_profile_path = _pymop_env_get("PYMOP_PROFILE") or None
+profile_instrument_all = _parse_bool(_pymop_env_get("PYMOP_PROFILE_INSTRUMENT_ALL")) or False
+async_monitoring = _parse_bool(_pymop_env_get("PYMOP_ASYNC_MONITORING")) or False
+async_buffer_size = _pymop_env_get("PYMOP_ASYNC_BUFFER_SIZE") or "65536"
+async_overflow_policy = _pymop_env_get("PYMOP_ASYNC_OVERFLOW_POLICY") or "block"
+async_sample_interval = 1
+profile_hooks = _parse_bool(_pymop_env_get("PYMOP_PROFILE_HOOKS")) or False
+profile_hooks_sample_rate = _pymop_env_get("PYMOP_PROFILE_HOOKS_SAMPLE_RATE") or "1"
+object_sample_rates = _pymop_env_get("PYMOP_SAMPLE_RATE") or None
+overhead_budget = _pymop_env_get("PYMOP_OVERHEAD_BUDGET") or None
+overhead_policy = _pymop_env_get("PYMOP_OVERHEAD_POLICY") or "detach"
+overhead_check_interval = _pymop_env_get("PYMOP_OVERHEAD_CHECK_INTERVAL") or "1"
+
+# Set by `pymop warm`: only the configuration and the instrumentation helpers are needed, no monitoring.
+warm_up_only = os.environ.get("PYMOP_WARM_UP_ONLY") == "1"
 
 ################################################################################
 ##                            AST Instrumentation                             ##
@@ -128,8 +169,18 @@ _PYMOP_INSTRUMENTATION_COMPLETE = False
 # Track import stack to avoid double-counting timing for nested imports
 _import_stack = []  # Stack of module origins currently being processed
 
+# Per module origin timings and sizes of the AST instrumentation, only recorded with PYMOP_STATISTICS.
+_instrumentation_profile = {}
+_import_child_times = []  # Time spent in nested instrumented imports, one entry per module being executed
+_module_profiling_time = 0.0  # Time spent recording the instrumentation profile, left out of the import times
+
 stdlib_path = os.path.dirname(os.__file__)
 
+# PyMOP itself is not instrumented wherever it is installed, an editable install or a checkout on the path is not
+# in site-packages.
+_pythonmop_spec = importlib.util.find_spec('pythonmop')
+pythonmop_path = os.path.dirname(_pythonmop_spec.origin) if _pythonmop_spec is not None and _pythonmop_spec.origin else None
+
 original_iter = builtins.iter
 class InstrumentedIterator():
 
@@ -259,27 +310,90 @@ class InstrumentableList(list):
     #     self.in_iter = True
     #     return custom_iter(self, filename=self.loop_filename, lineno=self.loop_lineno, col_offset=self.col_offset)
 
+class CallSiteTable:
+    '''
+    Process-wide table of the instrumented call sites and for-loops.
+
+    LiteralTransformer numbers the sites of a module deterministically
+    (0, 1, 2, ... in traversal order), so the generated code only carries
+    small integer constants and stays identical across runs. When an
+    instrumented module is executed, it registers its sites and receives
+    the base of a contiguous block of global site ids, stored in the module
+    global ____pymop__call__site__base____. The global id of a site is
+    base + per-module id. Files, lines, columns and flags live in parallel
+    arrays and are only resolved when an event is fired.
+    '''
+    FLAG_FOR_LOOP = 2
+
+    def __init__(self):
+        self._lock = Lock()
+        self._files = []
+        self._file_indices = array('I')
+        self._linenos = array('I')
+        self._col_offsets = array('I')
+        self._flags = array('B')
+
+    def register_module(self, path, sites):
+        '''
+        Register the (lineno, col_offset, flags) sites of one module and return their base id.
+        '''
+        with self._lock:
+            base = len(self._linenos)
+            file_index = len(self._files)
+            self._files.append(path)
+            for lineno, col_offset, flags in sites:
+                self._file_indices.append(file_index)
+                self._linenos.append(lineno)
+                self._col_offsets.append(col_offset)
+                self._flags.append(flags)
+        return base
+
+    def location(self, site_id):
+        '''
+        Return the (filename, lineno, col_offset) of a global site id.
+        '''
+        return self._files[self._file_indices[site_id]], self._linenos[site_id], self._col_offsets[site_id]
+
+    def flags(self, site_id):
+        return self._flags[site_id]
+
+    def __len__(self):
+        return len(self._linenos)
+
+call_site_table = CallSiteTable()
+
+def _has_hooks(tracker_method):
+    '''
+    Specs attach hooks by replacing a tracker method with an instrumented
+    wrapper (see Spec._instrument_event). Unhooked methods are no-ops marked
+    with is_instrumented = False, so the proxies skip them and never resolve
+    the location of the site.
+    '''
+    return tracker_method.is_instrumented
+
 class PymopForLoopTracker:
     def __init__(self):
         self._stash = local()
 
-    def for_loop_start_proxy(self, iterable, static_key, filename, lineno, col_offset):
+    def for_loop_start_proxy(self, iterable, static_key, site_base):
         # We use a key based on the static key and the frame of the caller
         # This allows us to handle recursion and multithreading safely.
         key = (static_key, id(sys._getframe(1)))
+        site_id = site_base + static_key
 
         if not hasattr(self._stash, 'data'):
             self._stash.data = {}
 
-        self._stash.data[key] = (iterable, filename, lineno, col_offset)
+        self._stash.data[key] = (iterable, site_id)
 
         # Call the original for loop start
-        self.for_loop_start(iterable, filename, lineno, col_offset)
+        if _has_hooks(self.for_loop_start):
+            self.for_loop_start(iterable, *call_site_table.location(site_id))
 
         # Return the iterable
         return iterable
     
-    def for_loop_end_proxy(self, static_key, filename, lineno, col_offset):
+    def for_loop_end_proxy(self, static_key, site_base):
         key = (static_key, id(sys._getframe(1)))
 
         # We read the iterable from the stash for the new key
@@ -287,11 +401,12 @@ class PymopForLoopTracker:
 
         # If the iterable is in the stash, we read it and delete the stash entry
         if hasattr(self._stash, 'data') and key in self._stash.data:
-            iterable, _, _, _ = self._stash.data[key]
+            iterable, _ = self._stash.data[key]
             del self._stash.data[key]
 
         # Call the original for loop end
-        self.for_loop_end(iterable, filename, lineno, col_offset)
+        if _has_hooks(self.for_loop_end):
+            self.for_loop_end(iterable, *call_site_table.location(site_base + static_key))
 
     def for_loop_start(self, iterable, filename, lineno, col_offset):
         pass
@@ -301,6 +416,8 @@ class PymopForLoopTracker:
 
     setattr(for_loop_start, '__pymop_last_args_contain_ast_hints__', True)
     setattr(for_loop_end, '__pymop_last_args_contain_ast_hints__', True)
+    setattr(for_loop_start, 'is_instrumented', False)
+    setattr(for_loop_end, 'is_instrumented', False)
 
 original_dict = builtins.dict
 
@@ -381,12 +498,11 @@ class PymopFuncCallTracker:
     def __init__(self):
         self._stash = local()
 
-    def before_call_proxy(self, static_key, func, args, kwargs, hints):
-        filename, lineno, col_offset, has_args_or_kwargs = hints
-        
+    def before_call_proxy(self, static_key, func, args, kwargs, site_base):
         # We use a key based on the static key and the frame of the caller (which is the instrumented function wrapper)
         # This allows us to handle recursion and multithreading safely.
         key = (static_key, id(sys._getframe(1)))
+        site_id = site_base + static_key
         
         final_args = args if args is not None else ()
         final_kwargs = kwargs if kwargs is not None else {}
@@ -394,11 +510,12 @@ class PymopFuncCallTracker:
         if not hasattr(self._stash, 'data'):
             self._stash.data = {}
 
-        # store hints as well for after_call
+        # store the site id as well for after_call
         # print('BEFORE:', key)
-        self._stash.data[key] = (func, final_args, final_kwargs, hints)
+        self._stash.data[key] = (func, final_args, final_kwargs, site_id)
         
-        self.before_call(func, final_args, final_kwargs, filename, lineno, col_offset)
+        if _has_hooks(self.before_call):
+            self.before_call(func, final_args, final_kwargs, *call_site_table.location(site_id))
         return func
 
     def get_args(self, static_key):
@@ -418,18 +535,38 @@ class PymopFuncCallTracker:
     def after_call_proxy(self, static_key, result):
         key = (static_key, id(sys._getframe(1)))
         
-        func, args, kwargs = None, (), {}
-        filename, lineno, col_offset = None, None, None
+        func, args, kwargs, site_id = None, (), {}, None
 
         # print('AFTER:', key)
 
         if hasattr(self._stash, 'data') and key in self._stash.data:
-            func, args, kwargs, hints = self._stash.data[key]
-            filename, lineno, col_offset, _ = hints
+            func, args, kwargs, site_id = self._stash.data[key]
             # Clean up
             del self._stash.data[key]
 
-        self.after_call(result, func, args, kwargs, filename, lineno, col_offset)
+        if _has_hooks(self.after_call):
+            filename, lineno, col_offset = call_site_table.location(site_id) if site_id is not None else (None, None, None)
+            self.after_call(result, func, args, kwargs, filename, lineno, col_offset)
+        return result
+
+    def before_call_fused(self, func, args, kwargs, static_key, site_base):
+        '''
+        First of the two proxies of the 'fused' call lowering. It fires the
+        before event and returns the call as a [func, args, kwargs, site_id]
+        list, which the instrumented code binds to a local and calls in place,
+        in the original frame, so there is no stash and no frame walk.
+        '''
+        call = [func, args if args is not None else (), kwargs if kwargs is not None else {}, site_base + static_key]
+        if _has_hooks(self.before_call):
+            self.before_call(func, call[1], call[2], *call_site_table.location(call[3]))
+        return call
+
+    def after_call_fused(self, call, result):
+        # Emptied, so that the local still bound to the call does not keep the arguments alive.
+        func, args, kwargs, site_id = call
+        call.clear()
+        if _has_hooks(self.after_call):
+            self.after_call(result, func, args, kwargs, *call_site_table.location(site_id))
         return result
     
     def before_call(self, func, args, kwargs, filename, lineno, offset):
@@ -440,6 +577,11 @@ class PymopFuncCallTracker:
 
     setattr(before_call, '__pymop_last_args_contain_ast_hints__', True)
     setattr(after_call, '__pymop_last_args_contain_ast_hints__', True)
+    # Position of the callee in the arguments, the hooks may be declared for some callees only.
+    setattr(before_call, '__pymop_callee_arg__', 1)
+    setattr(after_call, '__pymop_callee_arg__', 2)
+    setattr(before_call, 'is_instrumented', False)
+    setattr(after_call, 'is_instrumented', False)
 
 str.strip
 class PymopStrTracker:
@@ -553,6 +695,31 @@ for attr in dir(PymopArithmeticOperatorTracker):
         method = getattr(PymopArithmeticOperatorTracker, attr)
         setattr(method, '__pymop_last_args_contain_ast_hints__', True)
 
+class PymopOperatorListeners():
+    '''
+    One flag per operator tracker method, True while some spec has hooks on it.
+    The rewritten comparisons and arithmetic operators check their flag and run
+    the plain operator inline while it is False. The flags are updated through
+    the event listener callbacks of the specs, so hooks attached at any time
+    start receiving events right away.
+    '''
+    TRACKERS = (PymopComparisonTracker, PymopArithmeticOperatorTracker)
+
+    def __init__(self):
+        for tracker in self.TRACKERS:
+            for attr in dir(tracker):
+                if attr.startswith('__pymop__'):
+                    setattr(self, attr, False)
+
+    def update(self, namespace, func_name):
+        if namespace not in self.TRACKERS or not func_name.startswith('__pymop__'):
+            return
+        func = getattr(namespace, func_name)
+        setattr(self, func_name, bool(getattr(func, 'pythonmop_before_event_types', None) or
+                                      getattr(func, 'pythonmop_after_event_types', None)))
+
+____pymop__operator__listeners____ = PymopOperatorListeners()
+
 class PyMopInjectedBuiltins():
     def __init__(self):
         self.dict = InstrumentedDict
@@ -581,6 +748,237 @@ class OriginalBuiltins():
 ____original__builtins____ = OriginalBuiltins()
 ____pymop__injected__builtins____ = PyMopInjectedBuiltins()
 
+'''
+Trackers whose hooks decide which nodes the LiteralTransformer has to rewrite.
+Specs are only imported after the AST instrumentation is set up, so the hooks
+are found by statically scanning the active spec files for `call(<tracker>, '<regex>')`.
+'''
+_PYMOP_TRACKERS = {
+    'PymopComparisonTracker': PymopComparisonTracker,
+    'PymopArithmeticOperatorTracker': PymopArithmeticOperatorTracker,
+    'PymopForLoopTracker': PymopForLoopTracker,
+    'PymopFuncCallTracker': PymopFuncCallTracker,
+    'PymopStrTracker': PymopStrTracker,
+}
+
+def _active_spec_files():
+    '''
+    Return the paths of the spec files selected by PYMOP_SPEC_FOLDER and PYMOP_ACTIVE_SPECS.
+    '''
+    if not spec_folder or not os.path.isdir(spec_folder):
+        return []
+
+    if spec_names == 'all':
+        file_names = sorted(f for f in os.listdir(spec_folder) if f.endswith('.py') and f != '__init__.py')
+    else:
+        file_names = [name.strip() + '.py' for name in spec_names.split(',') if name.strip()]
+
+    return [os.path.join(spec_folder, file_name) for file_name in file_names]
+
+def _tracker_methods(tracker):
+    return set(name for name in dir(tracker)
+               if callable(getattr(tracker, name)) and not isinstance(getattr(tracker, name), type))
+
+def _hooked_tracker_methods():
+    '''
+    Find the tracker methods hooked by the active specs.
+
+    Returns a dict mapping each tracker name to the set of its hooked methods,
+    or None when the hooks cannot be decided statically, in which case every
+    node is rewritten like before.
+    '''
+    if not selective_instrumentation or convert_specs:
+        return None
+
+    hooked = {tracker_name: set() for tracker_name in _PYMOP_TRACKERS}
+    for spec_file in _active_spec_files():
+        try:
+            with open(spec_file, 'rb') as f:
+                spec_tree = ast.parse(f.read(), filename=spec_file)
+        except (OSError, SyntaxError, ValueError):
+            # Missing or broken spec files are reported when the specs are imported.
+            return None
+
+        # Resolve call(<tracker>, '<regex>') targets the way Spec._get_regex_function_name does.
+        resolved_nodes = set()
+        for node in ast.walk(spec_tree):
+            if not isinstance(node, ast.Call) or len(node.args) < 2:
+                continue
+            func_name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, 'attr', None)
+            namespace = node.args[0]
+            tracker_name = namespace.id if isinstance(namespace, ast.Name) else getattr(namespace, 'attr', None)
+            if func_name != 'call' or tracker_name not in _PYMOP_TRACKERS:
+                continue
+
+            methods = _tracker_methods(_PYMOP_TRACKERS[tracker_name])
+            field = node.args[1]
+            if isinstance(field, ast.Constant) and isinstance(field.value, str):
+                try:
+                    pattern = re.compile(field.value)
+                    methods = set(method for method in methods if pattern.fullmatch(method))
+                except re.error:
+                    pass
+            hooked[tracker_name] |= methods
+            resolved_nodes.add(id(namespace))
+
+        # Any other use of a tracker (aliases, computed fields, ...) is treated as hooking all of it.
+        for node in ast.walk(spec_tree):
+            tracker_name = node.id if isinstance(node, ast.Name) else node.attr if isinstance(node, ast.Attribute) else None
+            if tracker_name in _PYMOP_TRACKERS and id(node) not in resolved_nodes:
+                hooked[tracker_name] |= _tracker_methods(_PYMOP_TRACKERS[tracker_name])
+
+    return hooked
+
+_hooked_trackers = _hooked_tracker_methods() if instrument_strategy == 'ast' else None
+
+'''
+The LiteralTransformer always swaps list and dict literals and the list(), dict(),
+iter() and sorted() calls for the injected builtins. Specs observe them through
+these names, e.g. call(list, 'append') or call(InstrumentedIterator, '__next__').
+'''
+_PYMOP_INJECTED_BUILTIN_HOOKS = {
+    'list': ('list',),
+    'dict': ('dict',),
+    'InstrumentedIterator': ('iter',),
+    'builtins': ('sorted',),
+}
+
+def _hooked_injected_builtins():
+    '''
+    Find the injected builtins observed by the active specs.
+
+    Returns the set of builtin names ('list', 'dict', 'iter', 'sorted') whose
+    rewrites are observed, or None when this cannot be decided statically.
+    '''
+    if _hooked_trackers is None:
+        return None
+
+    hooked = set()
+    for spec_file in _active_spec_files():
+        try:
+            with open(spec_file, 'rb') as f:
+                spec_tree = ast.parse(f.read(), filename=spec_file)
+        except (OSError, SyntaxError, ValueError):
+            return None
+
+        for node in ast.walk(spec_tree):
+            name = node.id if isinstance(node, ast.Name) else node.attr if isinstance(node, ast.Attribute) else None
+            hooked.update(_PYMOP_INJECTED_BUILTIN_HOOKS.get(name, ()))
+
+    return hooked
+
+_hooked_builtins = _hooked_injected_builtins() if instrument_strategy == 'ast' else None
+
+class CallSiteProfile:
+    '''
+    Per spec counts of the relevant events fired at each source line.
+
+    An event is relevant when the hook of the spec returns anything but
+    FALSE_EVENT. PYMOP_PROFILE_RECORD records these counts together with
+    the modules instrumented during the run. PYMOP_PROFILE reads them back,
+    and LiteralTransformer then leaves the sites of the recorded modules
+    whose line never produced a relevant event un-instrumented. Sites
+    are matched by line, so a line with one hot site keeps all its sites.
+    '''
+    VERSION = 1
+
+    def __init__(self, specs=None, modules=None):
+        # Spec name -> file name -> line number -> number of relevant events.
+        self.specs = specs if specs is not None else {}
+        self.modules = modules if modules is not None else set()
+
+    def add_spec(self, spec_name):
+        self.specs.setdefault(spec_name, {})
+
+    def add_module(self, origin):
+        self.modules.add(origin)
+
+    def record(self, spec_name, filename, lineno):
+        # Concurrent increments may lose a count, but never turn a hot line cold.
+        lines = self.specs.setdefault(spec_name, {}).setdefault(filename, {})
+        lines[lineno] = lines.get(lineno, 0) + 1
+
+    def relevant_events(self):
+        return sum(count for files in self.specs.values() for lines in files.values() for count in lines.values())
+
+    def save(self, path):
+        data = {
+            'version': self.VERSION,
+            'modules': sorted(self.modules),
+            'specs': {spec_name: {filename: {str(lineno): count for lineno, count in sorted(lines.items())}
+                                  for filename, lines in sorted(files.items()) if filename}
+                      for spec_name, files in sorted(self.specs.items())},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"unsupported profile version {data.get('version')}")
+        specs = {spec_name: {filename: {int(lineno): count for lineno, count in lines.items()}
+                             for filename, lines in files.items()}
+                 for spec_name, files in data['specs'].items()}
+        return cls(specs, set(data['modules']))
+
+    def hot_lines(self, spec_names):
+        '''
+        Return the lines with relevant events of any of the given specs for
+        each recorded module, or None when one of the specs was not recorded.
+        '''
+        if any(spec_name not in self.specs for spec_name in spec_names):
+            return None
+
+        hot_lines = {origin: set() for origin in self.modules}
+        for spec_name in spec_names:
+            for filename, lines in self.specs[spec_name].items():
+                if filename in hot_lines:
+                    hot_lines[filename].update(lines)
+        return {origin: frozenset(lines) for origin, lines in hot_lines.items()}
+
+def _load_call_site_profile():
+    '''
+    Read the PYMOP_PROFILE call-site profile.
+
+    Returns a dict mapping each recorded module to its hot lines for the
+    active specs, or None when every site is instrumented.
+    '''
+    if not call_site_profile_path or profile_instrument_all or convert_specs or instrument_strategy != 'ast':
+        return None
+
+    try:
+        profile = CallSiteProfile.load(call_site_profile_path)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"✘ Failed to read the call-site profile {call_site_profile_path}: {e}. Every site is instrumented.")
+        return None
+
+    active_spec_names = [os.path.basename(spec_file)[:-len('.py')] for spec_file in _active_spec_files()]
+    hot_lines = profile.hot_lines(active_spec_names)
+    if hot_lines is None:
+        print(f"✘ The call-site profile {call_site_profile_path} was recorded without some of the active specs. "
+              f"Every site is instrumented.")
+    return hot_lines
+
+_call_site_hot_lines = _load_call_site_profile()
+
+# Filled in the PYMOP_PROFILE_RECORD run, saved by pymop_teardown.
+_call_site_profile_recorder = CallSiteProfile() if call_site_profile_record_path else None
+# Throttles the specs going over the overhead budget, None unless a budget is set.
+_overhead_governor = None
+
+def _module_hot_lines(origin):
+    '''
+    Return the hot lines of a module, or None when all its sites are instrumented.
+    '''
+    if _call_site_hot_lines is None:
+        return None
+    return _call_site_hot_lines.get(origin)
+
+# Per module report of the rewritten and skipped nodes, filled by ASTLoaderWrapper.
+_instrumentation_report = {}
+
 
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -701,11 +1099,124 @@ class LiteralTransformer(ast.NodeTransformer):
         ast.BitOr: "__pymop__ior__",
         ast.BitXor: "__pymop__ixor__",
     }
+    # The local the 'fused' call lowering binds the calls to.
+    FUSED_CALL_NAME = '____pymop__call____'
 
-    def __init__(self, path):
+    def __init__(self, path, hooked_trackers=None, call_lowering='proxy', hot_lines=None):
         self.path = path
         self.context_stack = []
         self.unique_key_counter = 0
+        # Tracker name -> hooked methods, None to rewrite every supported node.
+        self.hooked_trackers = hooked_trackers
+        # Node kind -> [rewritten, skipped] counts for the instrumentation report.
+        self.report = {}
+        self.call_lowering = call_lowering
+        # (lineno, col_offset, flags) of the call sites and for-loops, indexed by their per-module id.
+        self.call_sites = []
+        # Number of operator listener guards emitted so far.
+        self.operator_guards = 0
+        # Lines of the sites to instrument from the call-site profile, None to instrument every site.
+        self.hot_lines = hot_lines
+
+    def _new_call_site(self, lineno, col_offset, flags):
+        self.call_sites.append((lineno, col_offset, flags))
+        return len(self.call_sites) - 1
+
+    def _call_site_base_node(self, lineno, col_offset):
+        return ast.Name(id="____pymop__call__site__base____", ctx=ast.Load(), lineno=lineno, col_offset=col_offset)
+
+    def _is_hooked(self, tracker_name, method_name=None):
+        if self.hooked_trackers is None:
+            return True
+        hooked_methods = self.hooked_trackers[tracker_name]
+        return bool(hooked_methods) if method_name is None else method_name in hooked_methods
+
+    def _is_hot(self, lineno):
+        return self.hot_lines is None or lineno in self.hot_lines
+
+    def _count(self, kind, rewritten=True):
+        counts = self.report.setdefault(kind, [0, 0])
+        counts[0 if rewritten else 1] += 1
+
+    def _operator_listeners_node(self, operator_names, lineno, col_offset):
+        '''
+        Returns AST for:
+        (____pymop__operator__listeners____.<name 1> or ____pymop__operator__listeners____.<name 2> ...)
+        '''
+        flags = [
+            ast.Attribute(
+                value=ast.Name(id="____pymop__operator__listeners____", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
+                attr=func_name,
+                ctx=ast.Load(),
+                lineno=lineno,
+                col_offset=col_offset
+            )
+            for func_name in sorted(operator_names)
+        ]
+        if len(flags) == 1:
+            return flags[0]
+        return ast.BoolOp(op=ast.Or(), values=flags, lineno=lineno, col_offset=col_offset)
+
+    def _guard_operator(self, operator_names, instrumented_node, plain_node, lineno, col_offset):
+        '''
+        Returns AST for:
+        (<instrumented_node> if <any of the operators has listeners> else <plain_node>)
+        Only one branch runs, so the operands are still evaluated once. Nested
+        operators are merged into the outermost guard, which keeps the code
+        size linear: its instrumented branch calls the trackers for every
+        operator of the expression and its plain branch calls none.
+        '''
+        guard = ast.IfExp(
+            test=self._operator_listeners_node(operator_names, lineno, col_offset),
+            body=instrumented_node,
+            orelse=plain_node,
+            lineno=lineno,
+            col_offset=col_offset
+        )
+        guard.pymop_operator_names = frozenset(operator_names)
+        self.operator_guards += 1
+        return guard
+
+    def _select_operator_branch(self, node, instrumented, operator_names=None):
+        '''
+        Returns the node with every operator guard inside replaced by one of its
+        branches, adding the operators of the replaced guards to operator_names.
+        Unchanged subtrees are shared, changed nodes are copied.
+        '''
+        guard_operator_names = getattr(node, 'pymop_operator_names', None)
+        if guard_operator_names is not None:
+            if operator_names is not None:
+                operator_names |= guard_operator_names
+            return node.body if instrumented else node.orelse
+
+        new_fields = {}
+        for name, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                new_value = self._select_operator_branch(value, instrumented, operator_names)
+                if new_value is not value:
+                    new_fields[name] = new_value
+            elif isinstance(value, list):
+                new_value = [self._select_operator_branch(item, instrumented, operator_names) if isinstance(item, ast.AST) else item
+                             for item in value]
+                if any(new_item is not item for new_item, item in zip(new_value, value)):
+                    new_fields[name] = new_value
+
+        if not new_fields:
+            return node
+
+        new_node = copy.copy(node)
+        for name, value in new_fields.items():
+            setattr(new_node, name, value)
+        return new_node
+
+    def _split_operator_branches(self, node, operator_guards, operator_names):
+        '''
+        Returns the instrumented and the plain version of an operator node
+        whose operands may contain operator guards emitted after operator_guards.
+        '''
+        if operator_guards == self.operator_guards:
+            return node, node
+        return self._select_operator_branch(node, True, operator_names), self._select_operator_branch(node, False)
 
     def _read_line(self, path, lineno):
         try:
@@ -819,7 +1330,7 @@ class LiteralTransformer(ast.NodeTransformer):
             col_offset=col_offset
         )
 
-
+        self._count('list')
         return new_node
 
     def visit_ListComp(self, node):
@@ -848,6 +1359,7 @@ class LiteralTransformer(ast.NodeTransformer):
             col_offset=col_offset
         )
 
+        self._count('list')
         return new_node
 
     def visit_Dict(self, node):
@@ -870,6 +1382,7 @@ class LiteralTransformer(ast.NodeTransformer):
                 end_col_offset=node.end_col_offset,
             )
 
+            self._count('dict')
             return new_node
 
         key_value_pairs = [
@@ -887,15 +1400,24 @@ class LiteralTransformer(ast.NodeTransformer):
             end_col_offset=node.end_col_offset,
         )
 
+        self._count('dict')
         return new_node
 
     def visit_Compare(self, node):
+        operator_guards = self.operator_guards
         self.generic_visit(node)
 
         if len(node.ops) == 1:
             op = node.ops[0]
             if type(op) in self.COMPARE_OP_MAP:
                 func_name = self.COMPARE_OP_MAP[type(op)]
+                if not self._is_hooked('PymopComparisonTracker', func_name) or not self._is_hot(node.lineno):
+                    self._count('compare', rewritten=False)
+                    return node
+
+                operator_names = {func_name}
+                node, plain_node = self._split_operator_branches(node, operator_guards, operator_names)
+
                 lineno = node.lineno
                 col_offset = node.col_offset
                 
@@ -925,16 +1447,25 @@ class LiteralTransformer(ast.NodeTransformer):
                     col_offset=col_offset
                 )
 
-                return new_node
+                self._count('compare')
+                return self._guard_operator(operator_names, new_node, plain_node, lineno, col_offset)
 
         return node
 
     def visit_BinOp(self, node):
+        operator_guards = self.operator_guards
         self.generic_visit(node)
 
         op = node.op
         if type(op) in self.BINOP_MAP:
             func_name = self.BINOP_MAP[type(op)]
+            if not self._is_hooked('PymopArithmeticOperatorTracker', func_name) or not self._is_hot(node.lineno):
+                self._count('binop', rewritten=False)
+                return node
+
+            operator_names = {func_name}
+            node, plain_node = self._split_operator_branches(node, operator_guards, operator_names)
+
             lineno = node.lineno
             col_offset = node.col_offset
             
@@ -964,16 +1495,25 @@ class LiteralTransformer(ast.NodeTransformer):
                 col_offset=col_offset
             )
 
-            return new_node
+            self._count('binop')
+            return self._guard_operator(operator_names, new_node, plain_node, lineno, col_offset)
 
         return node
 
     def visit_AugAssign(self, node):
+        operator_guards = self.operator_guards
         self.generic_visit(node)
 
         op = node.op
         if type(op) in self.AUGASSIGN_OP_MAP:
             func_name = self.AUGASSIGN_OP_MAP[type(op)]
+            if not self._is_hooked('PymopArithmeticOperatorTracker', func_name) or not self._is_hot(node.lineno):
+                self._count('augassign', rewritten=False)
+                return node
+
+            operator_names = {func_name}
+            node, plain_node = self._split_operator_branches(node, operator_guards, operator_names)
+
             lineno = node.lineno
             col_offset = node.col_offset
             
@@ -1014,17 +1554,31 @@ class LiteralTransformer(ast.NodeTransformer):
                 col_offset=col_offset
             )
 
-            return new_node
+            # Statement version of the operator guard: the plain augmented assignment runs without listeners.
+            guard = ast.If(
+                test=self._operator_listeners_node(operator_names, lineno, col_offset),
+                body=[new_node],
+                orelse=[plain_node],
+                lineno=lineno,
+                col_offset=col_offset
+            )
+
+            self._count('augassign')
+            return guard
 
         return node
 
     def visit_For(self, node):
         self.generic_visit(node)
 
+        if not self._is_hooked('PymopForLoopTracker') or not self._is_hot(node.lineno):
+            self._count('for', rewritten=False)
+            return node
+
         lineno = node.lineno
         col_offset = node.col_offset
 
-        unique_key = uuid.uuid4().hex
+        site_key = self._new_call_site(lineno, col_offset, CallSiteTable.FLAG_FOR_LOOP)
 
         new_iter = ast.Call(
             func=ast.Attribute(
@@ -1047,10 +1601,8 @@ class LiteralTransformer(ast.NodeTransformer):
             ),
             args=[
                 node.iter,
-                ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset),
-                ast.Constant(value=self.path, lineno=lineno, col_offset=col_offset),
-                ast.Constant(value=lineno, lineno=lineno, col_offset=col_offset),
-                ast.Constant(value=col_offset, lineno=lineno, col_offset=col_offset)
+                ast.Constant(value=site_key, lineno=lineno, col_offset=col_offset),
+                self._call_site_base_node(lineno, col_offset),
             ],
             keywords=[],
             lineno=node.lineno,
@@ -1080,10 +1632,8 @@ class LiteralTransformer(ast.NodeTransformer):
                     col_offset=col_offset
                 ),
                 args=[
-                    ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset),
-                    ast.Constant(value=self.path, lineno=lineno, col_offset=col_offset),
-                    ast.Constant(value=lineno, lineno=lineno, col_offset=col_offset),
-                    ast.Constant(value=col_offset, lineno=lineno, col_offset=col_offset)
+                    ast.Constant(value=site_key, lineno=lineno, col_offset=col_offset),
+                    self._call_site_base_node(lineno, col_offset),
                 ],
                 keywords=[],
                 lineno=node.lineno,
@@ -1102,8 +1652,34 @@ class LiteralTransformer(ast.NodeTransformer):
             col_offset=node.col_offset
         )
 
+        self._count('for')
         return try_finally_node
 
+    def _in_function_scope(self, node):
+        '''
+        Whether an assignment expression at node binds a local of a function
+        or lambda. In a class body or at module level it would add an
+        attribute or a global, and it is not allowed in a comprehension
+        iterable, so the 'fused' call lowering is only used in functions.
+        '''
+        child = node
+        for ancestor in reversed(self.context_stack):
+            if isinstance(ancestor, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                return any(child is statement for statement in ancestor.body)
+            if isinstance(ancestor, ast.Lambda):
+                return child is ancestor.body
+            if isinstance(ancestor, (ast.ClassDef, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+                return False
+            child = ancestor
+        return False
+
+    def _is_strip_hooked(self, lineno):
+        if self._is_hooked('PymopStrTracker', 'strip') and self._is_hot(lineno):
+            return True
+        # The call falls through to the generic call lowering below.
+        self._count('strip', rewritten=False)
+        return False
+
     def visit_Call(self, node):
         self.generic_visit(node)
 
@@ -1158,7 +1734,7 @@ class LiteralTransformer(ast.NodeTransformer):
                 return node
             
             # if the function is .strip()
-            if func.id == 'strip':
+            if func.id == 'strip' and self._is_strip_hooked(node.lineno):
                 lineno = node.lineno
                 col_offset = node.col_offset
                 new_args = node.args
@@ -1180,6 +1756,7 @@ class LiteralTransformer(ast.NodeTransformer):
                     lineno=lineno,
                     col_offset=col_offset,
                 )
+                self._count('strip')
                 return node
 
         elif isinstance(func, ast.Attribute):
@@ -1198,7 +1775,7 @@ class LiteralTransformer(ast.NodeTransformer):
                 return node
             
             # if the function is .strip()
-            if func.attr == 'strip':
+            if func.attr == 'strip' and self._is_strip_hooked(node.lineno):
                 lineno = node.lineno
                 col_offset = node.col_offset
                 new_args = [func.value] + node.args
@@ -1220,21 +1797,24 @@ class LiteralTransformer(ast.NodeTransformer):
                     lineno=lineno,
                     col_offset=col_offset,
                 )
+                self._count('strip')
                 return node
 
-            if func.attr in ('before_call_proxy', 'after_call_proxy', 'get_args', 'get_kwargs'):
+            if func.attr in ('before_call_proxy', 'after_call_proxy', 'get_args', 'get_kwargs', 'before_call_fused', 'after_call_fused'):
                 if isinstance(func.value, ast.Attribute) and func.value.attr == 'pymopFuncCallTrackerInstance':
                     return node
 
+        if not self._is_hooked('PymopFuncCallTracker') or not self._is_hot(node.lineno):
+            self._count('call', rewritten=False)
+            return node
+
         lineno = node.lineno
         col_offset = node.col_offset
 
-        unique_key = uuid.uuid4().hex
-
         has_args = bool(node.args)
         has_kwargs = bool(node.keywords)
-        has_args_or_kwargs = has_args or has_kwargs
-        hints_node = ast.Constant(value=(self.path, lineno, col_offset, has_args_or_kwargs), lineno=lineno, col_offset=col_offset)
+        site_key = self._new_call_site(lineno, col_offset, 0)
+        site_key_node = ast.Constant(value=site_key, lineno=lineno, col_offset=col_offset)
 
         pymop_instance_node = ast.Attribute(
             value=ast.Name(id="____pymop__injected__builtins____", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
@@ -1262,14 +1842,62 @@ class LiteralTransformer(ast.NodeTransformer):
         else:
             kwargs_node_for_proxy = ast.Constant(value=None, lineno=lineno, col_offset=col_offset)
 
+        if self.call_lowering == 'fused' and self._in_function_scope(node):
+            # after_call_fused((c := before_call_fused(func, args, kwargs, site_key, site_base)), c[0](*c[1], **c[2]))
+            # The call itself stays in the instrumented frame.
+            def call_part(index):
+                return ast.Subscript(
+                    value=ast.Name(id=self.FUSED_CALL_NAME, ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
+                    slice=ast.Constant(value=index, lineno=lineno, col_offset=col_offset),
+                    ctx=ast.Load(),
+                    lineno=lineno,
+                    col_offset=col_offset
+                )
+
+            before_call_node = ast.NamedExpr(
+                target=ast.Name(id=self.FUSED_CALL_NAME, ctx=ast.Store(), lineno=lineno, col_offset=col_offset),
+                value=ast.Call(
+                    func=ast.Attribute(value=pymop_instance_node, attr="before_call_fused", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
+                    args=[
+                        node.func,
+                        args_node_for_proxy,
+                        kwargs_node_for_proxy,
+                        site_key_node,
+                        self._call_site_base_node(lineno, col_offset),
+                    ],
+                    keywords=[],
+                    lineno=lineno,
+                    col_offset=col_offset
+                ),
+                lineno=lineno,
+                col_offset=col_offset
+            )
+            the_real_call = ast.Call(
+                func=call_part(0),
+                args=[ast.Starred(value=call_part(1), ctx=ast.Load(), lineno=lineno, col_offset=col_offset)] if has_args else [],
+                keywords=[ast.keyword(arg=None, value=call_part(2), lineno=lineno, col_offset=col_offset)] if has_kwargs else [],
+                lineno=lineno,
+                col_offset=col_offset
+            )
+            new_node = ast.Call(
+                func=ast.Attribute(value=pymop_instance_node, attr="after_call_fused", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
+                args=[before_call_node, the_real_call],
+                keywords=[],
+                lineno=lineno,
+                col_offset=col_offset
+            )
+
+            self._count('call')
+            return new_node
+
         before_call_proxy_node = ast.Call(
             func=ast.Attribute(value=pymop_instance_node, attr="before_call_proxy", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
             args=[
-                ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset),
+                site_key_node,
                 node.func,
                 args_node_for_proxy,
                 kwargs_node_for_proxy,
-                hints_node,
+                self._call_site_base_node(lineno, col_offset),
             ],
             keywords=[],
             lineno=lineno,
@@ -1282,7 +1910,7 @@ class LiteralTransformer(ast.NodeTransformer):
         if has_args:
             get_args_node = ast.Call(
                 func=ast.Attribute(value=pymop_instance_node, attr="get_args", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
-                args=[ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset)],
+                args=[site_key_node],
                 keywords=[],
                 lineno=lineno,
                 col_offset=col_offset
@@ -1293,7 +1921,7 @@ class LiteralTransformer(ast.NodeTransformer):
         if has_kwargs:
             get_kwargs_node = ast.Call(
                 func=ast.Attribute(value=pymop_instance_node, attr="get_kwargs", ctx=ast.Load(), lineno=lineno, col_offset=col_offset),
-                args=[ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset)],
+                args=[site_key_node],
                 keywords=[],
                 lineno=lineno,
                 col_offset=col_offset
@@ -1321,7 +1949,7 @@ class LiteralTransformer(ast.NodeTransformer):
         new_node = ast.Call(
             func=raw_after_call_func_node,
             args=[
-                ast.Constant(value=unique_key, lineno=lineno, col_offset=col_offset),
+                site_key_node,
                 the_real_call,
             ],
             keywords=[],
@@ -1329,8 +1957,168 @@ class LiteralTransformer(ast.NodeTransformer):
             col_offset=col_offset
         )
 
+        self._count('call')
         return new_node
 
+'''
+Version of the code generated by LiteralTransformer. It is part of the
+instrumentation cache key, so it must be bumped whenever the transformer
+changes the code it emits. Otherwise stale cache entries would be reused.
+'''
+_PYMOP_TRANSFORMER_VERSION = 6
+
+class InstrumentationCache:
+    '''
+    Content-addressed on-disk cache for AST-instrumented module bytecode.
+
+    It works like __pycache__ but lives in its own directory. The key of an
+    entry covers the module source, its path (which is baked into the
+    generated hints), the transformer version, the Python bytecode version
+    and the instrumentation options / active spec set of the current run.
+    Entries are marshalled (code object, rewrite report, call sites) tuples
+    written atomically, so concurrent test processes can safely share one
+    cache directory.
+    '''
+    def __init__(self, cache_dir, options):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.options_digest = hashlib.sha256(repr(options).encode('utf-8')).hexdigest()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, origin, source):
+        digest = hashlib.sha256()
+        digest.update(importlib.util.MAGIC_NUMBER)
+        digest.update(str(_PYMOP_TRANSFORMER_VERSION).encode('utf-8'))
+        digest.update(self.options_digest.encode('utf-8'))
+        digest.update(origin.encode('utf-8'))
+        digest.update(b'\0')
+        # The call-site profile only changes the modules it recorded.
+        hot_lines = _module_hot_lines(origin)
+        if hot_lines is not None:
+            digest.update(repr(sorted(hot_lines)).encode('utf-8'))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.pymopc')
+
+    def __contains__(self, key):
+        return os.path.exists(self._entry_path(key))
+
+    def load(self, key):
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                entry = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key, entry):
+        entry_path = self._entry_path(key)
+        tmp_path = f'{entry_path}.{os.getpid()}.{get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            # A read-only or full disk should never break the test run.
+            print(f"Failed to write the instrumentation cache entry for {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def _instrumentation_options():
+    '''
+    Collect everything besides the module source that changes the code
+    generated by LiteralTransformer for the current run.
+    '''
+    active_spec_folder = os.path.abspath(spec_folder) if spec_folder else None
+    active_specs = sorted(name.strip() for name in spec_names.split(',')) if spec_names != 'all' else 'all'
+    hooked_trackers = sorted((name, sorted(methods)) for name, methods in _hooked_trackers.items()) \
+        if _hooked_trackers is not None else None
+    return (
+        ('strategy', instrument_strategy),
+        ('spec_folder', active_spec_folder),
+        ('active_specs', active_specs),
+        ('hooked_trackers', hooked_trackers),
+        ('call_lowering', call_lowering),
+    )
+
+_instrumentation_cache = InstrumentationCache(instrumentation_cache_dir, _instrumentation_options()) \
+    if instrumentation_cache_dir and instrument_strategy == 'ast' else None
+
+def _instrument_source(origin, source, timings=None):
+    '''
+    Transform and compile the source of one module, the way it is imported
+    under the AST instrumentation strategy. Returns the code object, the
+    report of rewritten and skipped nodes and the call sites of the module.
+    The parse, transform and compile times are stored into timings if given.
+    '''
+    start_time = timeit.default_timer()
+    old_tree = ast.parse(source, filename=origin)
+    parse_end_time = timeit.default_timer()
+
+    # orig_code = ast.unparse(old_tree)
+    # print('original code\n', orig_code)
+
+    # Code Transformation:
+    transformer = LiteralTransformer(origin, _hooked_trackers, call_lowering, _module_hot_lines(origin))
+    tree = transformer.visit(old_tree)
+    transform_end_time = timeit.default_timer()
+
+    '''
+    We don't need to transform the entire tree as we're not adding
+    any new nodes. We only call it on transformed nodes directly.
+    Alternatively, we manually provide the lineno and col_offset for
+    new nodes, which is what we're doing right now and performs better.
+    '''
+    # ast.fix_missing_locations(tree)
+
+    # # '''
+    # # Debugging code.
+    # # '''
+    # try:
+    #     new_code = ast.unparse(tree)
+    #     diff = difflib.ndiff(orig_code.splitlines(), new_code.splitlines())
+    #     print('diff of file', origin, '\n')
+    #     print('\n'.join(diff))
+    # except Exception as e:
+    #     print('error', e)
+    #     pass
+
+    code = compile(tree, origin, 'exec')
+
+    if timings is not None:
+        timings['parse_time'] = parse_end_time - start_time
+        timings['transform_time'] = transform_end_time - parse_end_time
+        timings['compile_time'] = timeit.default_timer() - transform_end_time
+
+    return code, transformer.report, tuple(transformer.call_sites)
+
+def _profile_module(origin, source, code, timings, exec_time, self_exec_time):
+    '''
+    Record the instrumentation profile of one module execution.
+    '''
+    report = _instrumentation_report.get(origin, {})
+    # Compiling the original source again is only paid for when statistics are enabled.
+    bytecode_size = len(marshal.dumps(code))
+    original_bytecode_size = len(marshal.dumps(compile(source, origin, 'exec', dont_inherit=True)))
+    _instrumentation_profile[origin] = dict(
+        timings,
+        exec_time=exec_time,
+        self_exec_time=self_exec_time,
+        total_time=sum(timings.values()) + self_exec_time,
+        rewritten={kind: counts[0] for kind, counts in report.items() if counts[0]},
+        bytecode_size=bytecode_size,
+        original_bytecode_size=original_bytecode_size,
+        bytecode_growth=bytecode_size - original_bytecode_size,
+    )
+
 class ASTLoaderWrapper(Delegator, importlib.abc.Loader):
     def __init__(self, loader, origin):
         super().__init__(loader)
@@ -1340,6 +2128,7 @@ class ASTLoaderWrapper(Delegator, importlib.abc.Loader):
         global AST_after_instrumentation_time
         global _PYMOP_INSTRUMENTATION_COMPLETE
         global _import_stack
+        global _module_profiling_time
 
         # Add this module to the import stack
         _import_stack.append(self.origin)
@@ -1351,43 +2140,41 @@ class ASTLoaderWrapper(Delegator, importlib.abc.Loader):
         
         if should_time:
             start_time = timeit.default_timer()
+            profiling_start_time = _module_profiling_time
+
+        # Parse, transform, compile and cache load times of this module, when profiling.
+        timings = {'parse_time': 0.0, 'transform_time': 0.0, 'compile_time': 0.0, 'cache_load_time': 0.0} \
+            if statistics else None
+        module_start_time = timeit.default_timer()
 
         source = self._wrapped.get_data(self.origin)
-        old_tree = ast.parse(source, filename=self.origin)
 
-        # orig_code = ast.unparse(old_tree)
-        # print('original code\n', orig_code)
+        # Reuse the instrumented code of a previous run when the cache has it.
+        entry = None
+        if _instrumentation_cache is not None:
+            cache_key = _instrumentation_cache.key(self.origin, source)
+            entry = _instrumentation_cache.load(cache_key)
+            if timings is not None:
+                timings['cache_load_time'] = timeit.default_timer() - module_start_time
 
-        # Code Transformation:
-        tree = LiteralTransformer(self.origin).visit(old_tree)
+        if entry is None:
+            entry = _instrument_source(self.origin, source, timings)
+            if _instrumentation_cache is not None:
+                _instrumentation_cache.store(cache_key, entry)
+
+        code, _instrumentation_report[self.origin], call_sites = entry
+        if _call_site_profile_recorder is not None:
+            _call_site_profile_recorder.add_module(self.origin)
 
-        '''
-        We don't need to transform the entire tree as we're not adding
-        any new nodes. We only call it on transformed nodes directly.
-        Alternatively, we manually provide the lineno and col_offset for
-        new nodes, which is what we're doing right now and performs better.
-        '''
-        # ast.fix_missing_locations(tree)
-
-        # # '''
-        # # Debugging code.
-        # # '''
-        # try:
-        #     new_code = ast.unparse(tree)
-        #     diff = difflib.ndiff(orig_code.splitlines(), new_code.splitlines())
-        #     print('diff of file', self.origin, '\n')
-        #     print('\n'.join(diff))
-        # except Exception as e:
-        #     print('error', e)
-        #     pass
-
-        code = compile(tree, self.origin, 'exec')
-        
         # add builtins to the module's __dict__
         module.__dict__['____pymop__injected__builtins____'] = ____pymop__injected__builtins____
         module.__dict__['____original__builtins____'] = ____original__builtins____
+        module.__dict__['____pymop__call__site__base____'] = call_site_table.register_module(self.origin, call_sites)
+        module.__dict__['____pymop__operator__listeners____'] = ____pymop__operator__listeners____
         
         # Importing the instrumented module
+        _import_child_times.append(0.0)
+        exec_start_time = timeit.default_timer()
         try:
             exec(code, module.__dict__)
         except ImportError as e:
@@ -1402,10 +2189,17 @@ class ASTLoaderWrapper(Delegator, importlib.abc.Loader):
             # Raise the error again for the caller to handle
             raise e
         finally:
+            exec_time = timeit.default_timer() - exec_start_time
+            child_time = _import_child_times.pop()
+            if _import_child_times:
+                # The parent module is still executing, this whole import is part of its exec time.
+                _import_child_times[-1] += timeit.default_timer() - module_start_time
+
             # Calculate timing after exec() to include full execution time for this module
             if should_time and start_time is not None:
                 try:
-                    module_time = timeit.default_timer() - start_time
+                    # The profiles recorded for the nested imports are not part of it.
+                    module_time = timeit.default_timer() - start_time - (_module_profiling_time - profiling_start_time)
                     AST_after_instrumentation_time += module_time
                 except UnboundLocalError:
                     # This should not happen anymore since start_time is always defined when needed
@@ -1414,6 +2208,19 @@ class ASTLoaderWrapper(Delegator, importlib.abc.Loader):
             # Remove this module from the import stack
             _import_stack.pop()
 
+            # Recorded after the timed region, and without replacing the exception of the module if it fails.
+            if timings is not None:
+                profiling_time = timeit.default_timer()
+                try:
+                    _profile_module(self.origin, source, code, timings, exec_time, exec_time - child_time)
+                except Exception as e:
+                    print(f"PyMOP: Error recording the instrumentation profile of {self.origin}: {e}")
+                profiling_time = timeit.default_timer() - profiling_time
+                _module_profiling_time += profiling_time
+                if _import_child_times:
+                    # Nor is it part of the time the parent module spends executing its own code.
+                    _import_child_times[-1] += profiling_time
+
 '''
 This class is called when Python tries to import a module.
 We want to intercept the import and return our own loader,
@@ -1443,36 +2250,47 @@ def spec_from_file_location(*args, **kwargs):
 
 importlib.util.spec_from_file_location = spec_from_file_location
 
-def update_spec_loader(spec):
-    if not spec or not spec.origin or not spec.origin.endswith('.py'):
-        return spec
-
-    loader = getattr(spec, "loader", None)
-    if not loader or not hasattr(loader, "get_data"):
-        return spec
-    
+def _is_instrumentable_origin(origin):
+    '''
+    Check whether the module at origin is AST-instrumented when it is imported.
+    '''
     # This ignores python's source code. There should be a better way to do this.
-    if stdlib_path in spec.origin:
-        # print('Ignoring ast instrumenting stdlib module', spec.name, spec.origin)
-        return spec
+    if stdlib_path in origin:
+        # print('Ignoring ast instrumenting stdlib module', origin)
+        return False
     
     # 'site-packages/zmq' causes the issue with string literal
     # 'numpy/core/_ufunc_config.py' causes infinite recursion
     # 'site-packages/nltk' causes ast transformation to halt for some reason (maybe infinite recursion?)
     # 'site-packages/joblib/externals/loky/backend/resource_tracker.py' causes unexpected behavior at shutdown
     # 'site-packages/django/utils/functional.py' causes infinite recursion with LazyObject.__getattribute__
-    if 'site-packages/zmq' in spec.origin \
-        or 'numpy/core/_ufunc_config.py' in spec.origin \
-        or 'site-packages/nltk' in spec.origin \
-        or 'site-packages/joblib/externals/loky/backend/resource_tracker.py' in spec.origin \
-        or 'site-packages/django/utils/functional.py' in spec.origin:
-        return spec
+    if 'site-packages/zmq' in origin \
+        or 'numpy/core/_ufunc_config.py' in origin \
+        or 'site-packages/nltk' in origin \
+        or 'site-packages/joblib/externals/loky/backend/resource_tracker.py' in origin \
+        or 'site-packages/django/utils/functional.py' in origin:
+        return False
     
     # Skipping pythonmop and pytest to avoid infinite recursion
-    if 'site-packages/pythonmop' in spec.origin or 'site-packages/pytest' in spec.origin:
+    if 'site-packages/pythonmop' in origin or 'site-packages/pytest' in origin:
+        return False
+    if pythonmop_path is not None and origin.startswith(pythonmop_path + os.sep):
+        return False
+
+    if not instrument_site_packages and 'site-packages' in origin:
+        return False
+
+    return True
+
+def update_spec_loader(spec):
+    if not spec or not spec.origin or not spec.origin.endswith('.py'):
         return spec
 
-    if not instrument_site_packages and 'site-packages' in spec.origin:
+    loader = getattr(spec, "loader", None)
+    if not loader or not hasattr(loader, "get_data"):
+        return spec
+
+    if not _is_instrumentable_origin(spec.origin):
         return spec
 
     spec.loader = ASTLoaderWrapper(loader, spec.origin)
@@ -1496,6 +2314,70 @@ class SpecialMetaPathList(list):
         return super().insert(index, new_object)
 
 
+# Counters and timings of the reload done by perform_ast_instrumentation.
+_reload_statistics = {}
+
+def _is_relevant_module(module):
+    '''
+    Check whether reloading the module under the AST instrumentation lets the
+    active specs observe anything, i.e. whether the LiteralTransformer would
+    emit a rewrite in it that some spec hooks.
+    '''
+    spec = getattr(module, '__spec__', None)
+    origin = getattr(spec, 'origin', None)
+    loader = getattr(spec, 'loader', None)
+    if not origin or not origin.endswith('.py') or not hasattr(loader, 'get_data'):
+        return False
+    if not _is_instrumentable_origin(origin):
+        # Reloading would execute the original code again.
+        return False
+
+    try:
+        tree = ast.parse(loader.get_data(origin), filename=origin)
+    except (OSError, SyntaxError, ValueError):
+        # Let the reload report the problem.
+        return True
+
+    # Only used for its hook lookups, nothing is transformed.
+    transformer = LiteralTransformer(origin, _hooked_trackers)
+
+    def builtin_hooked(name):
+        return _hooked_builtins is None or name in _hooked_builtins
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.List, ast.ListComp)):
+            if builtin_hooked('list'):
+                return True
+        elif isinstance(node, ast.Dict):
+            if builtin_hooked('dict'):
+                return True
+        elif isinstance(node, ast.Compare):
+            if any(type(op) in LiteralTransformer.COMPARE_OP_MAP and
+                   transformer._is_hooked('PymopComparisonTracker', LiteralTransformer.COMPARE_OP_MAP[type(op)])
+                   for op in node.ops):
+                return True
+        elif isinstance(node, ast.BinOp):
+            func_name = LiteralTransformer.BINOP_MAP.get(type(node.op))
+            if func_name and transformer._is_hooked('PymopArithmeticOperatorTracker', func_name):
+                return True
+        elif isinstance(node, ast.AugAssign):
+            func_name = LiteralTransformer.AUGASSIGN_OP_MAP.get(type(node.op))
+            if func_name and transformer._is_hooked('PymopArithmeticOperatorTracker', func_name):
+                return True
+        elif isinstance(node, ast.For):
+            if transformer._is_hooked('PymopForLoopTracker'):
+                return True
+        elif isinstance(node, ast.Call):
+            if transformer._is_hooked('PymopFuncCallTracker'):
+                return True
+            func_name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, 'attr', None)
+            if func_name in ('list', 'dict', 'iter', 'sorted') and builtin_hooked(func_name):
+                return True
+            if func_name == 'strip' and transformer._is_hooked('PymopStrTracker', 'strip'):
+                return True
+
+    return False
+
 def perform_ast_instrumentation():
     '''
     This is the main entry point for the module transformer.
@@ -1510,14 +2392,20 @@ def perform_ast_instrumentation():
     sys.meta_path = new_meta_path
 
     '''
-    Force python to reload all previously imported modules
-    by going through all loaded modules and reload them
-
+    Force python to reload the previously imported modules
+    by going through all loaded modules and reload them.
+    With the 'relevant' reload strategy, only the modules
+    containing rewrites hooked by the active specs are reloaded,
+    everything else keeps its original code.
     '''
     import importlib
     importlib.invalidate_caches()
 
     loaded_modules = [*sys.modules.values()]
+    reloaded = 0
+    skipped = 0
+    analysis_time = 0.0
+    reload_time = 0.0
 
     for module in loaded_modules:
         if 'importlib' not in module.__name__ and \
@@ -1525,11 +2413,32 @@ def perform_ast_instrumentation():
             'typing.io' not in module.__name__ \
             and 'typing.re' not in module.__name__ \
             and 'sitecustomize' not in module.__name__:
+            if reload_strategy == 'relevant':
+                start_time = timeit.default_timer()
+                relevant = _is_relevant_module(module)
+                analysis_time += timeit.default_timer() - start_time
+                if not relevant:
+                    skipped += 1
+                    continue
+
+            start_time = timeit.default_timer()
             try:
                 importlib.reload(module)
             except (ModuleNotFoundError, ImportError) as e:
                 print(f"ModuleNotFoundError during reloading of {module.__name__}: {e}")
                 pass
+            reload_time += timeit.default_timer() - start_time
+            reloaded += 1
+
+    _reload_statistics.update({
+        'strategy': reload_strategy,
+        'reloaded_modules': reloaded,
+        'skipped_modules': skipped,
+        'analysis_time': analysis_time,
+        'reload_time': reload_time,
+        # Skipped modules are assumed to reload as fast as the reloaded ones on average.
+        'estimated_saved_time': skipped * reload_time / reloaded - analysis_time if reloaded else None,
+    })
 
 # def _spec_classes_import_checking(folder_path: str, spec_names: List[str]) -> Dict[str, callable]:
 #     """Import the spec classes from the spec files defined by the users to check if any spec is missing dependencies.
@@ -1573,6 +2482,15 @@ def perform_ast_instrumentation():
 #     # Return all the spec classes imported.
 #     return spec_classes
 
+if instrument_strategy == 'ast' and reload_strategy not in ['all', 'relevant']:
+    print("ERROR: INVALID reload strategy. Please choose 'all' or 'relevant'.")
+    sys.exit(1)
+
+if call_site_profile_record_path and _call_site_hot_lines is not None:
+    print("ERROR: A call-site profile can only be recorded with every site instrumented. "
+          "Please unset PYMOP_PROFILE or set PYMOP_PROFILE_INSTRUMENT_ALL.")
+    sys.exit(1)
+
 if (instrument_strategy == 'ast'):
 #     print("Testing AST instrumentation")
 #     specs_string = spec_names
@@ -1582,7 +2500,8 @@ if (instrument_strategy == 'ast'):
 #         spec_names = _spec_names_extracting(spec_folder, instrument_strategy)
 #     spec_classes = _spec_classes_import_checking(spec_folder, spec_names)
 #     print(spec_classes)
-    perform_ast_instrumentation()
+    if not warm_up_only:
+        perform_ast_instrumentation()
 
 ################################################################################
 ##                           SETUP PYMOP Monitoring                           ##
@@ -1596,6 +2515,12 @@ from pythonmop.statistics import StatisticsSingleton
 from pythonmop.spec.data import End
 import pythonmop.spec.spec as spec
 from pythonmop.builtin_instrumentation import apply_instrumentation
+from pythonmop.monitoring_instrumentation import apply_monitoring_instrumentation, remove_monitoring_instrumentation
+from pythonmop.async_monitoring import (parse_overflow_policy, start_async_monitoring, stop_async_monitoring,
+                                        flush_async_monitoring, submit_event, get_async_monitoring_statistics)
+from pythonmop.hook_profiler import HookProfiler
+from pythonmop.object_sampling import parse_sample_rates, ObjectSampler
+from pythonmop.overhead_governor import parse_overhead_budget, parse_overhead_policy, OverheadGovernor
 
 import importlib.util
 from typing import List, Dict
@@ -1652,6 +2577,10 @@ def install_pytest_plugin():
                 if algo == 'A':
                     test_name = ""
 
+                # The violations of the events sent so far belong to the previous test.
+                if async_monitoring:
+                    flush_async_monitoring()
+
                 # Set the current test name
                 StatisticsSingleton().set_current_test(test_name)
 
@@ -1694,6 +2623,15 @@ def init_pymop():
     global info
     global detailed_msg
     global pymop_start_time
+    global async_buffer_size
+    global async_overflow_policy
+    global async_sample_interval
+    global profile_hooks_sample_rate
+    global object_sample_rates
+    global overhead_budget
+    global overhead_policy
+    global overhead_check_interval
+    global _overhead_governor
     global _PYMOP_INSTRUMENTATION_COMPLETE
 
     supported_algo_names = ['A', 'B', 'C', 'C+', 'D']
@@ -1713,9 +2651,26 @@ def init_pymop():
         apply_instrumentation(False)
     elif instrument_strategy == "ast":
         print("✔ Instrumentation strategy: AST")
+        if call_lowering not in ['proxy', 'fused']:
+            print("ERROR: INVALID call lowering. Please choose 'proxy' or 'fused'.")
+            sys.exit(1)
+        print(f"✔ Call lowering: {call_lowering.upper()}")
+        print(f"✔ Reload strategy: {reload_strategy.upper()}")
+        if _call_site_hot_lines is not None:
+            print(f"✔ Call-site profile: {call_site_profile_path} "
+                  f"({sum(len(lines) for lines in _call_site_hot_lines.values())} hot lines "
+                  f"in {len(_call_site_hot_lines)} recorded modules)")
         apply_instrumentation(True)
+        # Keep the operator listener flags in sync with the hooks of the specs.
+        spec.add_event_listener_callback(____pymop__operator__listeners____.update)
+    elif instrument_strategy == "monitoring":
+        print("✔ Instrumentation strategy: MONITORING")
+        if not hasattr(sys, 'monitoring'):
+            print("ERROR: The monitoring instrumentation strategy requires Python 3.12 or newer.")
+            sys.exit(1)
+        apply_instrumentation(False)
     else:
-        print("ERROR: INVALID instrumentation strategy. Please choose 'ast' or 'builtin'.")
+        print("ERROR: INVALID instrumentation strategy. Please choose 'ast', 'builtin' or 'monitoring'.")
         sys.exit(1)
 
     # Extract the algorithm name from the pytest arguments and print it out.
@@ -1732,6 +2687,68 @@ def init_pymop():
     else:
         print("✔ Garbage collection: ENABLED")
 
+    # (Option) Handle the events of the monitors in a background thread.
+    if async_monitoring:
+        try:
+            async_buffer_size = int(async_buffer_size)
+            async_overflow_policy, async_sample_interval = parse_overflow_policy(async_overflow_policy)
+            if async_buffer_size < 1:
+                raise ValueError(f"Invalid buffer size: {async_buffer_size}")
+        except ValueError as e:
+            print(f"ERROR: INVALID asynchronous monitoring option: {e}. The buffer size must be a positive integer "
+                  f"and the overflow policy 'block', 'drop' or 'sample[:N]'.")
+            sys.exit(1)
+        print(f"✔ Asynchronous monitoring: ENABLED (buffer size {async_buffer_size}, overflow policy {async_overflow_policy.upper()})")
+    else:
+        print("✘ Asynchronous monitoring: DISABLED")
+
+    # (Option) Measure the latencies of the hooks and the monitors, reported with the full statistics.
+    # The overhead budget is checked against the same measurements.
+    if profile_hooks or overhead_budget:
+        try:
+            profile_hooks_sample_rate = float(profile_hooks_sample_rate)
+            if not 0 < profile_hooks_sample_rate <= 1:
+                raise ValueError(f"Invalid sample rate: {profile_hooks_sample_rate}")
+        except ValueError as e:
+            print(f"ERROR: INVALID hook profiling option: {e}. The sample rate must be a number in (0, 1].")
+            sys.exit(1)
+        spec.set_hook_profiler(HookProfiler(max(1, round(1 / profile_hooks_sample_rate))))
+    if profile_hooks:
+        print(f"✔ Hook profiling: ENABLED (sample rate {profile_hooks_sample_rate})")
+    else:
+        print("✘ Hook profiling: DISABLED")
+
+    # (Option) Throttle the specs whose monitoring time goes over a budget.
+    if overhead_budget:
+        overhead_option = f"{overhead_budget} per spec, policy {overhead_policy}"
+        try:
+            overhead_budget = parse_overhead_budget(overhead_budget)
+            overhead_policy = parse_overhead_policy(overhead_policy)
+            overhead_check_interval = float(overhead_check_interval)
+            if not overhead_check_interval > 0:
+                raise ValueError(f"Invalid check interval: {overhead_check_interval}")
+        except ValueError as e:
+            print(f"ERROR: INVALID overhead budget option: {e}. The budget must be a percentage ('5%') or seconds ('30s'), "
+                  f"the policy 'detach' or 'sample[:R]' and the check interval a positive number of seconds.")
+            sys.exit(1)
+        print(f"✔ Overhead budget: ENABLED ({overhead_option})")
+    else:
+        print("✘ Overhead budget: DISABLED")
+
+    # (Option) Only monitor a sample of the parameter objects of some specs.
+    if object_sample_rates:
+        try:
+            object_sample_rates = parse_sample_rates(object_sample_rates)
+        except ValueError as e:
+            print(f"ERROR: INVALID object sampling option: {e}. The option must be 'Spec:rate' pairs separated by "
+                  f"commas, or a rate for all the specs, with the rates in (0, 1].")
+            sys.exit(1)
+        sample_rates = ', '.join(f"{name or 'all'}: {rate}" for name, rate in object_sample_rates.items())
+        print(f"✔ Object sampling: ENABLED ({sample_rates})")
+    else:
+        object_sample_rates = {}
+        print("✘ Object sampling: DISABLED")
+
     # Extract the print violations to the console option from the pytest arguments and print it out.
     if print_violations_to_console:
         print("✔ Print violations to the console: ENABLED")
@@ -1854,6 +2871,7 @@ def init_pymop():
     spec_classes, spec_file_paths = _spec_classes_importing(spec_folder, spec_names, detailed_message, instrument_strategy)
 
     spec.spec_to_skip_events_from = set(filter(lambda spec_path: not any(not_skip_spec in spec_path for not_skip_spec in specs_should_not_skip), spec_file_paths))
+    spec.invalidate_skip_cache()
 
     # Record the instrumentation finish time
     instrumentation_end_time = original_time()
@@ -1883,10 +2901,18 @@ def init_pymop():
         print("============================ Instrumentation starts ============================\n")
 
     # Apply the instrumentation and create the monitor with the debug message printed out if the detailed_msg is True.
+    unsampled_spec_names = []
     for spec_name in spec_classes.keys():
         try:
             spec_instance = spec_classes[spec_name]()
             spec_instance.create_monitor(algo, detailed_message, not no_garbage_collection)
+            object_sample_rate = object_sample_rates.get(spec_name, object_sample_rates.get(None))
+            if object_sample_rate is not None and object_sample_rate < 1:
+                # Sampling only skips the monitor updates, the hooks of the specs without a monitor are their checks.
+                if spec_instance.monitor is None:
+                    unsampled_spec_names.append(spec_name)
+                else:
+                    spec_instance.object_sampler = ObjectSampler(object_sample_rate)
         except Exception as e:
             print(f'PyMOP: Error creating monitor for spec {spec_name}: {e}')
             continue
@@ -1900,6 +2926,32 @@ def init_pymop():
         # Add the spec instance into the list in config.
         spec_instances.append(spec_instance)
 
+    if unsampled_spec_names:
+        print(f"WARNING: Sample rates have no effect on the specs without a monitor, which are monitored completely: "
+              f"{', '.join(unsampled_spec_names)}.")
+
+    # The rates given for the specs that are not used have no effect.
+    for spec_name in object_sample_rates.keys() - spec_classes.keys() - {None}:
+        print(f"WARNING: Sample rate given for the spec {spec_name}, which is not used in the current test run.")
+
+    # Count the relevant events of every spec, including the ones that never fire.
+    if _call_site_profile_recorder is not None:
+        print(f"✔ Recording the call-site profile into {call_site_profile_record_path}")
+        for spec_instance in spec_instances:
+            _call_site_profile_recorder.add_spec(spec_instance.__class__.__name__)
+        spec.set_relevant_event_recorder(_call_site_profile_recorder.record)
+
+    # Start checking the overhead budget once the monitors are created.
+    if overhead_budget:
+        _overhead_governor = OverheadGovernor(spec._hook_profiler, spec_instances, *overhead_budget, *overhead_policy,
+                                              overhead_check_interval)
+        _overhead_governor.start()
+
+    # Start the background monitor thread once the monitors are created.
+    if async_monitoring:
+        start_async_monitoring(async_buffer_size, async_overflow_policy, async_sample_interval)
+        spec.set_monitor_event_dispatcher(submit_event)
+
     # Terminate JVM used for formula parsing (do not terminate as the program may need to use the JVM for other purposes)
     # shutdownJVM()
 
@@ -1908,6 +2960,10 @@ def init_pymop():
     create_monitor_duration = create_monitor_end_time - instrumentation_end_time
     StatisticsSingleton().add_create_monitor_duration(create_monitor_end_time, create_monitor_duration)
 
+    # Start delivering the function calls once the specs have hooked the trackers.
+    if instrument_strategy == 'monitoring':
+        _start_monitoring_instrumentation()
+
     # Set the _PYMOP_INSTRUMENTATION_COMPLETE flag to True
     _PYMOP_INSTRUMENTATION_COMPLETE = True
 
@@ -1917,6 +2973,49 @@ def init_pymop():
         print("PyMOP create monitor finish time: ", create_monitor_end_time)
         print("PyMOP create monitor duration: ", create_monitor_duration)
 
+def _should_monitor_file(filename):
+    '''
+    Check whether the calls made in a file are delivered to the specs under the
+    monitoring strategy. It follows the files instrumented by the AST strategy.
+    '''
+    if filename.startswith('<') or not _is_instrumentable_origin(filename):
+        return False
+    # The specs and PyMOP itself (including this helper folder) are never monitored.
+    excluded_folders = [os.path.dirname(os.path.dirname(os.path.abspath(spec.__file__)))]
+    if spec_folder:
+        excluded_folders.append(os.path.abspath(spec_folder))
+    return not any(filename.startswith(folder + os.sep) for folder in excluded_folders)
+
+def _start_monitoring_instrumentation():
+    '''
+    Feed the function call tracker hooks from sys.monitoring. The other
+    trackers need the operands of each operation, which sys.monitoring does
+    not report, so they are not supported by this strategy. Neither are the
+    specs hooking the function call tracker itself, which is refused.
+    '''
+    for tracker_name in ['PymopComparisonTracker', 'PymopArithmeticOperatorTracker', 'PymopForLoopTracker', 'PymopStrTracker']:
+        tracker = _PYMOP_TRACKERS[tracker_name]
+        if any(getattr(getattr(tracker, method), 'is_instrumented', False) for method in _tracker_methods(tracker)):
+            print(f"✘ {tracker_name} events are not supported by the monitoring instrumentation strategy and are ignored.")
+
+    # sys.monitoring reports neither the arguments of a call nor the result of a C function, which the hooks
+    # of the function call tracker receive, so the specs would miss or misread their events.
+    call_tracker = ____pymop__injected__builtins____.pymopFuncCallTrackerInstance
+    hooking_specs = set()
+    for method in ['before_call', 'after_call']:
+        func = getattr(call_tracker, method)
+        for event_type in (getattr(func, 'pythonmop_before_event_types', None) or []) + \
+                          (getattr(func, 'pythonmop_after_event_types', None) or []):
+            hooking_specs.add(event_type.spec.__class__.__name__)
+    if hooking_specs:
+        print(f"ERROR: The monitoring instrumentation strategy does not support the specs hooking "
+              f"PymopFuncCallTracker.before_call or after_call: {', '.join(sorted(hooking_specs))}. "
+              f"Please use the 'ast' instrumentation strategy.")
+        sys.exit(1)
+
+    if not apply_monitoring_instrumentation(call_tracker, _should_monitor_file):
+        print("✘ No free sys.monitoring tool id. Function call events are disabled.")
+
 def pymop_teardown():
     """Print out the statistics of the monitor after running the tests.
         Args:
@@ -1927,9 +3026,45 @@ def pymop_teardown():
     global instrument_strategy
     global algo
 
+    # Stop delivering events while the statistics are collected.
+    if instrument_strategy == 'monitoring':
+        remove_monitoring_instrumentation()
+
     # If the instrument_strategy is AST, print out the AST time and AST after instrumentation time
     if instrument_strategy == 'ast':
         print(f'Pythonmop AST after instrumentation time: {AST_after_instrumentation_time:.6f} seconds')
+        if _reload_statistics:
+            print(f"Pythonmop module reload ({_reload_statistics['strategy']}): "
+                  f"{_reload_statistics['reloaded_modules']} reloaded, {_reload_statistics['skipped_modules']} skipped, "
+                  f"{_reload_statistics['analysis_time'] + _reload_statistics['reload_time']:.6f} seconds")
+        if _instrumentation_cache is not None:
+            print(f'Pythonmop instrumentation cache: {_instrumentation_cache.hits} hits, {_instrumentation_cache.misses} misses')
+            StatisticsSingleton().add_instrumentation_cache_statistics(_instrumentation_cache.hits,
+                                                                       _instrumentation_cache.misses)
+        StatisticsSingleton().add_instrumentation_report(_instrumentation_report)
+        StatisticsSingleton().add_reload_statistics(_reload_statistics)
+        StatisticsSingleton().add_instrumentation_profile(_instrumentation_profile)
+
+    # Handle the events still waiting for the background monitor thread, the end event is handled inline.
+    if async_monitoring:
+        spec.set_monitor_event_dispatcher(None)
+        stop_async_monitoring()
+        StatisticsSingleton().add_async_monitoring_statistics(get_async_monitoring_statistics())
+
+    # Stop throttling the specs, the statistics report the ones throttled so far.
+    if _overhead_governor is not None:
+        _overhead_governor.stop()
+        StatisticsSingleton().add_overhead_governor_statistics(_overhead_governor.get_statistics())
+
+    # Stop profiling before the end events, which are not part of the tests.
+    if spec._hook_profiler is not None:
+        StatisticsSingleton().add_hook_profile(spec._hook_profiler.get_profile())
+        spec.set_hook_profiler(None)
+
+    for spec_instance in spec_instances:
+        if spec_instance.object_sampler is not None:
+            StatisticsSingleton().add_object_sampling_statistics(spec_instance.__class__.__name__,
+                                                                 spec_instance.object_sampler.get_statistics())
 
     # Summary the statistics for each spec monitor.
     # TODO!: NOT SURE IF THIS IS NEEDED!!
@@ -1939,6 +3074,15 @@ def pymop_teardown():
     # call the end_execution help function to end the execution of the program.
     End().end_execution()
 
+    if _call_site_profile_recorder is not None:
+        spec.set_relevant_event_recorder(None)
+        try:
+            _call_site_profile_recorder.save(call_site_profile_record_path)
+            print(f"Pythonmop call-site profile: {_call_site_profile_recorder.relevant_events()} relevant events "
+                  f"in {len(_call_site_profile_recorder.modules)} modules saved to {call_site_profile_record_path}")
+        except OSError as e:
+            print(f"Failed to save the call-site profile to {call_site_profile_record_path}: {e}")
+
     # Refresh the monitor states for the last time.
     if algo == 'A':
         _refresh_monitor_states(spec_instances)
@@ -2025,7 +3169,7 @@ def _spec_classes_importing(folder_path: str, spec_names: List[str], detailed_me
         try:
             spec = importlib.util.spec_from_file_location(spec_name, spec_path)
             spec_module = importlib.util.module_from_spec(spec)
-            if strategy == 'ast':
+            if strategy in ['ast', 'monitoring']:
                 try:
                     inject_instrumentable_builtins(spec_module)
                 except Exception as e:
@@ -2071,5 +3215,6 @@ def _refresh_monitor_states(spec_instances):
         if monitor is not None:
             monitor.refresh_monitor()
 
-atexit.register(pymop_teardown)
-init_pymop()
+if not warm_up_only:
+    atexit.register(pymop_teardown)
+    init_pymop()
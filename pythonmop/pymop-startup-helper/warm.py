@@ -0,0 +1,121 @@
+'''
+Pre-build the instrumentation cache before a test run.
+
+This script transforms and compiles every module of a project tree (and,
+optionally, of selected site-packages) the way ASTLoaderWrapper does, using
+a process pool, and stores the results in PYMOP_INSTRUMENTATION_CACHE_DIR.
+The test run then loads the instrumented bytecode instead of transforming
+each module on import.
+
+It is started by `pymop warm`, which runs it with the pymop-startup-helper
+folder on the PYTHONPATH and PYMOP_WARM_UP_ONLY=1, so that sitecustomize
+reads the configuration without starting the monitoring.
+'''
+import argparse
+import importlib.util
+import os
+import sys
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+
+import sitecustomize
+
+# Folders that never contain modules imported by the test run.
+SKIPPED_DIRS = {'__pycache__', '.git', '.hg', '.svn', '.tox', '.nox', 'node_modules'}
+
+def _find_modules(root):
+    '''
+    Yield the absolute paths of the instrumentable .py files under root.
+    '''
+    spec_folder = os.path.abspath(sitecustomize.spec_folder) if sitecustomize.spec_folder else None
+
+    for dir_path, dir_names, file_names in os.walk(os.path.abspath(root)):
+        # Specs are never instrumented, see spec_from_file_location in sitecustomize.
+        dir_names[:] = sorted(name for name in dir_names
+                              if name not in SKIPPED_DIRS and not name.startswith('.')
+                              and os.path.join(dir_path, name) != spec_folder)
+        for file_name in sorted(file_names):
+            if not file_name.endswith('.py'):
+                continue
+            origin = os.path.join(dir_path, file_name)
+            if sitecustomize._is_instrumentable_origin(origin):
+                yield origin
+
+def _package_roots(package_names):
+    '''
+    Return the folders (or single files) of the given installed packages.
+    '''
+    roots = []
+    for package_name in package_names:
+        spec = importlib.util.find_spec(package_name)
+        if spec is None:
+            print(f"✘ Cannot find the package '{package_name}'.")
+        elif spec.submodule_search_locations:
+            roots.extend(spec.submodule_search_locations)
+        elif spec.origin:
+            roots.append(spec.origin)
+    return roots
+
+def _warm_module(cache_dir, origin):
+    '''
+    Transform, compile and cache one module. Runs in the worker processes.
+    Returns 'cached', 'stored' or the error message.
+    '''
+    cache = sitecustomize.InstrumentationCache(cache_dir, sitecustomize._instrumentation_options())
+    try:
+        with open(origin, 'rb') as f:
+            source = f.read()
+        key = cache.key(origin, source)
+        if key in cache:
+            return 'cached'
+        cache.store(key, sitecustomize._instrument_source(origin, source))
+    except Exception as e:
+        # Modules that fail here fail the same way on import, nothing to cache.
+        return f'{type(e).__name__}: {e}'
+    return 'stored'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pymop warm', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('project', nargs='?', default='.', help='Root of the project tree (default: the current folder).')
+    parser.add_argument('--site-packages', nargs='*', default=[], metavar='PACKAGE',
+                        help='Installed packages to pre-instrument as well. Requires PYMOP_INSTRUMENT_SITE_PACKAGES.')
+    parser.add_argument('--cache-dir', default=sitecustomize.instrumentation_cache_dir,
+                        help='Cache folder (default: PYMOP_INSTRUMENTATION_CACHE_DIR).')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Number of worker processes (default: the number of CPUs).')
+    args = parser.parse_args(argv)
+
+    if sitecustomize.instrument_strategy != 'ast':
+        print("ERROR: The instrumentation cache is only used by the 'ast' instrumentation strategy.")
+        return 1
+    if not args.cache_dir:
+        print("ERROR: No cache folder. Please set PYMOP_INSTRUMENTATION_CACHE_DIR or pass --cache-dir.")
+        return 1
+    if args.site_packages and not sitecustomize.instrument_site_packages:
+        print("✘ PYMOP_INSTRUMENT_SITE_PACKAGES is not enabled, the site-packages are not instrumented and are skipped.")
+
+    origins = list(_find_modules(args.project))
+    for root in _package_roots(args.site_packages):
+        origins.extend(_find_modules(root) if os.path.isdir(root) else
+                       [root] if sitecustomize._is_instrumentable_origin(root) else [])
+
+    print(f"Warming up the instrumentation cache in {os.path.abspath(args.cache_dir)} with {len(origins)} modules...")
+    start_time = timeit.default_timer()
+    counts = {'cached': 0, 'stored': 0, 'failed': 0}
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        # Larger chunks keep the per-task overhead low on big trees.
+        chunk_size = max(1, len(origins) // (max(1, args.jobs) * 8))
+        for origin, result in zip(origins, executor.map(_warm_module, [args.cache_dir] * len(origins), origins,
+                                                        chunksize=chunk_size)):
+            if result in counts:
+                counts[result] += 1
+            else:
+                counts['failed'] += 1
+                print(f"✘ {origin}: {result}")
+
+    print(f"✔ {counts['stored']} modules instrumented, {counts['cached']} already cached, "
+          f"{counts['failed']} failed in {timeit.default_timer() - start_time:.2f} seconds.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
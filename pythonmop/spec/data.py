@@ -2,7 +2,7 @@
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Tuple, Iterator
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
 import weakref
 import itertools
 
@@ -37,6 +37,82 @@ class End:
         pass
 
 
+# ============================
+# EVENT HOOK CALLING CONVENTION
+# ============================
+class EventContext:
+    """The event passed to the event hooks declared with a single positional parameter.
+
+    Hooks declared with ``**kw`` receive the same information as keyword arguments. The
+    context is reused for the next events once the hook returns, so a hook must copy the
+    fields it wants to keep rather than the context itself.
+
+    Example::
+
+        @self.event_before(call(list, 'append'))
+        def append(ctx):
+            if len(ctx.obj) > 10:
+                return HookResult(VIOLATION, custom_message='The list is too long.')
+            return FALSE_EVENT
+    """
+    __slots__ = ('func_name', 'obj', 'args', 'kwargs', 'return_val', 'exception', 'call_file_name',
+                 'call_line_num', 'is_before')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Drop the references to the values of the last event."""
+        self.func_name = None
+        self.obj = None
+        self.args = None
+        self.kwargs = None
+        self.return_val = None
+        self.exception = None
+        self.call_file_name = None
+        self.call_line_num = None
+        self.is_before = True
+
+    def __getitem__(self, key):
+        # Lets the helpers written for the ``**kw`` hooks, e.g. getKwOrPosArg(), take a context too.
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return (f'EventContext(func_name={self.func_name!r}, call_file_name={self.call_file_name!r}, '
+                f'call_line_num={self.call_line_num!r}, is_before={self.is_before!r})')
+
+
+class HookResult:
+    """The typed result of an event hook, instead of a dict with the 'verdict', 'custom_message', ... keys.
+
+    Attributes:
+        verdict: TRUE_EVENT, FALSE_EVENT or VIOLATION.
+        custom_message: The message reported with a violation.
+        filename: The file name reported instead of the one of the call, together with lineno.
+        lineno: The line number reported instead of the one of the call, together with filename.
+        param_instance: The parameter instance of the event instead of the instance of the call.
+        last_event: The last event reported with a violation of a spec without formal expression.
+        param: The parameters reported with a violation of a spec without formal expression.
+    """
+    __slots__ = ('verdict', 'custom_message', 'filename', 'lineno', 'param_instance', 'last_event', 'param')
+
+    def __init__(self, verdict=TRUE_EVENT, custom_message=None, filename=None, lineno=None, param_instance=None,
+                 last_event=None, param=None):
+        self.verdict = verdict
+        self.custom_message = custom_message
+        self.filename = filename
+        self.lineno = lineno
+        self.param_instance = param_instance
+        self.last_event = last_event
+        self.param = param
+
+    def __repr__(self):
+        return f'HookResult(verdict={self.verdict!r}, custom_message={self.custom_message!r})'
+
+
 # ============================
 # PARAMETER INSTANCE DECLARERS
 # ============================
@@ -84,34 +160,61 @@ class SpecParameter:
 # PARAMETER COMBINATION DECLARERS
 # ===============================
 
+# The canonical combination of each parameter tuple, alive while some index tree or algorithm holds it.
+_interned_spec_combinations = weakref.WeakValueDictionary()
+
+
 @dataclass(frozen=True)  # hashable dataclass
 class SpecCombination:
     """Represents a unique spec parameter combination.
 
     This spec parameter combination is used to represent the parameter combination of the specification in addition to the tuple commonly used in the implementation.
     It would contains extra information such as the spec parameter type, less informative parameter combination to avoid redundant calculation.
+
+    The combinations should be created with ``SpecCombination.of()``, which returns the same object for equal
+    parameter tuples, so that their less informative combinations are only computed once, when first asked for.
     """
     spec_params: Tuple[SpecParameter, ...]
     spec_params_type: frozenset[type] = field(init=False)
     spec_params_type_set: set[type] = field(init=False)
-    possible_sub_params: Tuple[Tuple[SpecParameter, ...]] = field(init=False)
+    # Computed by get_possible_sub_params and get_possible_sub_combs when first called.
+    _possible_sub_params: Optional[Tuple[Tuple[SpecParameter, ...], ...]] = field(init=False, repr=False)
+    _possible_sub_combs: Optional[Tuple['SpecCombination', ...]] = field(init=False, repr=False)
+    _hash: int = field(init=False, repr=False)
 
     def __post_init__(self):
         # Convert set to frozenset to make it hashable
         object.__setattr__(self, 'spec_params_type', frozenset(param.param_type for param in self.spec_params))
         object.__setattr__(self, 'spec_params_type_set', set(self.spec_params_type))
+        object.__setattr__(self, '_possible_sub_params', None)
+        object.__setattr__(self, '_possible_sub_combs', None)
+
+        # The other fields are derived from the parameters, which are enough to hash and compare the combinations.
+        object.__setattr__(self, '_hash', hash(self.spec_params))
 
-        # Calculate possible sub params once at initialization
-        sub_params = tuple(self.find_possible_sub_params(self.spec_params))
-        object.__setattr__(self, 'possible_sub_params', sub_params)
+    @classmethod
+    def of(cls, spec_params: Tuple[SpecParameter, ...]) -> 'SpecCombination':
+        """Get the canonical spec parameter combination of a parameter tuple.
+
+        Args:
+            spec_params: The parameter combination.
+        Returns:
+            The spec combination, the same object for all the equal parameter tuples.
+        """
+        spec_comb = _interned_spec_combinations.get(spec_params)
+        if spec_comb is None:
+            spec_comb = _interned_spec_combinations.setdefault(spec_params, cls(spec_params=spec_params))
+        return spec_comb
 
     def __hash__(self):
-        return hash((self.spec_params, self.spec_params_type, self.possible_sub_params))
-    
+        return self._hash
+
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, SpecCombination):
             return NotImplemented
-        return self.spec_params == other.spec_params and self.spec_params_type == other.spec_params_type and self.possible_sub_params == other.possible_sub_params
+        return self._hash == other._hash and self.spec_params == other.spec_params
 
     def get_spec_param_type(self):
         """Get the types of the spec parameters.
@@ -139,13 +242,33 @@ class SpecCombination:
             # Generate the null combination in the end if not.
             yield ()
 
+    @property
+    def possible_sub_params(self) -> Tuple[Tuple[SpecParameter, ...], ...]:
+        return self.get_possible_sub_params()
+
     def get_possible_sub_params(self) -> Tuple[Tuple[SpecParameter, ...]]:
         """Get all possible parameter combinations that are less informative than this one.
         
         Returns:
             A frozenset of parameter combinations that are less informative.
         """
-        return self.possible_sub_params
+        possible_sub_params = self._possible_sub_params
+        if possible_sub_params is None:
+            possible_sub_params = tuple(self.find_possible_sub_params(self.spec_params))
+            object.__setattr__(self, '_possible_sub_params', possible_sub_params)
+        return possible_sub_params
+
+    def get_possible_sub_combs(self) -> Tuple['SpecCombination', ...]:
+        """Get the spec combinations of all the parameter combinations that are less informative than this one.
+
+        Returns:
+            The canonical spec combinations, in the order of get_possible_sub_params.
+        """
+        possible_sub_combs = self._possible_sub_combs
+        if possible_sub_combs is None:
+            possible_sub_combs = tuple(SpecCombination.of(sub_params) for sub_params in self.get_possible_sub_params())
+            object.__setattr__(self, '_possible_sub_combs', possible_sub_combs)
+        return possible_sub_combs
 
 
 # =============================
@@ -275,3 +398,148 @@ class ret_param(BaseParameterDeclaration):
     pass
 
 # TODO: Add an arg_param() dataclass for setting a spec parameter to an argument
+
+
+# =========================
+# EVENT PREDICATE DECLARERS
+# =========================
+
+def _arg_expression(position: int, name: Optional[str], attr: Optional[str], bind: Callable[[Any], str]) -> str:
+    # The argument is looked up like getKwOrPosArg does, None when it is not passed.
+    expression = f'(args[{position}] if len(args) > {position} else None)'
+    if name is not None:
+        bound_name = bind(name)
+        expression = f'(kwargs[{bound_name}] if {bound_name} in kwargs else {expression})'
+    if attr is not None:
+        expression = f'getattr({expression}, {bind(attr)}, None)'
+    return expression
+
+
+class BaseEventPredicate:
+    """Declares a condition an event must meet for its hook to be called.
+
+    The predicates of an event are compiled into one expression, which the
+    instrumented function evaluates before calling the hook, so the calls
+    filtered out do not pay for the hook call. A condition that raises, e.g.
+    on a missing argument, is not met.
+    """
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        """Returns the Python expression of the condition.
+
+        Args:
+            bind: Called with a value used by the expression, returns the name to refer to it.
+
+        Returns:
+            The expression, using the names ``args``, ``kwargs`` and ``return_val``.
+        """
+        raise NotImplementedError
+
+
+@dataclass
+class arg_type(BaseEventPredicate):
+    """Requires an argument of the call to be an instance of the given type(s).
+
+    Example:
+        Only fire the event when the iterable passed to ``InstrumentedIterator.__init__`` is a list::
+
+            @self.event_before(call(InstrumentedIterator, '__init__'), arg_type(1, list, name='iterable'))
+    """
+
+    #: Position of the argument in ``args``, the instance being at position 0 for methods.
+    position: int
+
+    #: The type or tuple of types, as passed to ``isinstance``.
+    types: Any
+
+    #: Name of the argument, checked in ``kwargs`` first if given.
+    name: Optional[str] = None
+
+    #: Attribute of the argument to check instead of the argument itself.
+    attr: Optional[str] = None
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        return f'isinstance({_arg_expression(self.position, self.name, self.attr, bind)}, {bind(self.types)})'
+
+
+@dataclass
+class arg_value(BaseEventPredicate):
+    """Requires an argument of the call to be equal to one of the given values.
+
+    Example:
+        Only fire the event for the blocking calls to ``acquire``, the default being blocking::
+
+            @self.event_before(call(CustomLockType, 'acquire'), arg_value(1, (None, True), name='blocking'))
+    """
+
+    #: Position of the argument in ``args``, the instance being at position 0 for methods.
+    position: int
+
+    #: The accepted values. A missing argument is None.
+    values: Sequence[Any]
+
+    #: Name of the argument, checked in ``kwargs`` first if given.
+    name: Optional[str] = None
+
+    #: Attribute of the argument to check instead of the argument itself.
+    attr: Optional[str] = None
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        return f'{_arg_expression(self.position, self.name, self.attr, bind)} in {bind(tuple(self.values))}'
+
+
+@dataclass
+class has_kwarg(BaseEventPredicate):
+    """Requires a keyword argument to be passed to the call.
+    """
+
+    #: Name of the keyword argument.
+    name: str
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        return f'{bind(self.name)} in kwargs'
+
+
+@dataclass
+class return_type(BaseEventPredicate):
+    """Requires the return value of the call to be an instance of the given type(s). For after events only.
+    """
+
+    #: The type or tuple of types, as passed to ``isinstance``.
+    types: Any
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        return f'isinstance(return_val, {bind(self.types)})'
+
+
+@dataclass
+class return_value(BaseEventPredicate):
+    """Requires the return value of the call to be equal to one of the given values. For after events only.
+    """
+
+    #: The accepted values.
+    values: Sequence[Any]
+
+    def expression(self, bind: Callable[[Any], str]) -> str:
+        return f'return_val in {bind(tuple(self.values))}'
+
+
+def _compile_event_predicates(predicates: Sequence[BaseEventPredicate]) -> Callable[[Any, Any, Any], bool]:
+    """Compiles the predicates of an event into one function.
+
+    Args:
+        predicates: The predicates, all of them must hold.
+
+    Returns:
+        A function of the arguments, the keyword arguments and the return value of the call.
+    """
+    namespace = {}
+
+    def bind(value):
+        name = f'_value{len(namespace)}'
+        namespace[name] = value
+        return name
+
+    conditions = ' and '.join(f'({predicate.expression(bind)})' for predicate in predicates)
+    source = f'lambda args, kwargs, return_val: {conditions}'
+    return eval(compile(source, '<pythonmop event predicates>', 'eval'), namespace)
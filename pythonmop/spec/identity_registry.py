@@ -0,0 +1,145 @@
+"""Process-wide registry of the identities of the parameter instances.
+
+Each parameter instance gets a small integer id, handed out in increasing
+order, without touching the object itself (the previous approach set a
+``mop_uuid`` attribute, which failed for ``__slots__`` classes and many C
+types and polluted ``__dict__``). The registry never references the
+objects strongly, so it does not extend their lifetime.
+
+The ids are looked up by ``id()``. For the objects that support weak
+references, the entry is a weak reference holding the id, whose callback
+removes the entry once the object is collected, so that a new object
+allocated at the same address gets a new id. This includes the builtin
+subclasses of the builtin instrumentation (InstrumentableList,
+InstrumentedDict, ...).
+
+The objects that do not support weak references (plain list, dict, set,
+str, int, ...) get an address entry instead, holding their id and their
+type but not the object. The registry is not told when such an object is
+collected: its entry stays until another object is registered at the same
+address. An object of another type there gets a new id, but an object of
+the same type takes over the id of the collected one, and the monitors see
+both as the same parameter. Neither kind of entry hashes or compares the
+contents of the objects, so an id costs O(1) whatever their size.
+"""
+import itertools
+import threading
+import weakref
+
+
+class _IdentityRef(weakref.ref):
+    """The weak reference to a registered object, holding its id and its key in the registry."""
+    __slots__ = ('key', 'param_id')
+
+    def __new__(cls, obj, callback, key, param_id):
+        self = super().__new__(cls, obj, callback)
+        self.key = key
+        self.param_id = param_id
+        return self
+
+    def __init__(self, obj, callback, key, param_id):
+        super().__init__(obj, callback)
+
+
+class _AddressRef:
+    """The entry of a registered object without weak references, keyed by its address.
+
+    It holds the type of the object rather than the object, which is enough to tell it apart
+    from most of the objects later allocated at the same address.
+    """
+    __slots__ = ('obj_type', 'key', 'param_id')
+
+    def __init__(self, obj_type, key, param_id):
+        self.obj_type = obj_type
+        self.key = key
+        self.param_id = param_id
+
+
+# Returned for the objects whose id changed since their event.
+_DEAD_REF = _AddressRef(None, None, None)
+
+
+class IdentityRegistry:
+    """Hands out the integer ids of the parameter instances.
+    """
+
+    def __init__(self):
+        # id() of the object -> its _IdentityRef, or its _AddressRef if the object has no weak references.
+        self._entries = {}
+        self._next_id = itertools.count(1)
+        # The id handed out last, the objects registered afterwards get greater ids.
+        self.last_id = 0
+        # Reentrant, a collection triggered while an id is assigned calls _forget in the same thread.
+        self._lock = threading.RLock()
+        # Created once, a bound method is otherwise allocated each time it is accessed.
+        self._forget_callback = self._forget
+
+    def get_id(self, obj) -> int:
+        """Return the id of an object, assigning a new one on its first use.
+
+        Args:
+            obj: The parameter instance.
+        Returns:
+            The integer id of the object.
+        """
+        key = id(obj)
+        entry = self._entries.get(key)
+        # Inlined _is_entry_of, this is the path of every event.
+        if entry is not None:
+            if entry.__class__ is _IdentityRef:
+                if entry() is obj:
+                    return entry.param_id
+            elif entry.obj_type is type(obj):
+                return entry.param_id
+
+        with self._lock:
+            # Another thread may have registered the object since the lookup above.
+            entry = self._entries.get(key)
+            if entry is not None and self._is_entry_of(entry, obj):
+                return entry.param_id
+            # The entry of the object registered at this address before, if any, is replaced.
+            param_id = self.last_id = next(self._next_id)
+            try:
+                self._entries[key] = _IdentityRef(obj, self._forget_callback, key, param_id)
+            except TypeError:
+                self._entries[key] = _AddressRef(type(obj), key, param_id)
+            return param_id
+
+    @staticmethod
+    def _is_entry_of(entry, obj) -> bool:
+        # The weak reference tells apart a live object from a collected one at the same address, the address
+        # entry only the objects of another type.
+        if entry.__class__ is _IdentityRef:
+            return entry() is obj
+        return entry.obj_type is type(obj)
+
+    def get_ref(self, obj, param_id: int):
+        """Return the reference to an object the monitors keep for its parameter.
+
+        The weak references return the object while it is alive and None afterwards. The address
+        entries of the objects without weak references do not reference the object.
+
+        Args:
+            obj: The parameter instance.
+            param_id: The id of the object given by get_id.
+        Returns:
+            The weak reference to the object, or its address entry if it has no weak references.
+        """
+        entry = self._entries.get(id(obj))
+        if entry is not None and entry.param_id == param_id:
+            return entry
+        # The object was collected and its address reused, the monitors will not see param_id again.
+        return _DEAD_REF
+
+    def _forget(self, ref):
+        # Called when a registered object is collected. Its address may already belong to a new object.
+        with self._lock:
+            if self._entries.get(ref.key) is ref:
+                del self._entries[ref.key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+#: The registry used by all the specs.
+identity_registry = IdentityRegistry()
@@ -39,6 +39,8 @@ Example:
 """
 
 from pythonmop.spec.data import *
+from pythonmop.spec.data import _compile_event_predicates
+from pythonmop.spec.identity_registry import identity_registry
 from pythonmop.monitor.monitor_base import Monitor
 from pythonmop.monitor.monitor_a import MonitorA
 from pythonmop.monitor.monitor_b import MonitorB
@@ -51,13 +53,18 @@ from pythonmop.statistics import StatisticsSingleton
 from pythonmop.spec.fake_instance_manager import create_fake_class, get_fake_class_instance
 from pythonmop.spec_utils import has_self_in_args, parseStackTrace, getStackTrace
 from pythonmop.spec.original_builtin_method import get_original_method
+from pythonmop.hook_profiler import HookProfiler, HOOK, MONITOR
 
-from typing import Any,Optional, Sequence, Callable, Union, TypeVar, Type, List
+from typing import Any,Optional, Sequence, Callable, Union, TypeVar, Type, List, FrozenSet, Tuple
 import inspect
-import uuid
 import functools
 import re
 import os
+import sys
+import threading
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter_ns
 
 # Define constants of PyMOP for the scope of the instrumentation
 SpecType = TypeVar('SpecType', bound='Spec')
@@ -72,6 +79,73 @@ PRINT_VIOLATIONS_TO_CONSOLE = False
 instrumentation_detailed_message = False
 stdlib_path = os.path.dirname(os.__file__)
 
+# Callbacks called with (namespace, function name) whenever event hooks are attached to or detached from a function.
+_event_listener_callbacks = []
+
+
+def add_event_listener_callback(callback: Callable[[Any, str], None]) -> None:
+    """Registers a callback notified whenever the event hooks of a function change.
+
+        Args:
+            callback: Called with the namespace and the name of the function.
+    """
+    _event_listener_callbacks.append(callback)
+
+
+def _notify_event_listener_callbacks(namespace: Any, func_name: str) -> None:
+    for callback in _event_listener_callbacks:
+        callback(namespace, func_name)
+
+# Called with (spec name, file name, line number) for each event whose hook did not return FALSE_EVENT.
+_relevant_event_recorder = None
+
+
+def set_relevant_event_recorder(recorder: Optional[Callable[[str, str, int], None]]) -> None:
+    """Sets the recorder of the relevant events, used to build the call-site profile.
+
+        Args:
+            recorder: Called with the spec name, the file name and the line number of each
+                relevant event, or None to stop recording.
+    """
+    global _relevant_event_recorder
+    _relevant_event_recorder = recorder
+
+# Called with (spec, event name, spec params, param instances, file name, line number, custom message, args, kwargs)
+# instead of the update_params_handler of the monitor, to handle the event in the background.
+_monitor_event_dispatcher = None
+
+
+def set_monitor_event_dispatcher(dispatcher: Optional[Callable[..., None]]) -> None:
+    """Sets the dispatcher that sends the events to the monitors, used by the asynchronous monitoring.
+
+        Args:
+            dispatcher: Called with the spec and the arguments of update_params_handler of each
+                event, or None to update the monitors inline again.
+    """
+    global _monitor_event_dispatcher
+    _monitor_event_dispatcher = dispatcher
+
+
+# The monitor updates waiting for the one the thread is making, None when it is not updating a monitor.
+# See Spec.update_monitor.
+_monitor_updates = threading.local()
+
+
+# Records the durations of the hooks and the monitors, None unless the hooks are profiled.
+_hook_profiler = None
+
+
+def set_hook_profiler(profiler: Optional[HookProfiler]) -> None:
+    """Sets the profiler recording the durations of the hooks and the monitors.
+
+    The state transitions are only timed for the monitors created afterwards.
+
+        Args:
+            profiler: The profiler, or None to stop profiling.
+    """
+    global _hook_profiler
+    _hook_profiler = profiler
+
 @dataclass
 class _EventType:
     """Stores information about a type of event which can be fired.
@@ -86,16 +160,218 @@ class _EventType:
     #: Event hook function, called when the event is triggered.
     hook: Callable
 
+    #: Names of the callees of a call tracker method the hook is declared for, or None for all of them.
+    callee_names: Optional[FrozenSet[str]] = None
+
+    #: Types of the objects the callees are bound to, or None for all of them.
+    callee_types: Optional[Tuple[type, ...]] = None
+
+    #: Conditions the call must meet for the hook to be called, see BaseEventPredicate.
+    predicates: Optional[Tuple[BaseEventPredicate, ...]] = None
+
+    def __post_init__(self):
+        # Whether the hook takes an EventContext instead of keyword arguments.
+        self.takes_context = _is_context_hook(self.hook)
+        # Called with the arguments, the keyword arguments and the return value of the call.
+        self.predicate = _compile_event_predicates(self.predicates) if self.predicates else None
+
+
+def _is_context_hook(hook: Callable) -> bool:
+    """Checks whether an event hook is declared with a single positional parameter, which gets an EventContext.
+
+        Args:
+            hook: The event hook function.
+        Returns:
+            True if the hook takes an EventContext, False if it takes the event as keyword arguments.
+    """
+    try:
+        parameters = list(inspect.signature(hook).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return len(parameters) == 1 and parameters[0].kind in (inspect.Parameter.POSITIONAL_ONLY,
+                                                           inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+class _CalleeIndex:
+    """Stores the event types of a call tracker method declared for some callees only.
+
+    The method of the tracker gets the callee of the tracked call as the argument at position
+    ``__pymop_callee_arg__``. The event types are looked up by the name of the callee and by the
+    type of the object it is bound to, so the calls to the other callees only run the event types
+    declared without callees, or return right away if there are none.
+    """
+
+    def __init__(self, before_event_types: List[_EventType], after_event_types: List[_EventType]):
+        # The event types declared without callees, the lists of the instrumented function, see _set_event_types.
+        self.before_event_types = before_event_types
+        self.after_event_types = after_event_types
+        # Callee name -> (before event types, after event types).
+        self.by_name = {}
+        # Type of the bound object -> (before event types, after event types), of the event types declared with types only.
+        self.by_type = {}
+        # Type of the bound object -> the by_type event types of the type and of its base classes.
+        self._type_cache = {}
+
+    def add(self, event_type: _EventType, before: bool) -> None:
+        """Adds an event type declared for some callees.
+
+            Args:
+                event_type: The event type, with callee_names or callee_types.
+                before: Whether the event is fired before the call.
+        """
+        position = 0 if before else 1
+        if event_type.callee_names:
+            for name in event_type.callee_names:
+                self.by_name.setdefault(name, ([], []))[position].append(event_type)
+        else:
+            for callee_type in event_type.callee_types:
+                self.by_type.setdefault(callee_type, ([], []))[position].append(event_type)
+            self._type_cache = {}
+
+    def remove(self, event_type: _EventType, before: bool) -> None:
+        """Removes an event type added with add.
+
+            Args:
+                event_type: The event type.
+                before: Whether the event is fired before the call.
+        """
+        position = 0 if before else 1
+        # The lists are replaced rather than modified, select may be iterating over them in another thread.
+        for index in (self.by_name, self.by_type):
+            for key, hooks in list(index.items()):
+                if event_type in hooks[position]:
+                    hooks = list(hooks)
+                    hooks[position] = [hook for hook in hooks[position] if hook is not event_type]
+                    hooks = tuple(hooks)
+                    if hooks[0] or hooks[1]:
+                        index[key] = hooks
+                    else:
+                        del index[key]
+        # A new cache, so that a select running in another thread does not store the removed event type in it.
+        self._type_cache = {}
+
+    def event_types(self, before: bool) -> List[_EventType]:
+        """Returns all the event types declared for some callees, before or after the call.
+
+            Args:
+                before: Whether to return the event types fired before the call.
+            Returns:
+                The list of the event types.
+        """
+        position = 0 if before else 1
+        event_types = []
+        for index in (self.by_name, self.by_type):
+            for hooks in index.values():
+                event_types.extend(event_type for event_type in hooks[position] if event_type not in event_types)
+        return event_types
+
+    def select(self, callee: Any) -> Tuple[List[_EventType], List[_EventType]]:
+        """Returns the event types of a call to a callee.
+
+            Args:
+                callee: The callee of the tracked call.
+            Returns:
+                The before and the after event types.
+        """
+        before, after = self.before_event_types, self.after_event_types
+
+        if self.by_name:
+            hooks = self.by_name.get(getattr(callee, '__name__', None))
+            if hooks is not None:
+                bound = getattr(callee, '__self__', None)
+                before = before + [event_type for event_type in hooks[0]
+                                   if event_type.callee_types is None or isinstance(bound, event_type.callee_types)]
+                after = after + [event_type for event_type in hooks[1]
+                                 if event_type.callee_types is None or isinstance(bound, event_type.callee_types)]
+
+        if self.by_type:
+            bound_type = type(getattr(callee, '__self__', None))
+            type_cache = self._type_cache
+            hooks = type_cache.get(bound_type)
+            if hooks is None:
+                hooks = ([], [])
+                for base in bound_type.__mro__:
+                    base_hooks = self.by_type.get(base)
+                    if base_hooks is not None:
+                        hooks[0].extend(base_hooks[0])
+                        hooks[1].extend(base_hooks[1])
+                type_cache[bound_type] = hooks
+            if hooks[0]:
+                before = before + hooks[0]
+            if hooks[1]:
+                after = after + hooks[1]
+
+        return before, after
+
+
+# Free event contexts per thread. A hook may fire nested events, so a context is taken
+# out of the pool while its hook runs and put back once the hook returns.
+_event_context_pools = threading.local()
+
+
+def _call_hook(event_type: _EventType, func_name: str, obj: Any, args: Any, kwargs: Any, exception: Optional[Exception],
+               call_file_name: str, call_line_num: int, is_before: bool, return_val: Any, pass_exception: bool = True) -> Any:
+    """Calls the hook of an event type with the calling convention it is declared with.
+
+        Args:
+            event_type: The event type whose hook is called.
+            func_name: The name of the instrumented function.
+            obj: The instance the function is called on.
+            args: The positional arguments of the call.
+            kwargs: The keyword arguments of the call.
+            exception: The exception raised by the call, if any.
+            call_file_name: The file name of the call site.
+            call_line_num: The line number of the call site.
+            is_before: Whether the event fires before the call.
+            return_val: The value returned by the call, for the events after the call.
+            pass_exception: Whether the keyword argument hooks get the exception argument.
+        Returns:
+            The result of the hook.
+    """
+    if event_type.takes_context:
+        pool = getattr(_event_context_pools, 'pool', None)
+        if pool is None:
+            pool = _event_context_pools.pool = []
+        ctx = pool.pop() if pool else EventContext()
+        ctx.func_name = func_name
+        ctx.obj = obj
+        ctx.args = args
+        ctx.kwargs = kwargs
+        ctx.return_val = return_val
+        ctx.exception = exception
+        ctx.call_file_name = call_file_name
+        ctx.call_line_num = call_line_num
+        ctx.is_before = is_before
+        try:
+            return event_type.hook(ctx)
+        finally:
+            ctx.clear()
+            pool.append(ctx)
+
+    # Adapter for the hooks declared with **kw.
+    kw = {'obj': obj, 'args': args, 'kwargs': kwargs, 'call_file_name': call_file_name, 'call_line_num': call_line_num}
+    if pass_exception:
+        kw['exception'] = exception
+    if is_before:
+        return event_type.hook(func_name=func_name, **kw)
+    return event_type.hook(func_name=func_name, return_val=return_val, **kw)
+
 
 def call_empty_monitor(instance, event_type, func_name, call_file_name, call_line_num, is_before, return_val, args, kwargs):
     # This function is called when the monitor is not created necessary
     # because the spec has no formal expression (ere, ltl, fsm)
 
-    kw = {'obj': instance, 'args': args, 'kwargs': kwargs, 'call_file_name': call_file_name, 'call_line_num': call_line_num}
-    if is_before:
-        return_hook = event_type.hook(func_name=func_name, **kw)
-    else:
-        return_hook = event_type.hook(func_name=func_name, return_val=return_val, **kw)
+    return_hook = _call_hook(event_type, func_name, instance, args, kwargs, None, call_file_name, call_line_num,
+                             is_before, return_val, pass_exception=False)
+
+    if isinstance(return_hook, HookResult):
+        if return_hook.verdict == VIOLATION:
+            if return_hook.filename is not None and return_hook.lineno is not None:
+                call_file_name = return_hook.filename
+                call_line_num = return_hook.lineno
+            _report_empty_monitor_violation(event_type, call_file_name, call_line_num, return_hook.last_event,
+                                            return_hook.param, return_hook.custom_message, args, kwargs)
+        return return_hook
 
     if return_hook == VIOLATION or return_hook == True or (isinstance(return_hook, dict) and return_hook['verdict'] == VIOLATION):
         custom_message = None
@@ -115,72 +391,119 @@ def call_empty_monitor(instance, event_type, func_name, call_file_name, call_lin
 
         if isinstance(return_hook, dict) and 'custom_message' in return_hook:
             custom_message = return_hook.get('custom_message', None)
-        
-        # Extract the name of the spec
-        empty_spec_name = event_type.spec.__class__.__name__
-
-        # Add the violation into the statistics.
-        violation_first_occurrence = StatisticsSingleton().add_violation(empty_spec_name,
-                                            f'last event: {last_event}, param: {param}, '
-                                            f'message: {custom_message}, '
-                                            f'file_name: {call_file_name}, line_num: {call_line_num}'
-                                            )
-
-        # Call violation handler for printing violations to the console
-        if PrintViolationSingleton().get_output_violation() and violation_first_occurrence and PRINT_VIOLATIONS_TO_CONSOLE:
-            if event_type.spec.match.__code__.co_argcount == 6:
-                event_type.spec.match(call_file_name, call_line_num, args, kwargs, custom_message)
-            else:
-                event_type.spec.match(call_file_name, call_line_num)
+
+        _report_empty_monitor_violation(event_type, call_file_name, call_line_num, last_event, param, custom_message,
+                                        args, kwargs)
+
+    return return_hook
+
+
+def _report_empty_monitor_violation(event_type, call_file_name, call_line_num, last_event, param, custom_message, args, kwargs):
+    # Extract the name of the spec
+    empty_spec_name = event_type.spec.__class__.__name__
+
+    # Add the violation into the statistics.
+    violation_first_occurrence = StatisticsSingleton().add_violation(empty_spec_name,
+                                        f'last event: {last_event}, param: {param}, '
+                                        f'message: {custom_message}, '
+                                        f'file_name: {call_file_name}, line_num: {call_line_num}'
+                                        )
+
+    # Call violation handler for printing violations to the console
+    if PrintViolationSingleton().get_output_violation() and violation_first_occurrence and PRINT_VIOLATIONS_TO_CONSOLE:
+        if event_type.spec.match.__code__.co_argcount == 6:
+            event_type.spec.match(call_file_name, call_line_num, args, kwargs, custom_message)
+        else:
+            event_type.spec.match(call_file_name, call_line_num)
+
+# Bound of the per file caches below, they are cleared when full.
+_FILE_CACHE_SIZE = 4096
+
+# Whether the events called from a file are reported at its caller, per file name.
+_passthrough_files = {}
+
+# Skip decisions of should_skip_execution, per should_skip_in_sites value and call file name.
+_skip_decisions = {False: {}, True: {}}
+
+
+def invalidate_skip_cache() -> None:
+    """Clears the cached skip decisions.
+
+    Must be called after changing DONT_MONITOR_SITE_PACKAGES,
+    DONT_MONITOR_PYTHON_SOURCE_CODE or spec_to_skip_events_from.
+    """
+    for skip_decisions in _skip_decisions.values():
+        skip_decisions.clear()
+
+
+def _is_passthrough_file(file_name: str) -> bool:
+    passthrough = _passthrough_files.get(file_name)
+    if passthrough is None:
+        if len(_passthrough_files) >= _FILE_CACHE_SIZE:
+            _passthrough_files.clear()
+        passthrough = _passthrough_files[file_name] = 'builtin_instrumentation' in file_name or 'sitecustomize' in file_name
+    return passthrough
 
 def get_caller_info() -> Tuple[str, int]:
-    cf = inspect.currentframe()
-    call_line_num = cf.f_back.f_back.f_lineno
-    call_file_name = cf.f_back.f_back.f_code.co_filename
-    
-    if 'builtin_instrumentation' in call_file_name or 'sitecustomize' in call_file_name:
-        # Go up one more frame to get the original caller
-        if cf.f_back.f_back.f_back is not None:
-            call_file_name = cf.f_back.f_back.f_back.f_code.co_filename
-            call_line_num = cf.f_back.f_back.f_back.f_lineno
-    
-    return call_file_name, call_line_num
+    # The caller of the instrumented function that called get_caller_info.
+    frame = sys._getframe(2)
+    call_file_name = frame.f_code.co_filename
 
-def should_skip_execution(should_skip_in_sites: bool, call_file_name: str, call_line_num: int, parameter_type: Type) -> bool:
-    # Always need to get these events
-    if parameter_type == End:
-        return False
+    if _is_passthrough_file(call_file_name):
+        # Go up one more frame to get the original caller
+        if frame.f_back is not None:
+            frame = frame.f_back
+            call_file_name = frame.f_code.co_filename
 
-    if "pythonmop.builtin_instrumentation" in str(parameter_type):
-        if debug:
-            debug_message(lambda: f'not skipping execution of pythonmop builtin instrumentation from {call_file_name}:{call_line_num} {parameter_type}')
-        return False
+    return call_file_name, frame.f_lineno
 
+def _skip_reason(should_skip_in_sites: bool, call_file_name: str) -> Optional[str]:
     # Always ignore events from PyMOP
     if 'pythonmop' in call_file_name:
-        if debug:
-            debug_message(lambda: f'skipping execution of pythonmop from {call_file_name}:{call_line_num} {parameter_type}')
-        return True
+        return 'execution of pythonmop'
 
     if (should_skip_in_sites or DONT_MONITOR_SITE_PACKAGES) and '/site-packages/' in call_file_name:
-        if debug:
-            debug_message(lambda: f'skipping execution of site packages from {call_file_name}:{call_line_num} {parameter_type}')
-        return True
+        return 'execution of site packages'
 
     # return if the call is from python source code
     if DONT_MONITOR_PYTHON_SOURCE_CODE and stdlib_path in call_file_name:
-        if debug:
-            debug_message(lambda: f'skipping execution of python source code from {call_file_name}:{call_line_num} {parameter_type}')
-        return True
-    
+        return 'execution of python source code'
+
     # return if the call is from a spec file and the spec should be skipped
     if call_file_name in spec_to_skip_events_from:
+        return 'spec file'
+
+    return None
+
+def _cache_skip_decision(should_skip_in_sites: bool, call_file_name: str) -> bool:
+    skip_decisions = _skip_decisions[bool(should_skip_in_sites)]
+    if len(skip_decisions) >= _FILE_CACHE_SIZE:
+        skip_decisions.clear()
+    skip = skip_decisions[call_file_name] = _skip_reason(should_skip_in_sites, call_file_name) is not None
+    return skip
+
+def should_skip_execution(should_skip_in_sites: bool, call_file_name: str, call_line_num: int, parameter_type: Type) -> bool:
+    # Always need to get these events
+    if parameter_type == End:
+        return False
+
+    if "pythonmop.builtin_instrumentation" in str(parameter_type):
         if debug:
-            debug_message(lambda: f'skipping spec file from {call_file_name}:{call_line_num} {parameter_type}')
+            debug_message(lambda: f'not skipping execution of pythonmop builtin instrumentation from {call_file_name}:{call_line_num} {parameter_type}')
+        return False
+
+    if not debug:
+        skip = _skip_decisions[bool(should_skip_in_sites)].get(call_file_name)
+        if skip is None:
+            skip = _cache_skip_decision(should_skip_in_sites, call_file_name)
+        return skip
+
+    reason = _skip_reason(should_skip_in_sites, call_file_name)
+    if reason is not None:
+        debug_message(lambda: f'skipping {reason} from {call_file_name}:{call_line_num} {parameter_type}')
         return True
 
-    if debug:
-        debug_message(lambda: f'not skipping execution of {call_file_name}:{call_line_num} {parameter_type}')
+    debug_message(lambda: f'not skipping execution of {call_file_name}:{call_line_num} {parameter_type}')
     return False
 
 def get_instance(func: Callable, spec_name: str, self_in_args: bool, *args: Any) -> Any:
@@ -205,6 +528,203 @@ def get_instance(func: Callable, spec_name: str, self_in_args: bool, *args: Any)
 
     return instance
 
+# Factories of the instrumented functions, generated once per (hint source, self in args, never skipped, callee arg, debug).
+_instrumented_func_factories = {}
+
+
+def _instrumented_func_source(hint_source: str, self_in_args: bool, never_skipped: bool, callee_arg: Optional[int]) -> str:
+    """Generates the source of a factory of instrumented functions specialized for one kind of target.
+
+    The checks that only depend on the instrumented function are decided here
+    instead of on every call: where the location of the call comes from,
+    whether the instance is the first argument and whether the events may be
+    skipped. The arguments of the handled calls are copied into a list, which
+    the before hooks may modify. The methods of the call trackers
+    select the event types of the callee of each call, see _CalleeIndex.
+
+        Args:
+            hint_source: 'last_args', 'instance' or 'caller', see _get_instrumented_func.
+            self_in_args: Whether the first argument of the function is self.
+            never_skipped: Whether should_skip_execution always returns False for the function.
+            callee_arg: The position of the callee in the arguments of a call tracker method, or None.
+        Returns:
+            The source of the make_instrumented_func factory.
+    """
+    if hint_source == 'last_args':
+        location = [
+            "            elif args[-2] is not None and args[-3] is not None:",
+            "                call_line_num = args[-2]",
+            "                call_file_name = args[-3]",
+            "            else:",
+            "                call_file_name, call_line_num = get_caller_info()",
+        ]
+    elif hint_source == 'instance':
+        location = [
+            "            elif args[0].filename is not None:",
+            "                call_line_num = args[0].lineno",
+            "                call_file_name = args[0].filename",
+            "            else:",
+            "                call_file_name, call_line_num = get_caller_info()",
+        ]
+    else:
+        location = [
+            "            else:",
+            "                call_file_name, call_line_num = get_caller_info()",
+        ]
+
+    # The guard is released before calling the original function of the events that are not handled.
+    unhandled_call = [
+        "            in_progress.reset(in_progress_token)",
+        "            return func(*args, **kwargs)",
+    ]
+
+    if never_skipped:
+        skip = []
+    elif debug:
+        skip = [
+            "        if should_skip_execution(should_skip_in_sites, call_file_name, call_line_num, parameter_type):",
+            *unhandled_call,
+            "",
+        ]
+    else:
+        # One lookup in the skip decisions of the call file, see should_skip_execution.
+        skip = [
+            "        skip = skip_decisions.get(call_file_name)",
+            "        if skip is None:",
+            "            skip = _cache_skip_decision(should_skip_in_sites, call_file_name)",
+            "        if skip:",
+            *unhandled_call,
+            "",
+        ]
+
+    # The lists of the event types are replaced rather than modified when the specs register or unregister
+    # their events, so they are read once per call and the call handles the event types registered at its start.
+    if callee_arg is None:
+        select_event_types = [
+            "        before_event_types = new_func.pythonmop_before_event_types",
+            "        after_event_types = new_func.pythonmop_after_event_types",
+            "        if not before_event_types and not after_event_types:",
+            "            return func(*args, **kwargs)",
+            "",
+        ]
+    else:
+        select_event_types = [
+            "        # Only the event types declared for the callee of the tracked call, if any, are handled.",
+            "        try:",
+            f"            before_event_types, after_event_types = callee_index.select(args[{callee_arg}])",
+            "        except Exception:",
+            "            before_event_types, after_event_types = callee_index.before_event_types, callee_index.after_event_types",
+            "        if not before_event_types and not after_event_types:",
+            "            return func(*args, **kwargs)",
+            "",
+        ]
+
+    instance = "args[0] if args else get_instance(func, spec_name, True)" if self_in_args else \
+        "get_instance(func, spec_name, False, *args)"
+
+    handle_call = [
+        "    # The spec parameters of the call, shared by its before and after events.",
+        "    resolved_params = {}",
+        "    if before_event_types:",
+        "        try:",
+        "            handle_events(before_event_types, new_func, call_file_name, call_line_num, instance, parameter_type,",
+        "                          True, None, target_params, args, kwargs, resolved_params=resolved_params)",
+        "        except Exception as e:",
+        "            print(f\"Key errors happened while handling before event of {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!\", e)",
+        "",
+        "    # Original function",
+        "    exception = None",
+        "    return_val = None",
+        "    try:",
+        "        return_val = func(*args, **kwargs)",
+        "    except Exception as e:",
+        "        exception = e",
+        "",
+        "    if after_event_types:",
+        "        try:",
+        "            handle_events(after_event_types, new_func, call_file_name, call_line_num, instance, parameter_type,",
+        "                          False, return_val, target_params, args, kwargs, exception, resolved_params)",
+        "        except Exception as e:",
+        "            print(f\"Key errors happened while handling after event of {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!\", e)",
+        "",
+        "    if exception is not None: # if there is an exception, raise it",
+        "        raise exception",
+        "",
+        "    return return_val",
+    ]
+
+    return "\n".join([
+        "def make_instrumented_func(func, spec, spec_name, should_skip_in_sites, parameter_type, target_params,",
+        "                           callee_index):",
+        "    skip_decisions = _skip_decisions[should_skip_in_sites]",
+        "",
+        "    # Events fired while handling an event of this function in the same thread",
+        "    # (or asyncio task) only call the original function, to avoid infinite recursion.",
+        "    in_progress = ContextVar('pythonmop_event_handling_in_progress', default=False)",
+        "",
+        "    def new_func(*args, **kwargs):",
+        "        if in_progress.get():",
+        "            return func(*args, **kwargs)",
+        "",
+        *select_event_types,
+        "        in_progress_token = in_progress.set(True)",
+        "",
+        "        # Get function call location",
+        "        call_line_num = None",
+        "        call_file_name = None",
+        "        try:",
+        "            if '___pymop__ast__hint__filename' in kwargs:",
+        "                call_line_num = kwargs['___pymop__ast__hint__lineno']",
+        "                call_file_name = kwargs['___pymop__ast__hint__filename']",
+        *location,
+        "        except Exception as e:",
+        "            print(f\"Key errors happened while preparing to handle {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!\", e)",
+        "",
+        *skip,
+        "        try:",
+        f"            instance = {instance}",
+        "        except Exception as e:",
+        "            print(f\"Key errors happened while getting instance for {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!\", e)",
+        *unhandled_call,
+        "",
+        "        if instance is None:",
+        *unhandled_call,
+        "",
+        "        # The before hooks may modify the arguments, so they get a mutable copy. The after hooks get the",
+        "        # same list whatever hooks the other specs registered.",
+        "        args = list(args)",
+        "",
+        "        try:",
+        *['        ' + line if line else line for line in handle_call],
+        "        finally:",
+        "            in_progress.reset(in_progress_token)",
+        "",
+        "    return new_func",
+    ])
+
+
+def _get_instrumented_func_factory(hint_source: str, self_in_args: bool, never_skipped: bool,
+                                   callee_arg: Optional[int]) -> Callable:
+    """Returns the factory of instrumented functions for one kind of target, generating it on first use.
+
+        Args:
+            hint_source: 'last_args', 'instance' or 'caller', see _get_instrumented_func.
+            self_in_args: Whether the first argument of the function is self.
+            never_skipped: Whether should_skip_execution always returns False for the function.
+            callee_arg: The position of the callee in the arguments of a call tracker method, or None.
+        Returns:
+            The make_instrumented_func factory.
+    """
+    key = (hint_source, self_in_args, never_skipped, callee_arg, debug)
+    factory = _instrumented_func_factories.get(key)
+    if factory is None:
+        source = _instrumented_func_source(hint_source, self_in_args, never_skipped, callee_arg)
+        namespace = {}
+        exec(compile(source, f'<pythonmop instrumented function {hint_source}>', 'exec'), globals(), namespace)
+        factory = _instrumented_func_factories[key] = namespace['make_instrumented_func']
+    return factory
+
+
 def _get_instrumented_func(func: Callable, spec, parameter_type: Type, target_params: Optional[List[int]] = None) -> Callable:
     """Creates an instrumented version of a function.
 
@@ -216,13 +736,13 @@ def _get_instrumented_func(func: Callable, spec, parameter_type: Type, target_pa
 
     A function only has to be instrumented once during runtime, then multiple
     specs can register events onto it without re-instrumenting. To register a
-    before-call event, append it to the instrumented function's
-    ``pythonmop_before_event_types`` field, like so:
+    before-call event, pass it to _add_event_type, like so:
 
-    ``my_instrumented_func.pythonmop_before_event_types.append(new_event_type)``
+    ``_add_event_type(my_instrumented_func, new_event_type, True)``
 
-    To register an after-call event, do the same as above but with the
-    ``pythonmop_after_event_types`` field.
+    It replaces the instrumented function's ``pythonmop_before_event_types``
+    list with a new one holding the event type. To register an after-call
+    event, pass False instead, for the ``pythonmop_after_event_types`` list.
 
     Args:
         func: Function to instrument.
@@ -232,126 +752,39 @@ def _get_instrumented_func(func: Callable, spec, parameter_type: Type, target_pa
     """
 
     spec_name = spec.__class__.__name__
-    should_skip_in_sites = spec.__class__.should_skip_in_sites
+    should_skip_in_sites = bool(spec.__class__.should_skip_in_sites)
     self_in_args = has_self_in_args(func)
 
-    # Define instrumented function
-    @functools.wraps(func)
-    def new_func(*args: Any, **kwargs: Any):
-        if hasattr(new_func, 'pythonmop_event_handling_in_progress') and new_func.pythonmop_event_handling_in_progress:
-            return func(*args, **kwargs)
-
-        new_func.pythonmop_event_handling_in_progress = True
-
-        '''
-        Converting args to a list is important, so that it becomes
-        mutable and can be modified from the 'before' hook.
-        '''
-        args = list(args)
-
-        # Get function call location
-        call_line_num = None
-        call_file_name = None
-        instance = None
-        parameter_type = None
-
-        try:
-            if '___pymop__ast__hint__filename' in kwargs:
-                # print('Hint found in kwargs, using it to get the file name and line number')
-                # If the hint is provided, use it to get the file name and line number
-                call_line_num = kwargs['___pymop__ast__hint__lineno']
-                call_file_name = kwargs['___pymop__ast__hint__filename']
-            elif hasattr(func, '__pymop_last_args_contain_ast_hints__') and args[-2] is not None and args[-3] is not None:
-                call_line_num = args[-2]
-                call_file_name = args[-3]
-            elif hasattr(func, '__pymop_instance_contains_hints__') and args[0].filename is not None:
-                call_line_num = args[0].lineno
-                call_file_name = args[0].filename
-            else:
-                call_file_name, call_line_num = get_caller_info()
-
-            # Get the parameter type passed in by the user.
-            parameter_type = new_func.pythonmop_parameter_type
-        except Exception as e:
-            print(f"Key errors happened while preparing to handle {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!", e)
+    # Where the wrapper finds the location of the call when no hint is passed in the keyword arguments.
+    if hasattr(func, '__pymop_last_args_contain_ast_hints__'):
+        hint_source = 'last_args'
+    elif hasattr(func, '__pymop_instance_contains_hints__'):
+        hint_source = 'instance'
+    else:
+        hint_source = 'caller'
 
-        if should_skip_execution(should_skip_in_sites, call_file_name, call_line_num, parameter_type):
-            new_func.pythonmop_event_handling_in_progress = False
-            return func(*args, **kwargs)
+    # The events of these targets are never skipped, see should_skip_execution.
+    never_skipped = not debug and (parameter_type == End or "pythonmop.builtin_instrumentation" in str(parameter_type))
 
-        try:
-            instance = get_instance(func, spec_name, self_in_args, *args)
-        except Exception as e:
-            print(f"Key errors happened while getting instance for {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!", e)
-            new_func.pythonmop_event_handling_in_progress = False
-            return func(*args, **kwargs)
+    before_event_types = []
+    after_event_types = []
 
-        if instance is None:
-            new_func.pythonmop_event_handling_in_progress = False
-            return func(*args, **kwargs)
+    # The call trackers pass the callee of the tracked call at this position, see _CalleeIndex.
+    callee_arg = getattr(func, '__pymop_callee_arg__', None)
+    callee_index = _CalleeIndex(before_event_types, after_event_types) if callee_arg is not None else None
 
-        try:
-            # Handle before-call events
-            handle_events(
-                new_func.pythonmop_before_event_types,
-                new_func,
-                call_file_name,
-                call_line_num,
-                instance,
-                parameter_type,
-                True,
-                None,
-                target_params,
-                args,
-                kwargs
-            )
-        except Exception as e:
-            print(f"Key errors happened while handling before event of {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!", e)
-
-        # Original function
-        exception = None
-        return_val = None
-        try:
-            return_val = func(*args, **kwargs)
-        except Exception as e:
-            exception = e
+    # Define instrumented function
+    make_instrumented_func = _get_instrumented_func_factory(hint_source, self_in_args, never_skipped, callee_arg)
+    new_func = functools.wraps(func)(make_instrumented_func(func, spec, spec_name, should_skip_in_sites, parameter_type,
+                                                            target_params, callee_index))
 
-        try:
-            # Handle after-call events
-            handle_events(
-                new_func.pythonmop_after_event_types,
-                new_func,
-                call_file_name,
-                call_line_num,
-                instance,
-                parameter_type,
-                False,
-                return_val,
-                target_params,
-                args,
-                kwargs,
-                exception
-            )
-        except Exception as e:
-            print(f"Key errors happened while handling after event of {func.__name__} event of {parameter_type} of spec {spec} at {call_file_name}:{call_line_num}, please check the plugin error messages for more details!", e)
-
-        new_func.pythonmop_event_handling_in_progress = False
-
-        if exception is not None: # if there is an exception, raise it
-            raise exception
-        
-        return return_val
-
-    # Add lists of event hooks
-    setattr(new_func, 'pythonmop_before_event_types', [])
-    setattr(new_func, 'pythonmop_after_event_types', [])
+    # Add lists of event hooks, replaced rather than modified, see _add_event_type.
+    setattr(new_func, 'pythonmop_before_event_types', before_event_types)
+    setattr(new_func, 'pythonmop_after_event_types', after_event_types)
+    setattr(new_func, 'pythonmop_callee_index', callee_index)
 
     setattr(new_func, 'is_instrumented', True)
 
-    # Used to short circuit the events being triggered during the handling
-    # of the current event otherwise we will get infinite recursion
-    setattr(new_func, 'pythonmop_event_handling_in_progress', False)
-
     # Make sure the instrumented function has all the
     # attributes of the original function
     new_func_attributes = set(dir(new_func))
@@ -366,33 +799,177 @@ def _get_instrumented_func(func: Callable, spec, parameter_type: Type, target_pa
 
 
 
+def _add_event_type(func: Callable, event_type: _EventType, before: bool) -> None:
+    """Registers an event type to an instrumented function.
+
+        Args:
+            func: The instrumented function.
+            event_type: The event type.
+            before: Whether the event is fired before the call.
+        Raises:
+            ValueError: If the event type is declared for some callees and the function is not a call tracker method.
+    """
+    if event_type.callee_names is None and event_type.callee_types is None:
+        event_types = func.pythonmop_before_event_types if before else func.pythonmop_after_event_types
+        _set_event_types(func, event_types + [event_type], before)
+    elif getattr(func, 'pythonmop_callee_index', None) is None:
+        raise ValueError(f'ERROR: Event {event_type.name} declares callees but {func.__name__} is not a call tracker method')
+    else:
+        func.pythonmop_callee_index.add(event_type, before)
+
+
+def _remove_event_type(func: Callable, event_type: _EventType, before: bool) -> None:
+    """Unregisters an event type from an instrumented function.
+
+        Args:
+            func: The instrumented function.
+            event_type: The event type, registered with _add_event_type.
+            before: Whether the event is fired before the call.
+    """
+    if event_type.callee_names is None and event_type.callee_types is None:
+        event_types = func.pythonmop_before_event_types if before else func.pythonmop_after_event_types
+        if event_type in event_types:
+            _set_event_types(func, [other for other in event_types if other is not event_type], before)
+    else:
+        func.pythonmop_callee_index.remove(event_type, before)
+
+
+def _set_event_types(func: Callable, event_types: List[_EventType], before: bool) -> None:
+    # The lists are replaced rather than modified, the wrapper may be iterating over them in another thread.
+    callee_index = getattr(func, 'pythonmop_callee_index', None)
+    if before:
+        func.pythonmop_before_event_types = event_types
+        if callee_index is not None:
+            callee_index.before_event_types = event_types
+    else:
+        func.pythonmop_after_event_types = event_types
+        if callee_index is not None:
+            callee_index.after_event_types = event_types
+
+
+def _get_event_types(func: Callable, before: bool) -> List[_EventType]:
+    """Returns all the event types registered to an instrumented function, before or after the call.
+
+        Args:
+            func: The instrumented function.
+            before: Whether to return the event types fired before the call.
+        Returns:
+            The list of the event types.
+    """
+    event_types = list(func.pythonmop_before_event_types if before else func.pythonmop_after_event_types)
+    callee_index = getattr(func, 'pythonmop_callee_index', None)
+    if callee_index is not None:
+        event_types.extend(callee_index.event_types(before))
+    return event_types
+
+
+def _is_false_event(ret) -> bool:
+    if isinstance(ret, HookResult):
+        return ret.verdict == FALSE_EVENT
+    return ret == FALSE_EVENT or (isinstance(ret, dict) and ret['verdict'] == FALSE_EVENT)
+
+
+def _resolve_params(spec, instances, parameter_type, resolved_params):
+    """Return the spec parameter combination of the parameter instances of an event.
+
+        Args:
+            spec: The spec receiving the event.
+            instances: The parameter instances, the first one is the instance of the call.
+            parameter_type: The parameter type of the first instance.
+            resolved_params: The spec parameters already created during the call, updated in place.
+        Returns:
+            The tuple of the spec parameters.
+    """
+    spec_params = []
+    for i, inst in enumerate(instances):
+        param_type = parameter_type if i == 0 else type(inst)
+        key = (id(inst), param_type)
+        resolved = resolved_params.get(key)
+        # The instance is kept with its parameter, so that its id() is not reused during the call.
+        if resolved is not None and resolved[0] is inst:
+            spec_params.append(resolved[1])
+            continue
+
+        param_id = identity_registry.get_id(inst)
+        spec_param = spec.param(param_id, param_type)
+        resolved_params[key] = (inst, spec_param)
+
+        # Print out the debug message for testing purposes.
+        if debug:
+            debug_message(lambda: f'- Param created: {str(param_id), str(param_type)}')
+
+        spec_params.append(spec_param)
+
+    return tuple(spec_params)
+
+
 def handle_events(event_types, new_func, call_file_name, call_line_num, instance, parameter_type, is_before,
-                  return_val, target_params, args, kwargs, exception=None):
+                  return_val, target_params, args, kwargs, exception=None, resolved_params=None):
 
-    # Call event hook
+    # The parameters of the call are resolved once for the hooks of all the specs, see _resolve_params.
+    if resolved_params is None:
+        resolved_params = {}
+
+    # Call event hook. The lists of the event types are never modified, see _add_event_type.
     for event_type in event_types:
-        # print(f'--> got {event_type.spec.__class__.__name__}')
+        # The declared predicates are checked before anything else, a failing one filters the event out.
+        if event_type.predicate is not None:
+            try:
+                if not event_type.predicate(args, kwargs, return_val):
+                    continue
+            except Exception:
+                # A predicate that cannot be evaluated does not match, the hooks of the migrated specs no longer
+                # check the conditions themselves.
+                continue
+
+        monitor_event_dispatcher = _monitor_event_dispatcher
+        # The hook and the monitor update of the event are timed together, or not at all.
+        hook_profiler = _hook_profiler
+        timed = hook_profiler is not None and hook_profiler.should_sample()
+        # The hooks run without the event lock of the spec, they may call instrumented functions whose
+        # events are handled by other specs. Only the monitor updates take it, see Spec.update_monitor.
 
         # Check whether spec has a monitor attribute (SHOULD NOT BE USED ANY MORE)
         if event_type.spec.monitor is None:
             # case where the monitor is not created necessary because the spec has no formal expression (ere, ltl, fsm)
-            call_empty_monitor(instance, event_type, new_func.__name__, call_file_name, call_line_num, is_before,
-                               return_val, args, kwargs)
-            # add the event to statistics
-            StatisticsSingleton().add_events(event_type.spec.__class__.__name__, event_type.name)
+            if timed:
+                start = perf_counter_ns()
+            ret = call_empty_monitor(instance, event_type, new_func.__name__, call_file_name, call_line_num, is_before,
+                                     return_val, args, kwargs)
+            if timed:
+                hook_profiler.record(event_type.spec.__class__.__name__, event_type.name, HOOK,
+                                     perf_counter_ns() - start)
+            if _relevant_event_recorder is not None and not _is_false_event(ret):
+                _relevant_event_recorder(event_type.spec.__class__.__name__, call_file_name, call_line_num)
+            # add the event to statistics, the lock is held without running any spec code
+            with event_type.spec.event_lock:
+                StatisticsSingleton().add_events(event_type.spec.__class__.__name__, event_type.name)
             continue
 
-        kw = {'obj': instance, 'args': args, 'kwargs': kwargs, 'exception': exception, 'call_file_name': call_file_name, 'call_line_num': call_line_num}
-        if is_before:
-            ret = event_type.hook(func_name=new_func.__name__, **kw)
-        else:
-            ret = event_type.hook(func_name=new_func.__name__, return_val=return_val, **kw)
+        if timed:
+            start = perf_counter_ns()
+        ret = _call_hook(event_type, new_func.__name__, instance, args, kwargs, exception, call_file_name, call_line_num,
+                         is_before, return_val)
+        if timed:
+            hook_profiler.record(event_type.spec.__class__.__name__, event_type.name, HOOK, perf_counter_ns() - start)
 
-        if ret == FALSE_EVENT or (isinstance(ret, dict) and ret['verdict'] == FALSE_EVENT):
+        if _is_false_event(ret):
             continue
 
+        if _relevant_event_recorder is not None:
+            _relevant_event_recorder(event_type.spec.__class__.__name__, call_file_name, call_line_num)
+
         custom_message = None
 
+        if isinstance(ret, HookResult):
+            if ret.filename is not None and ret.lineno is not None:
+                call_file_name = ret.filename
+                call_line_num = ret.lineno
+            custom_message = ret.custom_message
+            if ret.param_instance is not None:
+                instance = ret.param_instance
+                parameter_type = type(instance)
+
         # Override the call_file_name and call_line_num if the event hook
         # returns a dictionary with 'filename' and 'lineno' keys
         if isinstance(ret, dict) and 'filename' in ret and 'lineno' in ret:
@@ -414,54 +991,32 @@ def handle_events(event_types, new_func, call_file_name, call_line_num, instance
         if target_params is not None:  # target is now a list
             instances.extend([args[t] for t in target_params])
 
-        spec_params = []
-        param_instances = []
-
-        # Dictionary to store UUIDs for built-in objects
-        if not hasattr(handle_events, '_builtin_uuids'):
-            handle_events._builtin_uuids = {}
-
-        for i, inst in enumerate(instances):
-            try:
-                # Check if it's a built-in type
-                if isinstance(inst, (list, dict, set, tuple, str, int, float, bool)):
-                    # Use object id as key for built-in types
-                    obj_id = id(inst)
-                    if obj_id not in handle_events._builtin_uuids:
-                        handle_events._builtin_uuids[obj_id] = str(uuid.uuid4()).replace('-', '')
-                    param_id = handle_events._builtin_uuids[obj_id]
-                else:
-                    # For custom objects, use the original approach
-                    if not hasattr(inst, 'mop_uuid'):
-                        inst.mop_uuid = str(uuid.uuid4()).replace('-', '')
-                    param_id = inst.mop_uuid
-            except AttributeError:
-                # Do not send event and parameter instance to the parametric algorithm
-                return
-
-            if i == 0:
-                spec_param = event_type.spec.param(param_id, parameter_type)
-
-                # Print out the debug message for testing purposes.
-                if debug:
-                    debug_message(lambda: f'- Param created: {str(param_id), str(parameter_type)}')
-            else:
-                spec_param = event_type.spec.param(param_id, type(inst))
+        # Do not send event and parameter instance to the parametric algorithm
+        if any(inst is None for inst in instances):
+            return
 
-                # Print out the debug message for testing purposes.
-                if debug:
-                    debug_message(lambda: f'- Param created: {str(param_id), str(type(inst))}')
+        spec_params = _resolve_params(event_type.spec, instances, parameter_type, resolved_params)
+        param_instances = instances
 
-            spec_params.append(spec_param)
-            param_instances.append(inst)
-
-        # Form the spec parameter combination
-        spec_params = tuple(spec_params)
+        # The events of the parameter objects left out of the sample are not monitored, see ObjectSampler.
+        object_sampler = event_type.spec.object_sampler
+        if object_sampler is not None and not object_sampler.sample_event(event_type.name, spec_params):
+            continue
 
         # Send results to the monitor.
         if hasattr(event_type.spec, 'monitor'):
-            event_type.spec.monitor.update_params_handler(event_type.name, spec_params, param_instances, call_file_name,
-                                                          call_line_num, custom_message, args, kwargs)
+            if monitor_event_dispatcher is not None:
+                monitor_event_dispatcher(event_type.spec, event_type.name, spec_params, param_instances, call_file_name,
+                                         call_line_num, custom_message, args, kwargs)
+            else:
+                if timed:
+                    start = perf_counter_ns()
+                event_type.spec.update_monitor(event_type.spec.monitor.update_params_handler, event_type.name,
+                                               spec_params, param_instances, call_file_name, call_line_num,
+                                               custom_message, args, kwargs)
+                if timed:
+                    hook_profiler.record(event_type.spec.__class__.__name__, event_type.name, MONITOR,
+                                         perf_counter_ns() - start)
 
 
 class Spec:
@@ -505,17 +1060,25 @@ class Spec:
             spec_instance.create_monitor() # create monitor
     """
     should_skip_in_sites = False
+    # Monitors only a sample of the parameter objects when set, see pythonmop.object_sampling.
+    object_sampler = None
     def __init__(self):
 
         # Declare the map to store the relationship between parameters and event names.
         self.parameter_event_map = {'default': []}
         self.monitor = None
 
+        # Held while the monitor of this spec handles events, see update_monitor.
+        self.event_lock = threading.RLock()
+
+        # The (namespace, function name, instrumented function, event type, before) of the registered events, see detach.
+        self._registered_event_types = []
+
         # Print out the debug message for testing purposes.
         if debug:
             debug_message(lambda: f'- Spec initiated: {self.__class__.__name__}')
 
-    def event_before(self, *args: Union[BaseInstrumentTarget, BaseParameterDeclaration], **kwargs: Any) -> Callable:
+    def event_before(self, *args: Union[BaseInstrumentTarget, BaseParameterDeclaration, BaseEventPredicate], **kwargs: Any) -> Callable:
         """Defines and instruments an event to occur before original function runs.
 
         Intended to used like a decorator on an "event hook" function. The name of the
@@ -534,9 +1097,33 @@ class Spec:
                 @self.event_before(call(threading.Thread, 'start'), target_param(self.t))
                 def start(**kw): pass # <- This is the "event hook" function
 
+        An event hook declared with a single positional parameter receives an ``EventContext``
+        instead of keyword arguments, which is reused between events rather than allocated per
+        call, and may return a ``HookResult`` instead of a dict::
+
+                @self.event_before(call(threading.Thread, 'start'), target_param(self.t))
+                def start(ctx): return HookResult(TRUE_EVENT, custom_message=f'{ctx.obj} started')
+
+        The events of the call trackers (``PymopFuncCallTracker.before_call`` and ``after_call``)
+        may be limited to some callees with the ``callee_names`` and ``callee_types`` keyword
+        arguments. The hook then only runs for the calls to a callee with one of the names, bound
+        to an instance of one of the types, and the calls to the other callees cost a dict lookup::
+
+                @self.event_before(call(PymopFuncCallTracker, 'before_call'), callee_names=['append'],
+                                   callee_types=[list])
+                def append(ctx): ...
+
+        Predicates on the arguments and the return value (``arg_type``, ``arg_value``, ``has_kwarg``,
+        ``return_type`` and ``return_value``) are checked before the hook is called, so the hooks
+        that only filter the calls do not run for the calls filtered out::
+
+                @self.event_before(call(CustomLockType, 'acquire'), arg_value(1, (None, True), name='blocking'))
+                def acquire(**kw): ...
+
         Args:
-            *args: Instrumentation target(s) and parameter declaration(s).
-            **kwargs: Optional keyword arguments for further customization.
+            *args: Instrumentation target(s), parameter declaration(s) and predicate(s).
+            **kwargs: Optional keyword arguments for further customization: ``target``, ``names``,
+                ``callee_names`` and ``callee_types``.
 
         Returns:
             Decorator to be applied to an event hook function.
@@ -545,21 +1132,24 @@ class Spec:
         def decorator(hook: Callable) -> None:
             target_params = kwargs.get('target')
             target_names = kwargs.get('names')
-            self._instrument_event(hook, args, True, target_params, target_names)
+            self._instrument_event(hook, args, True, target_params, target_names,
+                                   kwargs.get('callee_names'), kwargs.get('callee_types'))
 
         return decorator
 
-    def event_after(self, *args: Union[BaseInstrumentTarget, BaseParameterDeclaration], **kwargs: Any) -> Callable:
+    def event_after(self, *args: Union[BaseInstrumentTarget, BaseParameterDeclaration, BaseEventPredicate], **kwargs: Any) -> Callable:
         """Defines and instruments an event to occur after original function runs.
 
         Intended to used like a decorator on an "event hook" function. The name of the
         event hook function will be used as the name of the created event.
 
         At least one instrumentation target must be given. Additional instrumentation targets and
-        one or more parameter declarations are optional.
+        one or more parameter declarations are optional. The keyword arguments are the ones of
+        ``event_before``.
 
         Args:
             *args: Instrumentation target(s) and parameter declaration(s).
+            **kwargs: Optional keyword arguments for further customization.
 
         Returns:
             Decorator to be applied to an event hook function.
@@ -568,7 +1158,8 @@ class Spec:
         def decorator(hook: Callable) -> None:
             target_params = kwargs.get('target')
             target_names = kwargs.get('names')
-            self._instrument_event(hook, args, False, target_params, target_names)
+            self._instrument_event(hook, args, False, target_params, target_names,
+                                   kwargs.get('callee_names'), kwargs.get('callee_types'))
 
         return decorator
 
@@ -693,6 +1284,11 @@ class Spec:
                                     handlers, self.__class__.__name__, detailed_message, garbage_collection_flag, 
                                     PRINT_VIOLATIONS_TO_CONSOLE)
 
+        # The monitors call transit_state on themselves, so the timed wrapper is set on the instance.
+        if _hook_profiler is not None:
+            self.monitor.transit_state = _hook_profiler.timed_transit_state(self.__class__.__name__,
+                                                                            self.monitor.transit_state)
+
         return self.monitor
 
     def _add_event_name(self, event_name: str) -> None:
@@ -725,7 +1321,8 @@ class Spec:
         return [name for name, obj in inspect.getmembers(namespace)
                 if callable(obj) and not inspect.isclass(obj) and pattern.fullmatch(name)]
 
-    def _instrument_event(self, hook: Callable, event_args: Sequence, before: bool, target:Optional[List[int]] = None, names:Optional[List[str]] = None) -> None:
+    def _instrument_event(self, hook: Callable, event_args: Sequence, before: bool, target:Optional[List[int]] = None, names:Optional[List[str]] = None,
+                          callee_names: Optional[Sequence[str]] = None, callee_types: Optional[Sequence[type]] = None) -> None:
         """Applies the necessary instrumentation/registration for given event.
 
         Args:
@@ -734,12 +1331,17 @@ class Spec:
             before: Whether to fire event before or after original function call.
             target: Optional list of target parameter indices.
             names: Optional list of names for binding instances.
+            callee_names: Optional names of the callees of a call tracker method to fire the event for.
+            callee_types: Optional types of the objects the callees are bound to.
         """
 
         self._add_event_name(hook.__name__)
+        callee_names = frozenset(callee_names) if callee_names else None
+        callee_types = tuple(callee_types) if callee_types else None
         # Parse arguments
         instrument_targets = [arg for arg in event_args if isinstance(arg, BaseInstrumentTarget)]
         parameter_declares = [arg for arg in event_args if isinstance(arg, BaseParameterDeclaration)]
+        predicates = tuple(arg for arg in event_args if isinstance(arg, BaseEventPredicate)) or None
 
         # Add event instrumentation to functions
         for instrument_target in instrument_targets:
@@ -776,10 +1378,8 @@ class Spec:
                 func = getattr(getattr(namespace, func_name), property_func_name)  # properties.fget or properties.fset
 
                 # Register event types to function
-                if before:
-                    func.pythonmop_before_event_types.append(_EventType(hook.__name__, self, hook))
-                else:
-                    func.pythonmop_after_event_types.append(_EventType(hook.__name__, self, hook))
+                self._register_event_type(namespace, func_name, func,
+                                          _EventType(hook.__name__, self, hook, callee_names, callee_types, predicates), before)
 
             else:  # call
                 # Match function name(s) using regex function
@@ -796,22 +1396,19 @@ class Spec:
                         setattr(namespace, func_name, _get_instrumented_func(func, self, namespace, target))
                         instrumented_func = getattr(namespace, func_name)
 
-                        if before:
-                            instrumented_func.pythonmop_before_event_types.append(_EventType(hook.__name__, self, hook))
-                        else:
-                            instrumented_func.pythonmop_after_event_types.append(_EventType(hook.__name__, self, hook))
+                        self._register_event_type(namespace, func_name, instrumented_func,
+                                                  _EventType(hook.__name__, self, hook, callee_names, callee_types, predicates),
+                                                  before)
                     else:
-                        if before and (hook.__name__, self.__class__.__name__) in [(et.name, et.spec.__class__.__name__) for et in func.pythonmop_before_event_types] \
-                            or not before and (hook.__name__, self.__class__.__name__) in [(et.name, et.spec.__class__.__name__) for et in func.pythonmop_after_event_types]:
+                        if (hook.__name__, self.__class__.__name__) in [(et.name, et.spec.__class__.__name__) for et in _get_event_types(func, before)]:
                             if instrumentation_detailed_message:
                                 print(f'Event {hook.__name__} already registered for {func_name}, skipping')
                             continue
 
                         # If function is already instrumented, just append the event type
-                        if before:
-                            func.pythonmop_before_event_types.append(_EventType(hook.__name__, self, hook))
-                        else:
-                            func.pythonmop_after_event_types.append(_EventType(hook.__name__, self, hook))
+                        self._register_event_type(namespace, func_name, func,
+                                                  _EventType(hook.__name__, self, hook, callee_names, callee_types, predicates),
+                                                  before)
 
             # Declare a new namespace set
             namespace_set = set()
@@ -840,6 +1437,71 @@ class Spec:
             else:
                 self.parameter_event_map['default'].append(namespace_set)
 
+    def _register_event_type(self, namespace: Any, func_name: str, func: Callable, event_type: _EventType,
+                             before: bool) -> None:
+        """Registers an event type of this spec to an instrumented function.
+
+        Args:
+            namespace: The namespace of the function.
+            func_name: The name of the function in the namespace.
+            func: The instrumented function.
+            event_type: The event type.
+            before: Whether the event is fired before the call.
+        """
+        _add_event_type(func, event_type, before)
+        self._registered_event_types.append((namespace, func_name, func, event_type, before))
+        _notify_event_listener_callbacks(namespace, func_name)
+
+    def update_monitor(self, update: Callable, *args) -> None:
+        """Calls a method of the monitor of this spec holding its event lock.
+
+        A thread holds the event lock of one spec at a time, so two threads cannot wait for each other's locks:
+        the updates requested while the thread is already updating a monitor, when a violation handler calls
+        an instrumented function, are made once that update is done and its lock released.
+
+        Args:
+            update: The method of the monitor, update_params_handler or update_params_batch.
+            *args: The arguments of the method.
+        """
+        pending = getattr(_monitor_updates, 'pending', None)
+        if pending is not None:
+            pending.append((self, update, args))
+            return
+
+        pending = _monitor_updates.pending = deque()
+        try:
+            with self.event_lock:
+                update(*args)
+        finally:
+            try:
+                while pending:
+                    spec, update, args = pending.popleft()
+                    try:
+                        with spec.event_lock:
+                            update(*args)
+                    except Exception as e:
+                        print(f"Errors happened while updating the monitor of spec {spec.__class__.__name__} after a "
+                              f"violation handler of spec {self.__class__.__name__}", e)
+            finally:
+                _monitor_updates.pending = None
+
+    def detach(self) -> None:
+        """Unregisters all the event types of this spec from the instrumented functions.
+
+        The hooks and the monitor of the spec get no events afterwards, the functions stay instrumented.
+        The violations found so far are kept.
+        """
+        # The monitor of the spec is not updated while its event types are removed.
+        with self.event_lock:
+            registered_event_types, self._registered_event_types = self._registered_event_types, []
+            for namespace, func_name, func, event_type, before in registered_event_types:
+                _remove_event_type(func, event_type, before)
+                _notify_event_listener_callbacks(namespace, func_name)
+
+        # Print out the debug message for testing purposes.
+        if debug:
+            debug_message(lambda: f'- Spec detached: {self.__class__.__name__}')
+
     def get_monitor(self):
         """Get the monitor for the spec instance.
 
@@ -14,6 +14,15 @@ class StatisticsSingleton:
             cls._instance.instrumentation_duration = 0.0
             cls._instance.create_monitor_end_time = 0.0
             cls._instance.create_monitor_duration = 0.0
+            cls._instance.instrumentation_cache_hits = None  # None when the instrumentation cache is disabled
+            cls._instance.instrumentation_cache_misses = None
+            cls._instance.instrumentation_report = {}  # module -> node kind -> [rewritten, skipped]
+            cls._instance.reload_statistics = {}  # empty unless the AST strategy reloaded modules
+            cls._instance.instrumentation_profile = {}  # module -> timings and bytecode sizes
+            cls._instance.async_monitoring_statistics = None  # None unless the asynchronous monitoring is enabled
+            cls._instance.hook_profile = {}  # spec -> event -> kind -> latencies, empty unless the hooks are profiled
+            cls._instance.object_sampling_statistics = {}  # spec -> sampler counters, only for the sampled specs
+            cls._instance.overhead_governor_statistics = None  # None unless an overhead budget is set
             cls._instance.full_statistics_dict = {}  # to monitor and events
             cls._instance.violations_dict = {}  # only to violations
             cls._instance.file_name = None
@@ -28,7 +37,10 @@ class StatisticsSingleton:
         print("Generating statistics...")
         sleep(0.1)
         self._print_statistics_time()
+        self._print_statistics_instrumentation()
+        self._print_statistics_instrumentation_profile()
         self._print_statistics_monitor_and_events()
+        self._print_statistics_hook_latencies()
         self._print_statistics_violations()
 
     def _print_statistics_time(self):
@@ -44,6 +56,44 @@ class StatisticsSingleton:
         print_msg += f"Create monitor end time: {self.create_monitor_end_time:.5f} seconds\n"
         print_msg += f"Time taken for creating monitors: {self.create_monitor_duration:.5f} seconds\n"
 
+        # Print out the instrumentation cache counters if the cache is enabled.
+        if self.instrumentation_cache_hits is not None:
+            print_msg += f"Instrumentation cache hits: {self.instrumentation_cache_hits}\n"
+            print_msg += f"Instrumentation cache misses: {self.instrumentation_cache_misses}\n"
+
+        # Print out the counters of the asynchronous monitoring, the dropped events make the verdicts unreliable.
+        if self.async_monitoring_statistics is not None:
+            dropped_events = self.async_monitoring_statistics['dropped_events']
+            print_msg += (f"Asynchronous monitoring: {self.async_monitoring_statistics['handled_events']} events handled, "
+                          f"{sum(dropped_events.values())} dropped (buffer size {self.async_monitoring_statistics['buffer_size']}, "
+                          f"overflow policy {self.async_monitoring_statistics['overflow_policy']}, "
+                          f"peak depth {self.async_monitoring_statistics['max_depth']})\n")
+            for spec_name, dropped in sorted(dropped_events.items()):
+                print_msg += f"    Spec - {spec_name}: {dropped} events dropped\n"
+
+        # Print out the specs throttled for going over the overhead budget.
+        if self.overhead_governor_statistics is not None:
+            budget = self.overhead_governor_statistics['budget']
+            if self.overhead_governor_statistics['relative']:
+                budget = f"{budget:.2%} of the wall time"
+            else:
+                budget = f"{budget} seconds"
+            print_msg += (f"Overhead budget: {budget} per spec (policy {self.overhead_governor_statistics['policy']}), "
+                          f"{len({action['spec'] for action in self.overhead_governor_statistics['actions']})} specs throttled\n")
+            for action in self.overhead_governor_statistics['actions']:
+                print_msg += (f"    Spec - {action['spec']}: {action['action']} after {action['elapsed_time']:.5f} seconds, "
+                              f"monitoring time {action['monitoring_time']:.5f} of {action['budget_time']:.5f} seconds\n")
+
+        # Print out the breakdown of reloading the modules imported before the AST instrumentation.
+        if self.reload_statistics:
+            print_msg += f"Module reload strategy: {self.reload_statistics['strategy']}\n"
+            print_msg += f"Modules reloaded: {self.reload_statistics['reloaded_modules']}\n"
+            print_msg += f"Modules skipped: {self.reload_statistics['skipped_modules']}\n"
+            print_msg += f"Time taken for reload analysis: {self.reload_statistics['analysis_time']:.5f} seconds\n"
+            print_msg += f"Time taken for reloading modules: {self.reload_statistics['reload_time']:.5f} seconds\n"
+            if self.reload_statistics['estimated_saved_time'] is not None:
+                print_msg += f"Estimated time saved by skipping modules: {self.reload_statistics['estimated_saved_time']:.5f} seconds\n"
+
         if self.file_name:
             basename, ext = os.path.splitext(self.file_name)
             new_file_name = basename + '-time' + ext
@@ -52,11 +102,101 @@ class StatisticsSingleton:
                             'instrumentation_duration': self.instrumentation_duration,
                             'create_monitor_end_time': self.create_monitor_end_time,
                             'create_monitor_duration': self.create_monitor_duration}
+            if self.instrumentation_cache_hits is not None:
+                dict_message['instrumentation_cache_hits'] = self.instrumentation_cache_hits
+                dict_message['instrumentation_cache_misses'] = self.instrumentation_cache_misses
+            if self.reload_statistics:
+                dict_message['reload'] = self.reload_statistics
+            if self.async_monitoring_statistics is not None:
+                dict_message['async_monitoring'] = self.async_monitoring_statistics
+            if self.object_sampling_statistics:
+                dict_message['object_sampling'] = self._object_sampling_estimates()
+            if self.overhead_governor_statistics is not None:
+                dict_message['overhead_governor'] = self.overhead_governor_statistics
             self._save_in_file(new_file_name, print_msg, dict_message)
             print(f"Time measurements are saved in {new_file_name}.")
         else:
             print(print_msg)
 
+    def _print_statistics_instrumentation(self):
+        """
+        Print or save the number of AST nodes rewritten and skipped per module.
+        """
+        if not self.instrumentation_report:
+            return
+
+        print_msg = f"========================= AST Instrumentation =========================\n"
+
+        # Sum up the rewritten and skipped nodes of each kind over all modules.
+        totals = {}
+        for module_report in self.instrumentation_report.values():
+            for kind, (rewritten, skipped) in module_report.items():
+                kind_totals = totals.setdefault(kind, [0, 0])
+                kind_totals[0] += rewritten
+                kind_totals[1] += skipped
+
+        print_msg += f"Instrumented modules: {len(self.instrumentation_report)}\n"
+        for kind, (rewritten, skipped) in sorted(totals.items()):
+            print_msg += f"    {kind}: {rewritten} rewritten, {skipped} skipped\n"
+
+        # The per module report can be long, so it is only printed with full statistics or saved into the file.
+        if self.file_name or self.full_statistics:
+            print_msg += f"------------\n"
+            for module, module_report in sorted(self.instrumentation_report.items()):
+                print_msg += f"Module - {module}:\n"
+                for kind, (rewritten, skipped) in sorted(module_report.items()):
+                    print_msg += f"    {kind}: {rewritten} rewritten, {skipped} skipped\n"
+
+        if self.file_name:
+            basename, ext = os.path.splitext(self.file_name)
+            new_file_name = basename + '-instrumentation' + ext
+            dict_message = {'totals': totals, 'modules': self.instrumentation_report}
+            self._save_in_file(new_file_name, print_msg, dict_message)
+            print(f"Instrumentation report is saved in {new_file_name}.")
+        else:
+            print(print_msg)
+
+    def _print_statistics_instrumentation_profile(self):
+        """
+        Print or save the instrumentation time and bytecode size of each module, the most expensive first.
+        """
+        if not self.instrumentation_profile:
+            return
+
+        print_msg = f"===================== AST Instrumentation Profile =====================\n"
+
+        modules = sorted(self.instrumentation_profile.items(), key=lambda item: item[1]['total_time'], reverse=True)
+        time_keys = ['parse_time', 'transform_time', 'compile_time', 'cache_load_time', 'self_exec_time', 'total_time']
+        totals = {key: sum(profile[key] for _, profile in modules) for key in time_keys}
+        totals['bytecode_size'] = sum(profile['bytecode_size'] for _, profile in modules)
+        totals['original_bytecode_size'] = sum(profile['original_bytecode_size'] for _, profile in modules)
+        totals['bytecode_growth'] = totals['bytecode_size'] - totals['original_bytecode_size']
+
+        print_msg += f"Profiled modules: {len(modules)}\n"
+        print_msg += (f"Total: {totals['total_time']:.5f} seconds (parse {totals['parse_time']:.5f}, "
+                      f"transform {totals['transform_time']:.5f}, compile {totals['compile_time']:.5f}, "
+                      f"cache load {totals['cache_load_time']:.5f}, exec {totals['self_exec_time']:.5f}), "
+                      f"bytecode {totals['original_bytecode_size']} -> {totals['bytecode_size']} bytes\n")
+
+        # Only the most expensive modules are printed to the console, the file has all of them.
+        print_msg += f"------------\n"
+        for module, profile in modules if self.file_name or self.full_statistics else modules[:10]:
+            print_msg += f"Module - {module}: {profile['total_time']:.5f} seconds\n"
+            print_msg += (f"    parse {profile['parse_time']:.5f}, transform {profile['transform_time']:.5f}, "
+                          f"compile {profile['compile_time']:.5f}, cache load {profile['cache_load_time']:.5f}, "
+                          f"exec {profile['self_exec_time']:.5f} (with nested imports {profile['exec_time']:.5f})\n")
+            print_msg += (f"    bytecode {profile['original_bytecode_size']} -> {profile['bytecode_size']} bytes "
+                          f"({profile['bytecode_growth']:+d}), rewritten {profile['rewritten']}\n")
+
+        if self.file_name:
+            basename, ext = os.path.splitext(self.file_name)
+            new_file_name = basename + '-instrumentation-profile' + ext
+            dict_message = {'totals': totals, 'modules': dict(modules)}
+            self._save_in_file(new_file_name, print_msg, dict_message)
+            print(f"Instrumentation profile is saved in {new_file_name}.")
+        else:
+            print(print_msg)
+
     def _print_statistics_violations(self):
         """
         Print or save violation statistics.
@@ -70,6 +210,17 @@ class StatisticsSingleton:
 
         print_msg += f"Total Violations: {total} violations\n"
         print_msg += f"------------\n"
+
+        # Extrapolate the violations of the specs monitoring a sample of their parameter objects.
+        if self.object_sampling_statistics:
+            print_msg += f"Object sampling (the estimates divide the counts by the effective rate):\n"
+            for spec_name, sampling in self._object_sampling_estimates().items():
+                print_msg += (f"Spec - {spec_name}: rate {sampling['rate']}, {sampling['monitored_events']} of "
+                              f"{sampling['seen_events']} events monitored (effective rate {sampling['effective_rate']:.5f}), "
+                              f"{sampling['violations']} violations, ~{sampling['estimated_violations']} estimated\n")
+                for event, counts in sampling['events'].items():
+                    print_msg += f"    {event}: {counts['monitored']} of {counts['seen']} times monitored\n"
+            print_msg += f"------------\n"
         for spec_name, violations in self.violations_dict.items():
             print_msg += f"Spec - {spec_name}:\n"
             for violation, info in violations.items():
@@ -114,6 +265,34 @@ class StatisticsSingleton:
                 print(f"Full statistics are saved in {new_file_name}.")
             else:
                 print(print_msg)
+
+    def _print_statistics_hook_latencies(self):
+        """
+        Print or save the latencies of the hooks and the monitors, if they were profiled.
+        """
+        if self.hook_profile:
+            print_msg = (f"============================== Hook Latencies "
+                         f"==============================\n")
+            print_msg += f"p50 and p99 are bucket upper bounds, the totals are estimated from the samples.\n"
+            for spec_name, events in self.hook_profile.items():
+                print_msg += f"Spec - {spec_name}:\n"
+                for event, kinds in events.items():
+                    for kind, latency in kinds.items():
+                        print_msg += (f"    {event} [{kind}]: {latency['estimated_calls']} calls "
+                                      f"({latency['sampled_calls']} sampled), "
+                                      f"total {latency['estimated_total_ns'] / 1e9:.5f} seconds, "
+                                      f"mean {latency['mean_ns'] / 1e3:.2f} us, p50 {latency['p50_ns'] / 1e3:.2f} us, "
+                                      f"p99 {latency['p99_ns'] / 1e3:.2f} us, max {latency['max_ns'] / 1e3:.2f} us\n")
+                print_msg += f"------------\n"
+
+            if self.file_name:
+                basename, ext = os.path.splitext(self.file_name)
+                new_file_name = basename + '-latency' + ext
+                self._save_in_file(new_file_name, print_msg, self.hook_profile)
+                print(f"Hook latencies are saved in {new_file_name}.")
+            else:
+                print(print_msg)
+
     def _save_in_file(self, new_file_name, print_msg, message_dict):
         with open(new_file_name, 'w') as f:
             if self.file_name.endswith('.json'):
@@ -160,6 +339,67 @@ class StatisticsSingleton:
         self.create_monitor_end_time = create_monitor_end_time
         self.create_monitor_duration = create_monitor_duration
 
+    def add_instrumentation_cache_statistics(self, hits, misses):
+        """
+        Update instrumentation cache hit and miss counters.
+        """
+        self.instrumentation_cache_hits = hits
+        self.instrumentation_cache_misses = misses
+
+    def add_instrumentation_report(self, instrumentation_report):
+        """
+        Update the per module report of rewritten and skipped AST nodes.
+        """
+        self.instrumentation_report = instrumentation_report
+
+    def add_instrumentation_profile(self, instrumentation_profile):
+        """
+        Update the per module timings and bytecode sizes of the AST instrumentation.
+        """
+        self.instrumentation_profile = instrumentation_profile
+
+    def add_reload_statistics(self, reload_statistics):
+        """
+        Update the counters and timings of reloading the already imported modules.
+        """
+        self.reload_statistics = reload_statistics
+
+    def add_async_monitoring_statistics(self, async_monitoring_statistics):
+        """
+        Update the counters of the asynchronous monitoring, including the dropped events per spec.
+        """
+        self.async_monitoring_statistics = async_monitoring_statistics
+
+    def add_hook_profile(self, hook_profile):
+        """
+        Update the latencies of the hooks, monitor updates and state transitions per spec and event.
+        """
+        self.hook_profile = hook_profile
+
+    def add_overhead_governor_statistics(self, overhead_governor_statistics):
+        """
+        Update the overhead budget and the specs throttled for going over it.
+        """
+        self.overhead_governor_statistics = overhead_governor_statistics
+
+    def add_object_sampling_statistics(self, spec_name, object_sampling_statistics):
+        """
+        Update the counters of the object sampler of a spec.
+        """
+        self.object_sampling_statistics[spec_name] = object_sampling_statistics
+
+    def _object_sampling_estimates(self):
+        """
+        Return the counters of the object samplers with the violations extrapolated to all the objects.
+        """
+        estimates = {}
+        for spec_name, sampling in sorted(self.object_sampling_statistics.items()):
+            violations = sum(info.get('count', 0) for info in self.violations_dict.get(spec_name, {}).values())
+            effective_rate = sampling['effective_rate']
+            estimates[spec_name] = dict(sampling, violations=violations,
+                                        estimated_violations=round(violations / effective_rate) if effective_rate else 0)
+        return estimates
+
     def add_monitor_creation(self, spec_name):
         """
         Add monitor creation to statistics count.
@@ -208,16 +448,16 @@ class StatisticsSingleton:
         self.violations_dict[spec_name][new_violation] = temp_violation
         self.violations_dict[spec_name].pop(old_violation)
 
-    def add_events(self, spec_name, event_name):
+    def add_events(self, spec_name, event_name, count=1):
         """
-        Add event to statistics.
+        Add event (or count occurrences of it) to statistics.
         """
         if self.full_statistics:
             if spec_name not in self.full_statistics_dict:
                 self.full_statistics_dict[spec_name] = {'monitors': 0, 'events': {}}
             if event_name not in self.full_statistics_dict[spec_name]['events']:
                 self.full_statistics_dict[spec_name]['events'][event_name] = 0
-            self.full_statistics_dict[spec_name]['events'][event_name] += 1
+            self.full_statistics_dict[spec_name]['events'][event_name] += count
 
     def set_current_test(self, test_name):
         """
@@ -35,7 +35,11 @@ setup(
     package_data={
         '': ['logicplugin/java-packages/*',
              'logicplugin/java-packages/javamop-packages/*',
-             'logicplugin/java-packages/javamop-packages/plugins/*'],
+             'logicplugin/java-packages/javamop-packages/plugins/*',
+             'pymop-startup-helper/*.py'],
+    },
+    entry_points={
+        'console_scripts': ['pymop = pythonmop.cli:main'],
     },
     install_requires=open('requirements.txt').readlines(),
     extras_require={
@@ -1,4 +1,4 @@
-from pythonmop import Spec, call, End, getStackTrace, parseStackTrace, getKwOrPosArg, TRUE_EVENT, FALSE_EVENT
+from pythonmop import Spec, call, End, getStackTrace, parseStackTrace, arg_value, return_value, TRUE_EVENT
 import threading
 
 
@@ -50,29 +50,18 @@ class Pydocs_MustReleaseLock(Spec):
             # This is always blocking
             self.lock_acquisition_stacks[kw['obj']] = getStackTrace()
 
-        @self.event_before(call(CustomLockType, 'acquire'))
+        # default is blocking
+        @self.event_before(call(CustomLockType, 'acquire'), arg_value(1, (None, True), name='blocking'))
         def acquire(**kw):
-            blocking = getKwOrPosArg('blocking', 1, kw)
-            lock = kw['obj']
-
-            if blocking == None or blocking == True: # default is blocking
-                self.lock_acquisition_stacks[lock] = getStackTrace()
-                return TRUE_EVENT
-
-            return FALSE_EVENT
+            self.lock_acquisition_stacks[kw['obj']] = getStackTrace()
+            return TRUE_EVENT
 
-        @self.event_after(call(CustomLockType, 'acquire'))
+        # successfully acquired the lock
+        @self.event_after(call(CustomLockType, 'acquire'), arg_value(1, (False,), name='blocking'), return_value((True,)))
         def acquire(**kw):
-            lock = kw['obj']
-            blocking = getKwOrPosArg('blocking', 1, kw)
-            result = kw['return_val']
-
-            if blocking == False and result == True: # successfully acquired the lock
-                self.lock_acquisition_stacks[lock] = getStackTrace()
-                # No deadlock situation here because the call was non-blocking
-                return TRUE_EVENT
-
-            return FALSE_EVENT
+            self.lock_acquisition_stacks[kw['obj']] = getStackTrace()
+            # No deadlock situation here because the call was non-blocking
+            return TRUE_EVENT
 
         @self.event_before(call(CustomLockType, 'release'))
         def release(**kw):
@@ -1,5 +1,5 @@
 # ============================== Define spec ==============================
-from pythonmop import Spec, call, getKwOrPosArg, TRUE_EVENT, FALSE_EVENT
+from pythonmop import Spec, call, arg_type
 
 
 if not InstrumentedIterator:
@@ -14,30 +14,20 @@ class UnsafeListIterator(Spec):
         super().__init__()
 
         @self.event_before(call(list, '__init__'))
-        def createList(**kw):
+        def createList(ctx):
             pass
 
         @self.event_before(call(list, r'(__setitem__|append|extend|insert|pop|remove|clear|sort)' ))
-        def updateList(**kw):
+        def updateList(ctx):
             pass
         
-        @self.event_before(call(InstrumentedIterator, '__init__'), target = [1], names = [call(list, '*')])
-        def createIter(**kw):
-            iterable = getKwOrPosArg('iterable', 1, kw)
-
-            if isinstance(iterable, list):
-                return TRUE_EVENT
-            
-            return FALSE_EVENT
-
-        @self.event_before(call(InstrumentedIterator, '__next__'))
-        def next(**kw):
-            obj = kw['obj']
-
-            if isinstance(obj.iterable, list):
-                return TRUE_EVENT
+        @self.event_before(call(InstrumentedIterator, '__init__'), arg_type(1, list, name='iterable'), target = [1], names = [call(list, '*')])
+        def createIter(ctx):
+            pass
 
-            return FALSE_EVENT
+        @self.event_before(call(InstrumentedIterator, '__next__'), arg_type(0, list, attr='iterable'))
+        def next(ctx):
+            pass
 
     ere = 'createList updateList* createIter next* updateList+ next'
     creation_events = ['createList']
@@ -1,7 +1,7 @@
 # ============================== Define spec ==============================
 from array import array
 from collections import deque
-from pythonmop import Spec, call, getKwOrPosArg, VIOLATION
+from pythonmop import Spec, call, getKwOrPosArg, VIOLATION, HookResult
 import random
 
 
@@ -14,101 +14,62 @@ class WrongTypeAddedAnalysis(Spec):
 
         self.THRESHOLD = 10
 
-        @self.event_before(call(PymopFuncCallTracker, 'before_call'))
-        def check_append(**kw):
-            func = kw['args'][1]
-            try:
-                func_self = getattr(func, "__self__", None)
-                func_name = getattr(func, "__name__", None)
-
-                if func_self is None or func_name is None:
-                    return
-
-                if "__len__" in dir(func_self) and (func_name == "append" or func_name == "customAppend"):
-                    kw['func_self'] = func_self
-                    return self._check_add("append", **kw)
-            except:
-                pass
-
-        @self.event_before(call(PymopFuncCallTracker, 'before_call'))
-        def check_insert(**kw):
-            func = kw['args'][1]
-            try:
-                func_self = getattr(func, "__self__", None)
-                func_name = getattr(func, "__name__", None)
-
-                if func_self is None or func_name is None:
-                    return
-
-                if "__len__" in dir(func_self) and func_name == "insert":
-                    kw['func_self'] = func_self
-                    return self._check_add("insert", **kw)
-            except:
-                pass
-
-        @self.event_before(call(PymopFuncCallTracker, 'before_call'))
-        def check_extend(**kw):
-            func = kw['args'][1]
-            try:
-                func_self = getattr(func, "__self__", None)
-                func_name = getattr(func, "__name__", None)
-
-                if func_self is None or func_name is None:
-                    return
-
-                if "__len__" in dir(func_self) and func_name == "extend":
-                    kw['func_self'] = func_self
-                    return self._check_add("extend", **kw)
-            except:
-                pass
-
-        @self.event_before(call(PymopFuncCallTracker, 'before_call'))
-        def check_add(**kw):
-            func = kw['args'][1]
-            try:
-                func_self = getattr(func, "__self__", None)
-                func_name = getattr(func, "__name__", None)
-
-                if func_self is None or func_name is None:
-                    return
-
-                if "__len__" in dir(func_self) and func_name == "add":
-                    kw['func_self'] = func_self
-                    return self._check_add("add", **kw)
-            except:
-                pass
+        @self.event_before(call(PymopFuncCallTracker, 'before_call'), callee_names=['append', 'customAppend'])
+        def check_append(ctx):
+            return self._check_callee_add("append", ctx)
+
+        @self.event_before(call(PymopFuncCallTracker, 'before_call'), callee_names=['insert'])
+        def check_insert(ctx):
+            return self._check_callee_add("insert", ctx)
+
+        @self.event_before(call(PymopFuncCallTracker, 'before_call'), callee_names=['extend'])
+        def check_extend(ctx):
+            return self._check_callee_add("extend", ctx)
+
+        @self.event_before(call(PymopFuncCallTracker, 'before_call'), callee_names=['add'])
+        def check_add(ctx):
+            return self._check_callee_add("add", ctx)
 
         @self.event_before(call(PymopArithmeticOperatorTracker, r'__pymop__add__|__pymop__iadd__'))
-        def check_add_assign(**kw):
-            if len(kw['args']) < 3:
+        def check_add_assign(ctx):
+            if len(ctx.args) < 3:
                 return False
-            return self._check_add("add_assign", **kw)
-
-    def _check_add(self, method, **kw):
+            return self._check_add("add_assign", ctx)
+
+    def _check_callee_add(self, method, ctx):
+        # The hooks only get the calls to the callees with the name of the method.
+        try:
+            func_self = getattr(ctx.args[1], "__self__", None)
+            if func_self is not None and "__len__" in dir(func_self):
+                return self._check_add(method, ctx, func_self)
+        except:
+            pass
+
+    def _check_add(self, method, ctx, func_self=None):
         if method == "add_assign":
-            left = kw['args'][1]
+            left = ctx.args[1]
             if not isinstance(left, list):
                 return False
         else:
-            left = kw['func_self']
+            left = func_self
 
         if not hasattr(left, '__len__') or len(left) <= self.THRESHOLD:
             return False
 
         if method in ('append'):
-            right = kw['args'][2][0]
+            right = ctx.args[2][0]
         elif method == 'insert':
-            right = kw['args'][2][1]
+            right = ctx.args[2][1]
         elif method == 'add':
-            right = kw['args'][2][0]
+            right = ctx.args[2][0]
         elif method == 'extend':
-            right = kw['args'][2][0]
+            right = ctx.args[2][0]
             if "__len__" in dir(right):
                 right = list(right)
             else:
                 return False
         elif method == "add_assign":
-            right = kw['args'][2]
+            right = ctx.args[2]
             if type(right) != list:
                 return False
         else:
@@ -123,14 +84,7 @@ class WrongTypeAddedAnalysis(Spec):
         if consistent_same_type_left:
             if method in ('append', 'add', 'insert'):
                 if not isinstance(right, type_to_check):
-                    return {
-                        "verdict": VIOLATION,
-                        'last event': f'check_{method}',
-                        'param': [left],
-                        'custom_message': f"Added potentially wrong type to a previously homogeneous list/set at {kw['call_file_name']}, {kw['call_line_num']}.",
-                        'filename': kw['call_file_name'],
-                        'lineno': kw['call_line_num']
-                    }
+                    return self._violation(method, left, ctx)
             elif method == 'extend':
                 right_sample = right
 
@@ -139,29 +93,25 @@ class WrongTypeAddedAnalysis(Spec):
                     right_sample = random.sample(list(right), self.THRESHOLD)
                 consistent_same_type_right = all(isinstance(n, type_to_check) for n in right_sample)
                 if not consistent_same_type_right:
-                    return {
-                        "verdict": VIOLATION,
-                        'last event': f'check_{method}',
-                        'param': [left],
-                        'custom_message': f"Added potentially wrong type to a previously homogeneous list/set at {kw['call_file_name']}, {kw['call_line_num']}.",
-                        'filename': kw['call_file_name'],
-                        'lineno': kw['call_line_num']
-                    }
+                    return self._violation(method, left, ctx)
             elif method == "add_assign":
                 if len(right) > 0:
                     right_sample_type = type(right[0])
                     if right_sample_type != type_to_check:
-                        return {
-                            "verdict": VIOLATION,
-                            'last event': f'check_{method}',
-                            'param': [left],
-                            'custom_message': f"Added potentially wrong type to a previously homogeneous list/set at {kw['call_file_name']}, {kw['call_line_num']}.",
-                            'filename': kw['call_file_name'],
-                            'lineno': kw['call_line_num']
-                        }
+                        return self._violation(method, left, ctx)
 
         return False
 
+    def _violation(self, method, left, ctx):
+        return HookResult(
+            VIOLATION,
+            last_event=f'check_{method}',
+            param=[left],
+            custom_message=f"Added potentially wrong type to a previously homogeneous list/set at {ctx.call_file_name}, {ctx.call_line_num}.",
+            filename=ctx.call_file_name,
+            lineno=ctx.call_line_num
+        )
+
     def match(self, call_file_name, call_line_num):
         print(
             f'Spec - {self.__class__.__name__}: Added potentially wrong type to a previously homogeneous list/set. file {call_file_name}, line {call_line_num}.')
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from pythonmop import async_monitoring
+
+
+class GatedSpec:
+    """Stands for a spec whose monitor waits for the gate to be opened before handling its events."""
+
+    def __init__(self):
+        self.monitor = self
+        self.event_lock = threading.RLock()
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.events = []
+
+    def update_monitor(self, update, *args):
+        with self.event_lock:
+            update(*args)
+
+    def update_params_batch(self, events):
+        self.entered.set()
+        assert self.gate.wait(10)
+        self.events.extend(event[0] for event in events)
+
+
+@pytest.fixture
+def spec(monkeypatch):
+    # The counters of the module start from zero in each test.
+    for name, value in (('_overflow_count', 0), ('_handled_events', 0), ('_dropped_events', {}), ('_max_depth', 0)):
+        monkeypatch.setattr(async_monitoring, name, value)
+    spec = GatedSpec()
+    yield spec
+    spec.gate.set()
+    async_monitoring.stop_async_monitoring()
+
+
+def submit(spec, event_name):
+    async_monitoring.submit_event(spec, event_name, (), [], 'test.py', 1, None, (), {})
+
+
+def fill_buffer(spec, capacity):
+    # The monitor thread waits in the first event, then the buffer is filled.
+    submit(spec, 'e0')
+    assert spec.entered.wait(10)
+    for index in range(1, capacity + 1):
+        submit(spec, f'e{index}')
+
+
+def submit_in_thread(spec, event_name):
+    thread = threading.Thread(target=submit, args=(spec, event_name))
+    thread.start()
+    thread.join(0.2)
+    return thread
+
+
+def test_parse_overflow_policy():
+    assert async_monitoring.parse_overflow_policy('block') == ('block', 1)
+    assert async_monitoring.parse_overflow_policy('drop') == ('drop', 1)
+    assert async_monitoring.parse_overflow_policy('sample') == ('sample', 10)
+    assert async_monitoring.parse_overflow_policy('sample:3') == ('sample', 3)
+    for value in ('wait', 'drop:3', 'sample:0'):
+        with pytest.raises(ValueError):
+            async_monitoring.parse_overflow_policy(value)
+
+
+def test_block_waits_for_room(spec):
+    async_monitoring.start_async_monitoring(2, 'block')
+    fill_buffer(spec, 2)
+
+    thread = submit_in_thread(spec, 'e3')
+    assert thread.is_alive()
+
+    spec.gate.set()
+    thread.join(10)
+    async_monitoring.flush_async_monitoring()
+    assert spec.events == ['e0', 'e1', 'e2', 'e3']
+    statistics = async_monitoring.get_async_monitoring_statistics()
+    assert statistics['dropped_events'] == {}
+    assert statistics['handled_events'] == 4
+    assert statistics['max_depth'] == 2
+
+
+def test_drop_counts_the_overflowing_events(spec):
+    async_monitoring.start_async_monitoring(2, 'drop')
+    fill_buffer(spec, 2)
+
+    for index in range(3, 7):
+        submit(spec, f'e{index}')
+
+    spec.gate.set()
+    async_monitoring.flush_async_monitoring()
+    assert spec.events == ['e0', 'e1', 'e2']
+    assert async_monitoring.get_async_monitoring_statistics()['dropped_events'] == {'GatedSpec': 4}
+
+
+def test_sample_keeps_one_of_every_n_overflowing_events(spec):
+    async_monitoring.start_async_monitoring(2, 'sample', 2)
+    fill_buffer(spec, 2)
+
+    # The first overflowing event is dropped, the second one waits for room.
+    submit(spec, 'e3')
+    thread = submit_in_thread(spec, 'e4')
+    assert thread.is_alive()
+
+    spec.gate.set()
+    thread.join(10)
+    async_monitoring.flush_async_monitoring()
+    assert spec.events == ['e0', 'e1', 'e2', 'e4']
+    statistics = async_monitoring.get_async_monitoring_statistics()
+    assert statistics['dropped_events'] == {'GatedSpec': 1}
+    assert statistics['overflow_policy'] == 'sample:2'
+
+
+def test_events_after_stop_are_handled_inline(spec):
+    async_monitoring.start_async_monitoring(2, 'block')
+    spec.gate.set()
+    async_monitoring.stop_async_monitoring()
+
+    submit(spec, 'e0')
+
+    assert spec.events == ['e0']
@@ -0,0 +1,143 @@
+import itertools
+import threading
+import time
+
+from pythonmop import Spec, call
+from pythonmop.spec.spec import _get_event_types
+
+
+def make_spec(hook):
+    # A new class and spec per test, so that the specs of the other tests do not get its events.
+    resource_class = type('Resource', (), {'use': lambda self: None})
+
+    class UseResource(Spec):
+        def __init__(self):
+            super().__init__()
+
+            @self.event_before(call(resource_class, 'use'))
+            def use(**kw):
+                return hook(**kw)
+
+        def match(self, call_file_name, call_line_num):
+            pass
+
+    return resource_class, UseResource()
+
+
+def test_nested_call_in_hook_is_not_an_event():
+    calls = itertools.count()
+
+    def hook(obj, **kw):
+        next(calls)
+        # Handled while the event of the outer call is, so it only calls the original method.
+        obj.use()
+
+    resource_class, spec = make_spec(hook)
+    resource = resource_class()
+    resource.use()
+    resource.use()
+
+    assert next(calls) == 2
+    spec.detach()
+
+
+def test_threads_handle_events_of_the_same_function_at_once():
+    # Both threads must be in the hook at the same time to pass the barrier, which fails if the guard of
+    # one thread made the other bypass the monitoring.
+    barrier = threading.Barrier(2, timeout=10)
+    passed = itertools.count()
+
+    def hook(**kw):
+        barrier.wait()
+        next(passed)
+
+    resource_class, spec = make_spec(hook)
+    resource = resource_class()
+    threads = [threading.Thread(target=resource.use) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert next(passed) == 2
+    spec.detach()
+
+
+def test_update_monitor_defers_nested_updates():
+    _, first = make_spec(lambda **kw: None)
+    _, second = make_spec(lambda **kw: None)
+    order = []
+
+    def update(name):
+        # The deferred updates run holding the event lock of their spec only.
+        order.append((name, first.event_lock._is_owned(), second.event_lock._is_owned()))
+
+    def outer():
+        second.update_monitor(update, 'second')
+        first.update_monitor(update, 'first again')
+        update('first')
+
+    first.update_monitor(outer)
+
+    assert order == [('first', True, False), ('second', False, True), ('first again', True, False)]
+    first.detach()
+    second.detach()
+
+
+def test_update_monitor_runs_the_deferred_updates_after_a_failing_one():
+    _, first = make_spec(lambda **kw: None)
+    _, second = make_spec(lambda **kw: None)
+    order = []
+
+    def failing():
+        raise RuntimeError('deferred update')
+
+    def outer():
+        second.update_monitor(failing)
+        second.update_monitor(order.append, 'after the failure')
+
+    first.update_monitor(outer)
+    # The thread does not defer its next updates.
+    first.update_monitor(order.append, 'next')
+
+    assert order == ['after the failure', 'next']
+    first.detach()
+    second.detach()
+
+
+def test_detach_while_threads_send_events():
+    calls = itertools.count()
+    errors = []
+    stop = threading.Event()
+
+    def hook(**kw):
+        next(calls)
+
+    resource_class, spec = make_spec(hook)
+
+    def worker():
+        resource = resource_class()
+        try:
+            while not stop.is_set():
+                resource.use()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 10
+    while next(calls) < 1000 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    spec.detach()
+    detached = next(calls)
+    time.sleep(0.05)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert not _get_event_types(resource_class.use, True)
+    # The calls started before detach returned may still run the hook, one per thread at most.
+    assert next(calls) - detached - 1 <= len(threads)
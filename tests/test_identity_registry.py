@@ -0,0 +1,134 @@
+import gc
+import sys
+import threading
+import weakref
+
+from pythonmop.spec.identity_registry import IdentityRegistry, _AddressRef, _DEAD_REF
+
+
+class Item:
+    pass
+
+
+class SlotItem:
+    __slots__ = ('value',)
+
+
+def test_ids_are_stable_and_increasing():
+    registry = IdentityRegistry()
+    first, second, items = Item(), [], SlotItem()
+
+    ids = [registry.get_id(first), registry.get_id(second), registry.get_id(items)]
+
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    assert registry.last_id == ids[-1]
+    assert [registry.get_id(first), registry.get_id(second), registry.get_id(items)] == ids
+    assert not hasattr(first, 'mop_uuid')
+
+
+def test_collected_object_entry_is_removed_and_address_gets_new_id():
+    registry = IdentityRegistry()
+    item = Item()
+    key = id(item)
+    old_id = registry.get_id(item)
+
+    del item
+    gc.collect()
+    assert key not in registry._entries
+
+    # A new object allocated at the address of the collected one does not inherit its id.
+    items = [Item() for _ in range(1000)]
+    reused = [item for item in items if id(item) == key]
+    for item in reused or items[:1]:
+        assert registry.get_id(item) > old_id
+
+
+def test_address_entry_of_another_type_gets_new_id():
+    registry = IdentityRegistry()
+    value = (1, 2)
+    # A stale entry left by a collected list at the address of the tuple.
+    registry._entries[id(value)] = _AddressRef(list, id(value), 12345)
+
+    assert registry.get_id(value) != 12345
+    assert registry._entries[id(value)].obj_type is tuple
+
+
+def test_weakref_entry_replaces_address_entry():
+    registry = IdentityRegistry()
+    item = Item()
+    registry._entries[id(item)] = _AddressRef(list, id(item), 12345)
+
+    param_id = registry.get_id(item)
+
+    assert param_id != 12345
+    assert registry.get_ref(item, param_id)() is item
+
+
+def test_objects_without_weak_references_are_not_kept_alive():
+    registry = IdentityRegistry()
+    content = Item()
+    content_ref = weakref.ref(content)
+    value = [content]
+    param_id = registry.get_id(value)
+    ref = registry.get_ref(value, param_id)
+
+    del content, value
+    gc.collect()
+
+    assert content_ref() is None
+    assert ref.param_id == param_id
+
+
+def test_get_ref_after_collection():
+    registry = IdentityRegistry()
+    item = Item()
+    param_id = registry.get_id(item)
+    ref = registry.get_ref(item, param_id)
+    assert ref() is item
+    assert ref.param_id == param_id
+
+    del item
+    gc.collect()
+
+    assert ref() is None
+    assert len(registry) == 0
+
+
+def test_get_ref_with_stale_id_is_dead():
+    registry = IdentityRegistry()
+    item, value = Item(), []
+    registry.get_id(item)
+    registry.get_id(value)
+
+    assert registry.get_ref(item, registry.last_id + 1) is _DEAD_REF
+    assert registry.get_ref(value, registry.last_id + 1) is _DEAD_REF
+    assert registry.get_ref(Item(), 1) is _DEAD_REF
+
+
+def test_threads_registering_the_same_objects_get_the_same_ids():
+    registry = IdentityRegistry()
+    threads = 4
+    # Weak references and address entries.
+    instances = [Item() if index % 2 else [] for index in range(2000)]
+    ids = [None] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        ids[index] = [registry.get_id(instance) for instance in instances]
+
+    # The threads switch as often as possible, so that they register the same objects at the same time.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert all(len(set(object_ids)) == 1 for object_ids in zip(*ids))
+    assert len(set(ids[0])) == len(instances)
+    assert registry.last_id == len(instances)